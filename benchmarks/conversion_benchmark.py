@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+端到端轉換效能基準測試
+
+以 benchmarks/synthetic_dxf.py 產生不同規模的合成圖面，分別量測轉換流程各階段的耗時：
+open_file、extract_rebar_texts、process_drawing、產生圖示 (render)、寫入資料列 (write_rows)、save_workbook，
+並記錄峰值 RSS。每個規模在全新的子行程中執行，結果輸出為 JSON，供跨版本（commit）比對。
+
+使用方式（於專案根目錄）：
+    python -m benchmarks.conversion_benchmark --sizes 1k,10k
+    python -m benchmarks.conversion_benchmark --sizes 1k,10k,100k,1m --data-dir benchmarks/results/dxf
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.graphics_benchmark import peak_rss_bytes
+from benchmarks.synthetic_dxf import generate_drawing
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+PACKAGE_ROOT = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+DEFAULT_SIZES = "1k,10k,100k,1m"
+
+
+def parse_size(text):
+    """解析規模參數，例如 '10k'、'1m'、'2500'"""
+    text = text.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000 * 1000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+def get_commit():
+    """目前的 git commit（無法取得時回傳 None）"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PACKAGE_ROOT,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def drawing_path(data_dir, marks, frames, seed):
+    """合成圖面的檔名（相同參數重複使用）"""
+    return Path(data_dir) / f"synthetic-{marks}-f{frames}-s{seed}.dxf"
+
+
+def run_case(dxf_path, image_mode):
+    """
+    量測單一圖面（於獨立子行程中呼叫，峰值 RSS 才不互相影響）
+
+    Returns:
+        dict: 各階段耗時（秒）與計數
+    """
+    from core.cad_reader import CADReader
+    from core.excel_writer import ExcelWriter
+    from utils import instrumentation
+
+    timings = {}
+
+    def timed(name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        timings[name] = round(time.perf_counter() - start, 6)
+        return result
+
+    # 逐筆的除錯輸出會蓋過結果，量測期間導向 devnull（輸出格式化的成本仍計入）
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        reader = CADReader()
+        if not timed('open_file', reader.open_file, str(dxf_path)):
+            raise RuntimeError(f"無法開啟 {dxf_path}")
+        rebar_texts = timed('extract_rebar_texts', reader.extract_rebar_texts)
+        grouped = timed('process_drawing', reader.process_drawing)
+        reader.close_file()
+
+        output_path = Path(dxf_path).with_suffix('.xlsx')
+        writer = ExcelWriter(image_mode=image_mode)
+        with instrumentation.activate() as run:
+            writer.create_workbook()
+            writer.write_multi_sheet_rebar_data(grouped)
+            timed('save_workbook', writer.save_workbook, str(output_path))
+        os.remove(output_path)
+
+    timings['render'] = round(run.get_seconds('stage.renderer'), 6)
+    timings['write_rows'] = round(run.get_seconds('stage.writer') - run.get_seconds('excel.save'), 6)
+    return {
+        'marks_parsed': len(rebar_texts),
+        'frames': len(grouped),
+        'images_rendered': run.counters.get('images.rendered', 0),
+        'images_reused': run.counters.get('images.reused', 0),
+        'seconds': timings,
+        'peak_rss_bytes': peak_rss_bytes(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="端到端轉換效能基準測試")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="標記數量列表，例如 1k,10k,100k,1m")
+    parser.add_argument('--frames', type=int, default=16, help="每張圖面的 $P- 框線數量")
+    parser.add_argument('--seed', type=int, default=0, help="合成圖面的亂數種子")
+    parser.add_argument('--image-mode', default="mixed", help="ExcelWriter 圖片處理模式")
+    parser.add_argument('--data-dir', default=None, help="合成圖面存放資料夾（保留供下次重複使用，預設使用暫存資料夾）")
+    parser.add_argument('--output', default=None, help="JSON 結果輸出路徑")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    temp_dir = None
+    data_dir = args.data_dir
+    if data_dir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix="cad_benchmark_")
+        data_dir = temp_dir.name
+    os.makedirs(data_dir, exist_ok=True)
+
+    results = []
+    try:
+        for marks in sizes:
+            dxf_path = drawing_path(data_dir, marks, args.frames, args.seed)
+            generated = None
+            if not dxf_path.exists():
+                print(f"🔄 產生 {marks} 個標記的合成圖面...")
+                start = time.perf_counter()
+                generated = generate_drawing(str(dxf_path), marks=marks, frames=args.frames, seed=args.seed)
+                print(f"   {time.perf_counter() - start:.1f}s，{dxf_path.stat().st_size / 1024 / 1024:.1f} MB")
+
+            # 每個規模使用全新的子行程，確保峰值 RSS 與快取狀態獨立
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_case, str(dxf_path), args.image_mode).result()
+            result.update({
+                'marks': marks,
+                'file_bytes': dxf_path.stat().st_size,
+                'drawing': generated,
+            })
+            results.append(result)
+            seconds = result['seconds']
+            print(f"{marks:>9} 標記  " + "  ".join(f"{name} {value:.2f}s" for name, value in seconds.items())
+                  + f"  {(result['peak_rss_bytes'] or 0) / 1024 / 1024:.0f} MB")
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    report = {
+        'benchmark': 'conversion',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'frames': args.frames,
+        'seed': args.seed,
+        'image_mode': args.image_mode,
+        'results': results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"conversion-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"✅ 結果已寫入: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+範例圖面回歸測試與效能基準
+
+逐一轉換 assets/materials/*/text.dxf，讀取輸出活頁簿的儲存格值（不比對格式與圖示），
+與同資料夾的 example-result.xlsx 比對：
+- 資料列：號數、長度、數量、重量
+- 各號數合計重量與總計重量
+重量以整數公斤表示於範例檔，且範例檔使用自己的單位重量表，比對時允許 --weight-tolerance 的相對誤差。
+
+同時記錄每個範例的轉換時間與 tracemalloc 峰值記憶體，並與 benchmarks/golden_baseline.json 比對：
+- 基準中與範例檔相符的範例，現在不相符 → 失敗
+- 轉換結果（資料列）與基準記錄不同 → 失敗（加速改動不可默默改變結果）
+- 時間或峰值記憶體超過基準 × (1 + --margin) → 失敗
+尚未支援的形狀（例如箍筋、施工架）在基準中記為不相符，只要結果不變就不會造成失敗。
+
+使用方式（於專案根目錄）：
+    python -m benchmarks.golden_regression
+    python -m benchmarks.golden_regression --margin 0.5 --only 10-直料,12-折料
+    python -m benchmarks.golden_regression --update-baseline
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+PACKAGE_ROOT = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+MATERIALS_DIR = PACKAGE_ROOT / "assets" / "materials"
+BASELINE_PATH = BENCHMARKS_DIR / "golden_baseline.json"
+
+# 資料表的欄位標題（兩種活頁簿都以標題列定位欄位）
+HEADER_KEYS = {'號數': 'number', '長度(cm)': 'length', '數量': 'count', '重量(kg)': 'weight'}
+
+# 小範例的轉換時間只有數十毫秒，時間上限另加固定寬限，避免計時雜訊造成失敗
+TIME_SLACK_SECONDS = 0.05
+
+
+def find_samples(only=None):
+    """列出含 text.dxf 與 example-result.xlsx 的範例資料夾"""
+    samples = []
+    for folder in sorted(MATERIALS_DIR.iterdir()):
+        if only and folder.name not in only:
+            continue
+        if (folder / "text.dxf").exists() and (folder / "example-result.xlsx").exists():
+            samples.append(folder)
+    return samples
+
+
+def to_number(value):
+    """儲存格值轉為數字，無法轉換時回傳 None"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def read_workbook(path):
+    """
+    讀取料表活頁簿的儲存格值
+
+    以「編號」標題列定位號數、長度、數量、重量欄；標題列之後「編號」為數字的列視為資料列，
+    數量欄為「合計」的列為各號數合計（號數寫在長度欄），「總計」列為總計。
+    沒有標題列的工作表（例如單位重量表）略過。
+
+    Returns:
+        dict: {'rows': [(號數, 長度, 數量, 重量)], 'subtotals': {號數: 重量}, 'total': 重量或 None}
+    """
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    rows, subtotals, total = [], {}, None
+    try:
+        for sheet in workbook.worksheets:
+            columns = None
+            for values in sheet.iter_rows(values_only=True):
+                if not values:
+                    continue
+                if columns is None:
+                    if values[0] == '編號':
+                        columns = {HEADER_KEYS[name]: index for index, name in enumerate(values)
+                                   if name in HEADER_KEYS}
+                    continue
+                cell = {key: values[index] if index < len(values) else None for key, index in columns.items()}
+                if isinstance(values[0], (int, float)):
+                    rows.append((str(cell['number']), to_number(cell['length']),
+                                 to_number(cell['count']), to_number(cell['weight'])))
+                elif cell['count'] == '合計':
+                    number = str(cell['length'])
+                    subtotals[number] = subtotals.get(number, 0.0) + (to_number(cell['weight']) or 0.0)
+                elif cell['count'] == '總計':
+                    total = (total or 0.0) + (to_number(cell['weight']) or 0.0)
+    finally:
+        workbook.close()
+    return {'rows': rows, 'subtotals': subtotals, 'total': total}
+
+
+def weights_match(actual, expected, tolerance):
+    """重量比對：範例檔為整數公斤，允許四捨五入差 0.5 kg 加上相對誤差"""
+    if actual is None or expected is None:
+        return actual == expected
+    return abs(actual - expected) <= 0.5 + abs(expected) * tolerance
+
+
+def compare_results(actual, expected, tolerance):
+    """
+    比對轉換結果與範例檔
+
+    資料列依 (號數, 長度, 數量) 排序後逐列比對；未列出合計或總計的範例檔只比對資料列。
+
+    Returns:
+        list: 差異說明，空列表表示相符
+    """
+    problems = []
+    actual_rows = sorted(actual['rows'], key=lambda row: row[:3])
+    expected_rows = sorted(expected['rows'], key=lambda row: row[:3])
+    if len(actual_rows) != len(expected_rows):
+        problems.append(f"資料列數 {len(actual_rows)} ≠ 範例 {len(expected_rows)}")
+    for actual_row, expected_row in zip(actual_rows, expected_rows):
+        if actual_row[:3] != expected_row[:3] or not weights_match(actual_row[3], expected_row[3], tolerance):
+            problems.append(f"資料列 {actual_row} ≠ 範例 {expected_row}")
+
+    actual_subtotals = {}
+    for number, _, _, weight in actual['rows']:
+        actual_subtotals[number] = actual_subtotals.get(number, 0.0) + (weight or 0.0)
+    for number, weight in expected['subtotals'].items():
+        if not weights_match(actual_subtotals.get(number), weight, tolerance):
+            problems.append(f"{number} 合計 {actual_subtotals.get(number)} ≠ 範例 {weight}")
+    if expected['total'] is not None:
+        actual_total = sum(actual_subtotals.values())
+        if not weights_match(actual_total, expected['total'], tolerance):
+            problems.append(f"總計 {actual_total:.1f} ≠ 範例 {expected['total']}")
+    return problems
+
+
+def convert_sample(dxf_path, output_path):
+    """轉換單一範例（不使用解析快取，除錯輸出導向 devnull）"""
+    from core.converter import convert_file
+
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        if not convert_file(str(dxf_path), str(output_path), use_cache=False):
+            raise RuntimeError(f"轉換失敗: {dxf_path}")
+
+
+def measure_sample(folder, work_dir, repeat):
+    """
+    轉換範例並量測時間（取中位數）與 tracemalloc 峰值（另外執行一次，追蹤的額外成本不計入時間）
+
+    Returns:
+        tuple: (轉換結果, 秒數, 峰值位元組)
+    """
+    output_path = Path(work_dir) / f"{folder.name}.xlsx"
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        convert_sample(folder / "text.dxf", output_path)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        convert_sample(folder / "text.dxf", output_path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return read_workbook(output_path), statistics.median(timings), peak
+
+
+def check_baseline(name, record, baseline, margin):
+    """與基準記錄比對，回傳失敗說明列表"""
+    failures = []
+    if baseline is None:
+        return failures
+    if baseline.get('matches') and not record['matches']:
+        failures.append(f"{name}: 原本與範例檔相符，現在不相符")
+    if baseline.get('rows') is not None and baseline['rows'] != record['rows']:
+        failures.append(f"{name}: 轉換結果與基準不同")
+    seconds_limit = baseline.get('seconds', math.inf) * (1 + margin) + TIME_SLACK_SECONDS
+    if record['seconds'] > seconds_limit:
+        failures.append(f"{name}: 時間 {record['seconds']:.3f}s > 上限 {seconds_limit:.3f}s")
+    memory_limit = baseline.get('peak_memory_bytes', math.inf) * (1 + margin)
+    if record['peak_memory_bytes'] > memory_limit:
+        failures.append(f"{name}: 峰值記憶體 {record['peak_memory_bytes'] / 1024 / 1024:.1f} MB"
+                        f" > 上限 {memory_limit / 1024 / 1024:.1f} MB")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="範例圖面回歸測試與效能基準")
+    parser.add_argument('--margin', type=float, default=0.5, help="時間與記憶體可超過基準的比例（0.5 表示 +50%%）")
+    parser.add_argument('--weight-tolerance', type=float, default=0.01, help="重量比對的相對誤差")
+    parser.add_argument('--repeat', type=int, default=3, help="每個範例的計時次數（取中位數）")
+    parser.add_argument('--only', default=None, help="只執行指定範例，以逗號分隔資料夾名稱")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help="基準 JSON 檔案路徑")
+    parser.add_argument('--update-baseline', action='store_true', help="以本次結果覆寫基準")
+    parser.add_argument('--output', default=None, help="JSON 結果輸出路徑")
+    args = parser.parse_args(argv)
+
+    only = set(args.only.split(',')) if args.only else None
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8')) if baseline_path.exists() else {}
+    baseline_samples = baseline.get('samples', {})
+
+    records = {}
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="cad_golden_") as work_dir:
+        for folder in find_samples(only):
+            expected = read_workbook(folder / "example-result.xlsx")
+            actual, seconds, peak = measure_sample(folder, work_dir, args.repeat)
+            problems = compare_results(actual, expected, args.weight_tolerance)
+            record = {
+                'matches': not problems,
+                'problems': problems,
+                'rows': [list(row) for row in actual['rows']],
+                'seconds': round(seconds, 6),
+                'peak_memory_bytes': peak,
+            }
+            records[folder.name] = record
+            sample_failures = check_baseline(folder.name, record, baseline_samples.get(folder.name), args.margin)
+            failures.extend(sample_failures)
+            status = "✅" if record['matches'] else "⚠️"
+            print(f"{status} {folder.name:<20} {seconds * 1000:8.1f} ms  {peak / 1024 / 1024:6.1f} MB"
+                  + (f"  {problems[0]}" if problems else ""))
+            for failure in sample_failures:
+                print(f"   ❌ {failure}")
+
+    matched = sum(1 for record in records.values() if record['matches'])
+    print(f"\n📊 {matched}/{len(records)} 個範例與範例檔相符")
+
+    report = {
+        'benchmark': 'golden',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'margin': args.margin,
+        'weight_tolerance': args.weight_tolerance,
+        'samples': records,
+        'failures': failures,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"golden-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"✅ 結果已寫入: {output}")
+
+    if args.update_baseline:
+        samples = dict(baseline_samples) if only else {}
+        samples.update({
+            name: {key: record[key] for key in ('matches', 'rows', 'seconds', 'peak_memory_bytes')}
+            for name, record in records.items()
+        })
+        baseline_path.write_text(json.dumps({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'samples': samples,
+        }, ensure_ascii=False, indent=2) + "\n", encoding='utf-8')
+        print(f"✅ 基準已更新: {baseline_path}")
+        return 0
+
+    if failures:
+        print(f"❌ {len(failures)} 項超出基準：")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("✅ 結果與效能皆在基準內")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
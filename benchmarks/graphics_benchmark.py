@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+圖示渲染效能基準測試
+
+對每個已註冊的生成器、每種輸出尺寸，分別在冷快取與熱快取下渲染 N 張圖示，
+回報每秒張數、每張 PNG 位元組數與峰值 RSS，並輸出 JSON 結果供跨版本比對。
+
+使用方式（於專案根目錄）：
+    python -m benchmarks.graphics_benchmark -n 200 --sizes 800x400,400x200,200x120
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows 無 resource 模組
+    resource = None
+
+from utils.graphics import render_service
+from utils.graphics.generators import get_all_generators
+from utils.graphics.generators.base_generator import _load_font, _load_svg_root
+from utils.graphics.materials import load_manifest
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# 各生成器的代表性圖示規格
+SAMPLE_SPECS = {
+    'type10': {'segments': [300], 'angles': [], 'radius': 0, 'label': '#4-300x10'},
+    'type11': {'segments': [390], 'angles': [], 'radius': 0, 'label': '安#3-390x40'},
+    'type12': {'segments': [900, 200], 'angles': [113], 'radius': 0, 'label': 'V113°#10-900+200x2'},
+    'type18': {'segments': [700], 'angles': [], 'radius': 450, 'label': '弧450#10-700x1'},
+    'type19': {'segments': [500, 300], 'angles': [], 'radius': 200, 'label': '直弧200#5-500+300x4'},
+}
+
+
+def clear_caches():
+    """清除材料清單、SVG 模板與字體快取，模擬冷啟動"""
+    load_manifest.cache_clear()
+    _load_svg_root.cache_clear()
+    _load_font.cache_clear()
+    render_service._available_materials = None
+
+
+def peak_rss_bytes():
+    """取得目前行程的峰值 RSS（位元組），無法取得時回傳 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 回傳 KB，macOS 回傳位元組
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def make_specs(rebar_type, count, size):
+    """產生 count 筆段長略有差異的圖示規格"""
+    base = SAMPLE_SPECS[rebar_type]
+    specs = []
+    for i in range(count):
+        spec = dict(base, type=rebar_type, size=size)
+        spec['segments'] = [segment + i % 50 for segment in base['segments']]
+        specs.append(spec)
+    return specs
+
+
+def run_case(rebar_type, count, size, cache):
+    """
+    執行單一測試案例（於獨立子行程中呼叫，峰值 RSS 才不互相影響）
+
+    Returns:
+        dict: 測試結果
+    """
+    specs = make_specs(rebar_type, count, size)
+    clear_caches()
+    if cache == 'warm':
+        render_service.warm_up()
+        render_service.render_png(specs[0])
+
+    total_bytes = 0
+    failures = 0
+    start = time.perf_counter()
+    for spec in specs:
+        if cache == 'cold':
+            clear_caches()
+        data = render_service.render_png(spec)
+        if data is None:
+            failures += 1
+        else:
+            total_bytes += len(data)
+    elapsed = time.perf_counter() - start
+
+    rendered = count - failures
+    return {
+        'generator': rebar_type,
+        'size': f"{size[0]}x{size[1]}",
+        'cache': cache,
+        'count': count,
+        'failures': failures,
+        'seconds': round(elapsed, 6),
+        'images_per_second': round(rendered / elapsed, 2) if elapsed > 0 else None,
+        'bytes_per_image': round(total_bytes / rendered, 1) if rendered else None,
+        'peak_rss_bytes': peak_rss_bytes(),
+    }
+
+
+def parse_sizes(text):
+    """解析尺寸參數，例如 '800x400,200x120'"""
+    sizes = []
+    for item in text.split(','):
+        width, height = item.lower().split('x')
+        sizes.append((int(width), int(height)))
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="圖示渲染效能基準測試")
+    parser.add_argument('-n', '--count', type=int, default=100, help="每個案例渲染的圖示數量")
+    parser.add_argument('--sizes', default="800x400,400x200,200x120", help="輸出尺寸列表")
+    parser.add_argument('--generators', default=None, help="僅測試指定生成器，以逗號分隔")
+    parser.add_argument('--output', default=None, help="JSON 結果輸出路徑")
+    args = parser.parse_args(argv)
+
+    generators = args.generators.split(',') if args.generators else sorted(get_all_generators())
+    sizes = parse_sizes(args.sizes)
+
+    results = []
+    for rebar_type in generators:
+        if rebar_type not in SAMPLE_SPECS:
+            print(f"⚠️ 沒有 {rebar_type} 的範例規格，略過")
+            continue
+        for size in sizes:
+            for cache in ('cold', 'warm'):
+                # 每個案例使用全新的子行程，確保峰值 RSS 與快取狀態獨立
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    result = executor.submit(run_case, rebar_type, args.count, size, cache).result()
+                results.append(result)
+                print(f"{result['generator']:>7} {result['size']:>8} {result['cache']:>4} "
+                      f"{result['images_per_second']:>9} 張/秒 "
+                      f"{result['bytes_per_image']:>9} B/張 "
+                      f"{(result['peak_rss_bytes'] or 0) / 1024 / 1024:7.1f} MB")
+
+    report = {
+        'benchmark': 'graphics',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'count': args.count,
+        'results': results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"graphics-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"✅ 結果已寫入: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+DXF 快速掃描的一致性與效能比較
+
+- 一致性：以 CADReader（ezdxf）與 LexerCADReader（快速掃描）分別處理 assets/materials 的範例圖面
+  與合成圖面，分組結果（框線順序、每支鋼筋的所有欄位）必須完全相同，不同時以非零代碼結束
+- 效能：ezdxf.readfile 與 scan_entities 的讀檔時間，以及兩種讀取器完整 process_drawing 的時間
+
+合成圖面預設為兩種組成：只有鋼筋標記（快速掃描最不利的情況），以及每個標記搭配 5 個幾何實體
+（接近實際圖面）。
+
+使用方式（於專案根目錄）：
+    python -m benchmarks.lexer_benchmark
+    python -m benchmarks.lexer_benchmark --marks 100k --min-speedup 10
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.conversion_benchmark import get_commit, parse_size
+from benchmarks.synthetic_dxf import generate_drawing
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+PACKAGE_ROOT = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+MATERIALS_DIR = PACKAGE_ROOT / "assets" / "materials"
+
+# 合成圖面的組成：名稱 → generate_drawing 參數
+SYNTHETIC_MIXES = {
+    'marks_only': {'mtext_ratio': 0.2},
+    'with_geometry': {'mtext_ratio': 0.2, 'geometry_ratio': 5.0},
+}
+
+
+def process_with(reader_class, dxf_path):
+    """以指定讀取器處理圖面，回傳 (分組結果, 秒數)"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        reader = reader_class()
+        if not reader.open_file(str(dxf_path)):
+            raise RuntimeError(f"無法開啟 {dxf_path}")
+        grouped = reader.process_drawing()
+        reader.close_file()
+        return grouped, time.perf_counter() - start
+
+
+def compare_grouped(expected, actual):
+    """比對兩份分組結果，回傳差異說明（相同時為 None）"""
+    if list(expected) != list(actual):
+        return f"框線不同：{list(expected)} ≠ {list(actual)}"
+    for frame, rebars in expected.items():
+        if len(rebars) != len(actual[frame]):
+            return f"{frame}：{len(rebars)} 筆 ≠ {len(actual[frame])} 筆"
+        for index, (left, right) in enumerate(zip(rebars, actual[frame])):
+            if left != right:
+                return f"{frame} 第 {index + 1} 筆：{dict(left)} ≠ {dict(right)}"
+    return None
+
+
+def time_load(dxf_path):
+    """ezdxf.readfile 與 scan_entities 的讀檔秒數"""
+    import ezdxf
+    from core.dxf_lexer import scan_entities
+
+    start = time.perf_counter()
+    ezdxf.readfile(str(dxf_path))
+    ezdxf_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    scan_entities(str(dxf_path))
+    lexer_seconds = time.perf_counter() - start
+    return ezdxf_seconds, lexer_seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DXF 快速掃描的一致性與效能比較")
+    parser.add_argument('--marks', default="10k", help="合成圖面的標記數量，例如 10k、100k")
+    parser.add_argument('--frames', type=int, default=16, help="合成圖面的 $P- 框線數量")
+    parser.add_argument('--min-speedup', type=float, default=None, help="讀檔加速倍數下限，低於時以非零代碼結束")
+    parser.add_argument('--output', default=None, help="JSON 結果輸出路徑")
+    args = parser.parse_args(argv)
+
+    from core.cad_reader import CADReader
+    from core.dxf_lexer import LexerCADReader
+
+    failures = []
+    samples = sorted(MATERIALS_DIR.glob("*/text.dxf"))
+    for dxf_path in samples:
+        expected, _ = process_with(CADReader, dxf_path)
+        actual, _ = process_with(LexerCADReader, dxf_path)
+        difference = compare_grouped(expected, actual)
+        if difference:
+            failures.append(f"{dxf_path.parent.name}: {difference}")
+    print(f"📊 範例圖面 {len(samples)} 個，不一致 {len(failures)} 個")
+
+    marks = parse_size(args.marks)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="cad_lexer_") as temp_dir:
+        for mix, options in SYNTHETIC_MIXES.items():
+            dxf_path = Path(temp_dir) / f"{mix}.dxf"
+            generate_drawing(str(dxf_path), marks=marks, frames=args.frames, **options)
+            ezdxf_seconds, lexer_seconds = time_load(dxf_path)
+            expected, ezdxf_total = process_with(CADReader, dxf_path)
+            actual, lexer_total = process_with(LexerCADReader, dxf_path)
+            difference = compare_grouped(expected, actual)
+            if difference:
+                failures.append(f"{mix}: {difference}")
+            result = {
+                'mix': mix,
+                'marks': marks,
+                'file_bytes': dxf_path.stat().st_size,
+                'rebars': sum(len(rebars) for rebars in actual.values()),
+                'load_seconds': {'ezdxf': round(ezdxf_seconds, 6), 'lexer': round(lexer_seconds, 6)},
+                'load_speedup': round(ezdxf_seconds / lexer_seconds, 2),
+                'process_seconds': {'ezdxf': round(ezdxf_total, 6), 'lexer': round(lexer_total, 6)},
+                'matches': difference is None,
+            }
+            results.append(result)
+            print(f"  {mix:<14} 讀檔 ezdxf {ezdxf_seconds:.2f}s / 快速掃描 {lexer_seconds:.3f}s"
+                  f"（{result['load_speedup']:.1f}×）  完整處理 {ezdxf_total:.2f}s / {lexer_total:.2f}s"
+                  f"  {'一致' if difference is None else '不一致'}")
+            if args.min_speedup and result['load_speedup'] < args.min_speedup:
+                failures.append(f"{mix}: 讀檔加速 {result['load_speedup']:.1f}× < {args.min_speedup}×")
+
+    report = {
+        'benchmark': 'lexer',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'samples': len(samples),
+        'results': results,
+        'failures': failures,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"lexer-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"✅ 結果已寫入: {output}")
+
+    if failures:
+        print("❌ 快速掃描檢查失敗：")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("✅ 快速掃描與 ezdxf 結果一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+鋼筋標記解析效能與模糊測試
+
+語料包含：
+- 實際圖面：assets/materials/*/text.dxf 中的文字行
+- 文法產生：依 core/processors/grammar.py 每種規格產生的隨機標記
+- 隨機字串：由標記常見字元組成的任意字串
+- 近似標記：對正確標記刪除、插入、替換、重複字元或插入小數點，另含固定的畸形分段（1..2、. 等）
+- 病態長行：重複前綴、沒有數量的超長分段等，長度逐次加倍
+
+量測項目：
+- 各處理器（單一規格）對自己的標記每秒解析次數
+- 整體分派 RebarProcessor.parse_rebar_text 與 MarkParser.parse 對整份語料的每秒解析次數
+- 例外檢查：任何解析函式對任何語料拋出例外（而非回傳 None）時以非零代碼結束
+- 線性時間檢查：病態長行長度加倍時，解析時間的成長指數不得超過 --max-exponent，
+  避免日後新增的規格造成災難性回溯（catastrophic backtracking）；超過時以非零代碼結束
+
+使用方式（於專案根目錄）：
+    python -m benchmarks.parser_benchmark
+    python -m benchmarks.parser_benchmark --random 20000 --max-exponent 1.3
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.synthetic_dxf import make_mark
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+PACKAGE_ROOT = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+MATERIALS_DIR = PACKAGE_ROOT / "assets" / "materials"
+
+# 隨機字串與近似標記使用的字元
+MARK_ALPHABET = "#0123456789-+x.°安母公T弧直鉤VNZL/\\_ "
+
+# 固定的近似標記：小數點重複或沒有數字的分段（float() 無法轉換）
+NEAR_MISS_LINES = [
+    "#4-1..2x5", "#4-.x5", "#4-1.2.3x5", "#4-.+.x5", "#4-1.+2x5", "#10-..+200x2",
+    "V90°#4-1..2+3x5", "安#3-.x40", "弧450#10-.7x1", "母#10公-6..0x16",
+]
+
+# 病態長行：長度參數 n → 字串
+PATHOLOGICAL_LINES = {
+    'repeated_prefix': lambda n: "#1-" * n,
+    'segments_without_count': lambda n: "#10-" + "1+" * n + "1",
+    'long_segment': lambda n: "#10-" + "1" * n + "y",
+    'long_number': lambda n: "#" + "1" * n,
+    'dots': lambda n: "#10-" + "." * n + "x",
+    'repeated_marks_no_count': lambda n: "#3-700x " * n,
+    'repeated_angles': lambda n: "V90°" * n,
+    'repeated_keywords': lambda n: "安母公弧直鉤" * n,
+    'digits': lambda n: "1" * n,
+    'mtext_line': lambda n: ("#4-20+680x13 " + "漢" * 10) * n,
+}
+PATHOLOGICAL_BASE = 1000
+PATHOLOGICAL_DOUBLINGS = 4
+
+# 每個計時點至少執行的秒數（太短時重複執行，降低計時雜訊）
+MIN_TIMING_SECONDS = 0.01
+
+
+def load_material_lines():
+    """讀取範例圖面中的所有文字行"""
+    from core.cad_reader import CADReader
+
+    lines = []
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        for dxf_path in sorted(MATERIALS_DIR.glob("*/text.dxf")):
+            reader = CADReader()
+            if not reader.open_file(str(dxf_path)):
+                continue
+            lines.extend(processed for processed, *_ in reader.iter_text_lines())
+            reader.close_file()
+    return lines
+
+
+def mutate(text, rng):
+    """產生近似標記：隨機刪除、插入、替換、重複一個字元，或在該處插入小數點"""
+    if not text:
+        return rng.choice(MARK_ALPHABET)
+    index = rng.randrange(len(text))
+    operation = rng.randrange(5)
+    if operation == 0:
+        return text[:index] + text[index + 1:]
+    if operation == 1:
+        return text[:index] + rng.choice(MARK_ALPHABET) + text[index:]
+    if operation == 2:
+        return text[:index] + rng.choice(MARK_ALPHABET) + text[index + 1:]
+    if operation == 3:
+        return text[:index] + text[index] * rng.randint(2, 20) + text[index + 1:]
+    # 小數點：插入或取代為一個以上的「.」
+    return text[:index] + "." * rng.randint(1, 3) + text[index + rng.randint(0, 1):]
+
+
+def build_corpus(grammar, random_count, seed):
+    """
+    建立語料
+
+    Returns:
+        dict: {'material': [...], 'grammar': {類型: [...]}, 'random': [...], 'near_miss': [...]}
+    """
+    rng = random.Random(seed)
+    per_type = max(1, random_count // len(grammar))
+    generated = {
+        spec['type']: [make_mark(spec, rng).replace('%%D', '°') for _ in range(per_type)]
+        for spec in grammar
+    }
+    valid = [mark for marks in generated.values() for mark in marks]
+    return {
+        'material': load_material_lines(),
+        'grammar': generated,
+        'random': [''.join(rng.choice(MARK_ALPHABET) for _ in range(rng.randint(1, 40)))
+                   for _ in range(random_count)],
+        'near_miss': NEAR_MISS_LINES + [mutate(rng.choice(valid), rng) for _ in range(random_count)],
+    }
+
+
+def find_exceptions(parsers, texts):
+    """
+    以每個解析函式解析所有文字，收集拋出的例外（解析函式對任何輸入都應回傳結果或 None）
+
+    Returns:
+        tuple: (例外說明列表，例如 "MarkParser('#4-1..2x5'): ValueError: ...", 造成例外的文字集合)
+    """
+    errors, failing = [], set()
+    for name, parse in parsers.items():
+        for text in texts:
+            try:
+                parse(text)
+            except Exception as e:
+                errors.append(f"{name}({text!r}): {type(e).__name__}: {e}")
+                failing.add(text)
+    return errors, failing
+
+
+def time_calls(func, texts):
+    """
+    對 texts 逐一呼叫 func，重複到至少 MIN_TIMING_SECONDS 為止
+
+    Returns:
+        float: 每次呼叫的平均秒數
+    """
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for text in texts:
+            func(text)
+        calls += len(texts)
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIMING_SECONDS:
+            return elapsed / calls
+
+
+def growth_exponent(sizes, seconds):
+    """以最小平方法估計 seconds ∝ sizes^k 的 k（log-log 斜率）"""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(value, 1e-12)) for value in seconds]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator
+
+
+def check_linear_time(parsers, max_exponent):
+    """
+    以病態長行檢查各解析函式的時間成長
+
+    Args:
+        parsers: {名稱: 解析函式}
+
+    Returns:
+        tuple: (量測結果列表, 違規說明列表)
+    """
+    sizes = [PATHOLOGICAL_BASE * 2 ** step for step in range(PATHOLOGICAL_DOUBLINGS + 1)]
+    results, violations = [], []
+    for line_name, make_line in PATHOLOGICAL_LINES.items():
+        lines = [make_line(size) for size in sizes]
+        lengths = [len(line) for line in lines]
+        for parser_name, parse in parsers.items():
+            seconds = [min(time_calls(parse, [line]) for _ in range(3)) for line in lines]
+            exponent = growth_exponent(lengths, seconds)
+            results.append({
+                'line': line_name,
+                'parser': parser_name,
+                'lengths': lengths,
+                'seconds': [round(value, 9) for value in seconds],
+                'exponent': round(exponent, 3),
+            })
+            if exponent > max_exponent:
+                violations.append(f"{parser_name} × {line_name}: 成長指數 {exponent:.2f} > {max_exponent}")
+    return results, violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="鋼筋標記解析效能與模糊測試")
+    parser.add_argument('--random', type=int, default=5000, help="隨機字串與近似標記的數量（各）")
+    parser.add_argument('--seed', type=int, default=0, help="亂數種子")
+    parser.add_argument('--max-exponent', type=float, default=1.3, help="病態長行時間成長指數上限（線性為 1）")
+    parser.add_argument('--output', default=None, help="JSON 結果輸出路徑")
+    args = parser.parse_args(argv)
+
+    from core.dxf_parser import DxfParser
+    from core.processors.grammar import MARK_GRAMMAR, get_mark_parser
+    from core.rebar_processor import RebarProcessor
+
+    mark_parser = get_mark_parser()
+    corpus = build_corpus(MARK_GRAMMAR, args.random, args.seed)
+    mixed = (corpus['material'] + [mark for marks in corpus['grammar'].values() for mark in marks]
+             + corpus['random'] + corpus['near_miss'])
+    print(f"📊 語料：實際 {len(corpus['material'])}、文法 {sum(map(len, corpus['grammar'].values()))}、"
+          f"隨機 {len(corpus['random'])}、近似 {len(corpus['near_miss'])}")
+
+    dxf_parser = DxfParser()
+    parsers = {
+        'MarkParser': mark_parser.parse,
+        'DxfParser': dxf_parser._parse_rebar_mark,
+    }
+    parsers.update({processor.rebar_type: processor.process for processor in mark_parser.processors})
+    parsers['parse_rebar_text'] = RebarProcessor.parse_rebar_text
+
+    # 例外檢查：造成例外的文字記錄後自語料移除，其餘量測照常進行
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        errors, failing = find_exceptions(parsers, mixed)
+    if failing:
+        corpus = {
+            name: ({key: [text for text in texts if text not in failing] for key, texts in value.items()}
+                   if isinstance(value, dict) else [text for text in value if text not in failing])
+            for name, value in corpus.items()
+        }
+        mixed = [text for text in mixed if text not in failing]
+    print(f"🧪 例外檢查：{len(parsers)} 個解析函式，拋出例外 {len(errors)} 次")
+
+    # 各處理器對自己類型的標記
+    processor_results = {}
+    for processor in mark_parser.processors:
+        marks = corpus['grammar'][processor.rebar_type]
+        parsed = sum(processor.process(mark) is not None for mark in marks)
+        per_call = time_calls(processor.process, marks)
+        processor_results[processor.rebar_type] = {
+            'marks': len(marks),
+            'parsed': parsed,
+            'parses_per_second': round(1 / per_call),
+        }
+        print(f"  {processor.rebar_type:<8} {1 / per_call:>12,.0f} 次/秒  解析 {parsed}/{len(marks)}")
+
+    # 整體分派（parse_rebar_text 的逐筆輸出導向 devnull，輸出格式化的成本仍計入）
+    dispatch_results = {}
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        for name, texts in [('material', corpus['material']), ('random', corpus['random']),
+                            ('near_miss', corpus['near_miss']), ('mixed', mixed)]:
+            dispatch_results[name] = {
+                'texts': len(texts),
+                'parsed': sum(mark_parser.parse(text) is not None for text in texts),
+                'parse_rebar_text_per_second': round(1 / time_calls(RebarProcessor.parse_rebar_text, texts)),
+                'mark_parser_per_second': round(1 / time_calls(mark_parser.parse, texts)),
+            }
+    for name, result in dispatch_results.items():
+        print(f"  分派 {name:<10} parse_rebar_text {result['parse_rebar_text_per_second']:>10,} 次/秒  "
+              f"MarkParser {result['mark_parser_per_second']:>10,} 次/秒  解析 {result['parsed']}/{result['texts']}")
+
+    # 線性時間檢查（含每個處理器的單獨規格，新增規格時一併涵蓋）
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        linear_results, violations = check_linear_time(parsers, args.max_exponent)
+    worst = max(linear_results, key=lambda result: result['exponent'])
+    print(f"📈 病態長行最大成長指數 {worst['exponent']:.2f}（{worst['parser']} × {worst['line']}）")
+
+    report = {
+        'benchmark': 'parser',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'max_exponent': args.max_exponent,
+        'processors': processor_results,
+        'dispatch': dispatch_results,
+        'linear_time': linear_results,
+        'violations': violations,
+        'exceptions': errors,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"parser-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"✅ 結果已寫入: {output}")
+
+    if errors:
+        print("❌ 解析時拋出例外：")
+        for error in errors[:20]:
+            print(f"  {error}")
+    if violations:
+        print("❌ 解析時間非線性成長：")
+        for violation in violations:
+            print(f"  {violation}")
+    if errors or violations:
+        return 1
+    print("✅ 所有解析器在病態長行上皆為線性時間且未拋出例外")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
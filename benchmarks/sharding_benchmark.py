@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+分框平行處理的一致性與加速比
+
+以合成圖面分別執行管線轉換（run_conversion_pipeline）與不同行程數的分框平行處理
+（run_sharded_conversion），比對：
+- 分組結果（框線順序、每支鋼筋的所有欄位）
+- 輸出工作簿的資料列、小計與總計（golden_regression.read_workbook）
+不一致時以非零代碼結束。加速比受限於 CPU 核心數，於單核心機器上只能驗證一致性。
+
+使用方式（於專案根目錄）：
+    python -m benchmarks.sharding_benchmark
+    python -m benchmarks.sharding_benchmark --marks 100k --frames 256 --workers 1,2,4,8
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.conversion_benchmark import get_commit, parse_size
+from benchmarks.golden_regression import read_workbook
+from benchmarks.lexer_benchmark import compare_grouped
+from benchmarks.synthetic_dxf import generate_drawing
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+
+def timed_conversion(convert, *args, **kwargs):
+    """執行轉換（逐筆輸出導向 devnull），回傳 (結果, 秒數)"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        result = convert(*args, **kwargs)
+        return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="分框平行處理的一致性與加速比")
+    parser.add_argument('--marks', default="20k", help="合成圖面的標記數量，例如 20k、100k")
+    parser.add_argument('--frames', type=int, default=64, help="合成圖面的 $P- 框線數量")
+    parser.add_argument('--workers', default=None, help="行程數列表，預設為 1、2、4… 到 CPU 核心數")
+    parser.add_argument('--image-mode', default="mixed", help="ExcelWriter 圖片處理模式")
+    parser.add_argument('--output', default=None, help="JSON 結果輸出路徑")
+    args = parser.parse_args(argv)
+
+    from core.pipeline import run_conversion_pipeline
+    from core.sharding import run_sharded_conversion
+
+    cpu_count = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = [int(value) for value in args.workers.split(',')]
+    else:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cpu_count:
+            worker_counts.append(worker_counts[-1] * 2)
+        if worker_counts[-1] != cpu_count:
+            worker_counts.append(cpu_count)
+
+    marks = parse_size(args.marks)
+    failures = []
+    results = []
+    with tempfile.TemporaryDirectory(prefix="cad_sharding_") as temp_dir:
+        dxf_path = Path(temp_dir) / "drawing.dxf"
+        generate_drawing(str(dxf_path), marks=marks, frames=args.frames)
+        baseline_path = Path(temp_dir) / "pipeline.xlsx"
+        (expected, _), baseline_seconds = timed_conversion(run_conversion_pipeline, str(dxf_path),
+                                                           str(baseline_path), image_mode=args.image_mode)
+        expected_workbook = read_workbook(baseline_path)
+        print(f"📊 {marks} 個標記、{args.frames} 個框線、{dxf_path.stat().st_size / 1024 / 1024:.1f} MB；"
+              f"管線轉換 {baseline_seconds:.2f}s")
+
+        for workers in worker_counts:
+            output_path = Path(temp_dir) / f"sharded-{workers}.xlsx"
+            actual, seconds = timed_conversion(run_sharded_conversion, str(dxf_path), str(output_path),
+                                               image_mode=args.image_mode, workers=workers)
+            difference = compare_grouped(expected, actual)
+            if difference is None and read_workbook(output_path) != expected_workbook:
+                difference = "工作簿內容不同"
+            if difference:
+                failures.append(f"{workers} 個行程：{difference}")
+            result = {
+                'workers': workers,
+                'seconds': round(seconds, 6),
+                'speedup': round(baseline_seconds / seconds, 2),
+                'matches': difference is None,
+            }
+            results.append(result)
+            print(f"  {workers:>3} 個行程 {seconds:.2f}s（{result['speedup']:.2f}×）"
+                  f"  {'一致' if difference is None else '不一致'}")
+
+    report = {
+        'benchmark': 'sharding',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': cpu_count,
+        'marks': marks,
+        'frames': args.frames,
+        'pipeline_seconds': round(baseline_seconds, 6),
+        'results': results,
+        'failures': failures,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"sharding-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"✅ 結果已寫入: {output}")
+
+    if failures:
+        print("❌ 分框平行處理結果不一致：")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("✅ 分框平行處理與管線轉換結果一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+啟動時間量測與預算檢查
+
+- 冷啟動：以全新子行程啟動 main.py（或打包後的執行檔），量測到第一個視窗顯示的時間
+- 匯入分析：以 -X importtime 匯入主視窗模組，列出累計耗時最高的模組
+- 與 benchmarks/startup_budget.json 的預算比對，超出時以非零代碼結束，可用於 CI
+
+使用方式（於專案根目錄）：
+    python -m benchmarks.startup_profile --runs 5
+    python -m benchmarks.startup_profile --exe dist/CAD鋼筋計料轉換工具.exe
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+PACKAGE_ROOT = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+BUDGET_PATH = BENCHMARKS_DIR / "startup_budget.json"
+
+# 與 main.py 的 STARTUP_PROBE_ENV 相同（不匯入 main，避免量測行程本身載入 PyQt6）
+STARTUP_PROBE_ENV = "CAD_TOOL_STARTUP_PROBE"
+
+# 匯入分析的目標模組
+MAIN_WINDOW_MODULE = "ui.pyqt_main_window"
+
+# 單次啟動的逾時（秒）
+LAUNCH_TIMEOUT = 60
+
+
+def measure_first_window(command, env):
+    """
+    啟動一次程式並量測到第一個視窗顯示的時間
+
+    Returns:
+        float: 秒數
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        probe_path = os.path.join(temp_dir, "first-window")
+        env = dict(env, **{STARTUP_PROBE_ENV: probe_path})
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=PACKAGE_ROOT, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        while not os.path.exists(probe_path):
+            if process.poll() is not None:
+                stderr = process.stderr.read().decode(errors='replace')
+                raise RuntimeError(f"程式在顯示視窗前結束（代碼 {process.returncode}）\n{stderr}")
+            if time.perf_counter() - start > LAUNCH_TIMEOUT:
+                process.kill()
+                raise RuntimeError(f"等待第一個視窗逾時（{LAUNCH_TIMEOUT} 秒）")
+            time.sleep(0.005)
+        elapsed = time.perf_counter() - start
+        try:
+            process.wait(timeout=LAUNCH_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        return elapsed
+
+
+def profile_imports(env, module=MAIN_WINDOW_MODULE):
+    """
+    以 -X importtime 匯入模組，解析各模組的累計匯入時間
+
+    Returns:
+        tuple: (模組總匯入秒數, [(模組名稱, 累計秒數)]，依耗時由高至低排序)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PACKAGE_ROOT, env=env, capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        # 格式：import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        name = name.strip()
+        cumulative[name] = max(cumulative.get(name, 0), int(cumulative_us) / 1e6)
+    ranked = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)
+    return cumulative.get(module, 0.0), ranked
+
+
+def load_budget(path):
+    """讀取啟動時間預算，檔案不存在時回傳空字典"""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def check_budget(measurements, budget):
+    """比對量測結果與預算，回傳超出預算的項目列表"""
+    violations = []
+    for key, limit in budget.items():
+        value = measurements.get(key)
+        if value is not None and value > limit:
+            violations.append(f"{key}: {value:.3f}s > {limit:.3f}s")
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="啟動時間量測與預算檢查")
+    parser.add_argument('--runs', type=int, default=3, help="冷啟動量測次數（取中位數）")
+    parser.add_argument('--exe', default=None, help="量測打包後的執行檔，而非 python main.py")
+    parser.add_argument('--top', type=int, default=15, help="列出累計匯入時間最高的模組數")
+    parser.add_argument('--budget', default=str(BUDGET_PATH), help="預算 JSON 檔案路徑")
+    parser.add_argument('--output', default=None, help="JSON 結果輸出路徑")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    if sys.platform.startswith('linux') and not env.get('DISPLAY'):
+        # 無顯示器的 CI 環境以 offscreen 平台啟動
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(PACKAGE_ROOT), env.get('PYTHONPATH')]))
+
+    command = [args.exe] if args.exe else [sys.executable, str(PACKAGE_ROOT / "main.py")]
+    timings = []
+    for run in range(args.runs):
+        elapsed = measure_first_window(command, env)
+        timings.append(elapsed)
+        print(f"第 {run + 1} 次冷啟動：{elapsed:.3f}s")
+
+    import_seconds, ranked = profile_imports(env)
+    print(f"\n匯入 {MAIN_WINDOW_MODULE}：{import_seconds:.3f}s，累計耗時最高的模組：")
+    for name, seconds in ranked[:args.top]:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+    measurements = {
+        'time_to_first_window_seconds': statistics.median(timings),
+        'import_main_window_seconds': import_seconds,
+    }
+    budget = load_budget(Path(args.budget))
+    violations = check_budget(measurements, budget)
+
+    report = {
+        'benchmark': 'startup',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'command': command,
+        'runs': [round(t, 6) for t in timings],
+        'measurements': {key: round(value, 6) for key, value in measurements.items()},
+        'budget': budget,
+        'violations': violations,
+        'top_imports': [{'module': name, 'seconds': round(seconds, 6)} for name, seconds in ranked[:args.top]],
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"startup-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"\n✅ 結果已寫入: {output}")
+
+    if violations:
+        print("❌ 超出啟動時間預算：")
+        for violation in violations:
+            print(f"  {violation}")
+        return 1
+    print("✅ 啟動時間在預算內")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
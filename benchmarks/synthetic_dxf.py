@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+合成 DXF 圖面產生器
+
+以 ezdxf 產生可控制規模的測試圖面：
+- $P- 圖層的 LWPOLYLINE 框線，排成方格
+- 各類型的鋼筋標記（由 core/processors/grammar.py 的文法規格產生），以 TEXT 與 MTEXT 兩種實體混合
+- 非鋼筋的雜訊文字（圖名、比例、尺寸等）
+- 圖塊插入（INSERT）與線條、圓弧、一般圖層的多段線等幾何實體，接近實際圖面中文字只佔少數的組成
+部分標記放在框線外，驗證「不在任何框線內時歸入第一個區塊」的規則。
+
+使用方式（於專案根目錄）：
+    python -m benchmarks.synthetic_dxf 輸出.dxf --marks 10000 --frames 16
+"""
+
+import argparse
+import math
+import random
+
+from core.processors.grammar import MARK_GRAMMAR, SLOT_RE
+
+# 雜訊文字範例（不應被解析為鋼筋）
+NOISE_TEXTS = [
+    "B1F 梁配筋圖", "S=1/50", "1:100", "G1", "B2 (40x80)", "FL+3.50", "詳圖 A", "%%C25@150",
+    "#4@20", "註：搭接長度依規範", "C1 60x60", "3-#8", "SEE DWG S-201",
+]
+
+# 各欄位的隨機數值範圍
+BAR_NUMBERS = ['#3', '#4', '#5', '#6', '#7', '#8', '#10']
+ANGLES = [45, 90, 113, 135]
+RADII = [200, 300, 400, 450]
+
+FRAME_SIZE = 1000.0
+FRAME_GAP = 200.0
+
+
+def make_mark(spec, rng):
+    """依文法規格產生一個隨機鋼筋標記（角度符號以 DXF 的 %%D 表示）"""
+    def fill(slot):
+        name, size = slot.group(1), slot.group(2)
+        if name == 'number':
+            return rng.choice(BAR_NUMBERS)
+        if name == 'segments':
+            return '+'.join(str(rng.randrange(20, 1200, 5)) for _ in range(int(size or 1)))
+        if name == 'count':
+            return str(rng.randint(1, 99))
+        if name == 'angle':
+            return str(rng.choice(ANGLES))
+        if name == 'radius':
+            return str(rng.choice(RADII))
+        raise ValueError(name)
+    return SLOT_RE.sub(fill, spec['pattern']).replace('°', '%%D')
+
+
+def make_mark_pool(variety, rng, types=None):
+    """
+    產生標記候選池：每種類型 variety 個不同標記
+
+    真實圖面中同一標記會重複出現，候選池讓圖示數量維持在合理範圍。
+    """
+    specs = [spec for spec in MARK_GRAMMAR if types is None or spec['type'] in types]
+    return [make_mark(spec, rng) for spec in specs for _ in range(variety)]
+
+
+def frame_origins(frames):
+    """框線左下角座標（排成接近正方形的方格）"""
+    columns = max(1, math.ceil(math.sqrt(frames)))
+    step = FRAME_SIZE + FRAME_GAP
+    return [((index % columns) * step, (index // columns) * step) for index in range(frames)]
+
+
+def generate_drawing(path, marks=1000, frames=4, mtext_ratio=0.1, noise_ratio=0.2, inserts=100,
+                     outside_ratio=0.02, variety=5, types=None, seed=0, geometry_ratio=0.0):
+    """
+    產生合成 DXF 圖面
+
+    Args:
+        path: 輸出路徑
+        marks: 鋼筋標記數量（MTEXT 每個實體含兩行標記）
+        frames: $P- 框線數量，0 表示不畫框線
+        mtext_ratio: 以 MTEXT 表示的標記比例
+        noise_ratio: 雜訊文字數量（相對於標記數量）
+        inserts: 圖塊插入數量
+        outside_ratio: 放在框線外的標記比例
+        variety: 每種類型的不同標記數量
+        types: 只產生指定類型（例如 {'type10', 'type12'}），None 表示全部
+        seed: 亂數種子，相同參數產生相同圖面
+        geometry_ratio: 幾何實體（LINE、ARC、CIRCLE、非 $P- 圖層的 LWPOLYLINE）數量（相對於標記數量）
+
+    Returns:
+        dict: 圖面內容統計
+    """
+    import ezdxf
+
+    rng = random.Random(seed)
+    pool = make_mark_pool(variety, rng, types)
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+
+    origins = frame_origins(frames)
+    for index, (x, y) in enumerate(origins):
+        points = [(x, y), (x + FRAME_SIZE, y), (x + FRAME_SIZE, y + FRAME_SIZE), (x, y + FRAME_SIZE)]
+        msp.add_lwpolyline(points, close=True, dxfattribs={'layer': f'$P-F{index + 1:04d}'})
+    extent = (max(x for x, _ in origins) + FRAME_SIZE) if origins else FRAME_SIZE
+
+    def random_position():
+        if not origins or rng.random() < outside_ratio:
+            return (-FRAME_SIZE - rng.uniform(0, FRAME_SIZE), rng.uniform(0, extent))
+        x, y = rng.choice(origins)
+        return (x + rng.uniform(10, FRAME_SIZE - 10), y + rng.uniform(10, FRAME_SIZE - 10))
+
+    mtext_entities = int(marks * mtext_ratio) // 2
+    text_entities = marks - mtext_entities * 2
+    for _ in range(text_entities):
+        msp.add_text(rng.choice(pool), dxfattribs={'insert': random_position(), 'layer': 'REBAR'})
+    for _ in range(mtext_entities):
+        content = f"{rng.choice(pool)}\n{rng.choice(pool)}"
+        msp.add_mtext(content, dxfattribs={'insert': random_position(), 'layer': 'REBAR'})
+
+    noise = int(marks * noise_ratio)
+    for _ in range(noise):
+        msp.add_text(rng.choice(NOISE_TEXTS), dxfattribs={'insert': random_position(), 'layer': 'NOTE'})
+
+    geometry = int(marks * geometry_ratio)
+    for index in range(geometry):
+        x, y = random_position()
+        kind = index % 4
+        if kind == 0:
+            msp.add_line((x, y), (x + rng.uniform(10, 300), y), dxfattribs={'layer': 'GEOM'})
+        elif kind == 1:
+            msp.add_arc((x, y), rng.uniform(5, 50), 0, rng.choice(ANGLES), dxfattribs={'layer': 'GEOM'})
+        elif kind == 2:
+            msp.add_circle((x, y), rng.uniform(1, 5), dxfattribs={'layer': 'GEOM'})
+        else:
+            msp.add_lwpolyline([(x, y), (x + 50, y), (x + 50, y + 20)], dxfattribs={'layer': 'GEOM'})
+
+    if inserts:
+        block = doc.blocks.new(name='SYNTH_DETAIL')
+        block.add_line((0, 0), (100, 0))
+        block.add_line((100, 0), (100, 50))
+        block.add_text("詳圖", dxfattribs={'insert': (10, 10)})
+        for _ in range(inserts):
+            msp.add_blockref('SYNTH_DETAIL', random_position())
+
+    doc.saveas(path)
+    return {
+        'marks': text_entities + mtext_entities * 2,
+        'text_entities': text_entities,
+        'mtext_entities': mtext_entities,
+        'noise_texts': noise,
+        'inserts': inserts,
+        'geometry': geometry,
+        'frames': frames,
+        'distinct_marks': len(set(pool)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="產生合成 DXF 測試圖面")
+    parser.add_argument('output', help="輸出 DXF 路徑")
+    parser.add_argument('--marks', type=int, default=1000, help="鋼筋標記數量")
+    parser.add_argument('--frames', type=int, default=4, help="$P- 框線數量")
+    parser.add_argument('--mtext-ratio', type=float, default=0.1, help="以 MTEXT 表示的標記比例")
+    parser.add_argument('--noise-ratio', type=float, default=0.2, help="雜訊文字數量（相對於標記數量）")
+    parser.add_argument('--inserts', type=int, default=100, help="圖塊插入數量")
+    parser.add_argument('--variety', type=int, default=5, help="每種類型的不同標記數量")
+    parser.add_argument('--types', default=None, help="只產生指定類型，以逗號分隔，例如 type10,type12")
+    parser.add_argument('--seed', type=int, default=0, help="亂數種子")
+    parser.add_argument('--geometry-ratio', type=float, default=0.0, help="幾何實體數量（相對於標記數量）")
+    args = parser.parse_args(argv)
+
+    types = set(args.types.split(',')) if args.types else None
+    stats = generate_drawing(args.output, args.marks, args.frames, args.mtext_ratio, args.noise_ratio,
+                             args.inserts, variety=args.variety, types=types, seed=args.seed,
+                             geometry_ratio=args.geometry_ratio)
+    print(f"✅ 已產生 {args.output}：" + "、".join(f"{key}={value}" for key, value in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,28 +14,48 @@ a = Analysis(
         ('ui', 'ui'),
     ],
     hiddenimports=[
-        'pandas',
+        # 以下模組於函數內延遲匯入，明確列出以確保打包
         'ezdxf',
         'openpyxl',
-        # 'matplotlib',  # 已移除
-        # 'PIL',  # 已移除
-        'tkinter',
-        'tkinter.messagebox',
-        'tkinter.filedialog',
-        'tkinter.ttk',
+        'PIL',
+        'numpy',
         'utils.helpers',
-        # 'utils.graphics',  # 已移除
+        'utils.progress',
+        'utils.instrumentation',
+        'utils.memory_profile',
+        'utils.graphics.manager',
+        'utils.graphics.materials',
+        'utils.graphics.geometry',
+        'utils.graphics.render_service',
+        'utils.graphics.generators',
         'core.rebar_processor',
+        'core.processors',
         'core.excel_writer',
+        'core.excel_writers',
         'core.cad_reader',
+        'core.converter',
+        'core.parse_cache',
+        'core.rebar_record',
+        'core.rebar_table',
+        'core.aggregation',
+        'core.dxf_lexer',
+        'core.estimate',
+        'core.sharding',
+        'core.pipeline',
         'core.dxf_parser',
-        'ui.main_window',
-        'ui.styles',
+        'ui.pyqt_main_window',
+        'ui.job_queue_panel',
+        'ui.preview_panel',
     ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=[
+        # 未使用的大型套件，排除以縮小體積並加快冷啟動
+        'pandas',
+        'tkinter',
+        'matplotlib',
+    ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
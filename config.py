@@ -12,6 +12,56 @@ LAST_UPDATED = "2025-06-03"
 WINDOW_TITLE = f"CAD 鋼筋計料轉換工具 Pro {VERSION}"
 WINDOW_SIZE = "900x750"
 
+# 批次佇列設定
+BATCH_JOB_MEMORY_MB = 1024    # 每個轉換工作預估使用的記憶體 (MB)，用於限制同時轉換數量
+BATCH_MAX_CONCURRENCY = 8     # 使用者可設定的最大同時轉換數量
+BATCH_CRASH_RETRIES = 1       # 工作隨行程池崩潰後以獨立行程重試的次數，獨立執行仍崩潰即視為失敗
+
+# HTTP 轉換服務設定
+SERVICE_HOST = "127.0.0.1"            # 僅監聽本機
+SERVICE_PORT = 8765
+SERVICE_MAX_UPLOAD_MB = 50            # 單一 DXF 上傳大小上限 (MB)
+SERVICE_MAX_QUEUED_JOBS = 16          # 等待中工作上限，超過時回應 503
+SERVICE_MAX_RETAINED_JOBS = 200       # 保留的已結束工作數量，超過時刪除最舊的結果
+SERVICE_REQUEST_TIMEOUT = 30          # 讀取單一請求的逾時（秒）
+
+# 監看資料夾設定
+WATCH_POLL_INTERVAL = 2.0             # 掃描資料夾的間隔（秒）
+WATCH_DEBOUNCE_SECONDS = 3.0          # 檔案大小與修改時間需維持不變的秒數，避免轉換寫入中的檔案
+WATCH_STATE_FILENAME = ".cad_watch_state.json"  # 輸出資料夾中的狀態索引檔名
+
+# 管線轉換設定
+PIPELINE_BATCH_SIZE = 64              # 階段間每次傳遞的項目數
+PIPELINE_QUEUE_DEPTH = 8              # 階段間佇列可容納的批次數，限制同時在記憶體中的項目
+
+# 分框平行處理設定
+SHARD_WORKERS = None                  # 單一圖面分框平行處理的行程數，None 表示 CPU 核心數
+SHARD_MIN_BYTES = 64 * 1024 * 1024    # DXF 檔案達此大小且有多個 CPU 核心時，改以分框平行處理轉換
+
+# 合併模式設定
+AGGREGATE_MARKS = False               # 是否將同一框線內相同的鋼筋合併為一筆（數量與重量相加）
+AGGREGATE_POSITION_LIMIT = 200        # 「來源位置」欄最多列出的插入點數量
+
+# DXF 讀取設定
+DXF_FAST_LEXER = False                # 以 mmap 直接掃描 DXF 群組碼讀取文字與框線（不建立 ezdxf 實體）；無法掃描時自動改用 ezdxf
+
+# 欄式鋼筋表設定
+REBAR_TABLE_CHUNK_SIZE = 4096         # 由鋼筋記錄填入欄式表格時每批轉換的筆數
+
+# 執行量測設定
+FOOTER_RUN_SUMMARY = False            # 啟用執行量測時，是否在工作表頁尾附上量測摘要
+MEMORY_BUDGET_MB = None               # 記憶體分析模式的 RSS 上限 (MB)，超過時中止轉換；None 表示不限制
+MEMORY_SAMPLE_INTERVAL = 0.05         # 記憶體分析模式的 RSS 取樣間隔（秒）
+MEMORY_TOP_ALLOCATIONS = 10           # 每個階段列出的配置位置數量
+
+# 解析結果快取設定
+PARSE_CACHE_DIR = None                # 快取資料夾，None 表示使用者快取目錄下的 cad_rebar_tool/parse_cache
+PARSE_CACHE_MAX_MB = 256              # 快取總大小上限 (MB)，超過時刪除最久未使用的項目
+
+# 快速估算設定
+ESTIMATE_BATCH_SIZE = 65536           # 快速估算每批以向量運算判斷框線的文字行數
+ESTIMATE_PARALLEL_MIN_BYTES = 16 * 1024 * 1024  # DXF 檔案達此大小且有多個 CPU 核心時，快速估算以多個行程平行掃描
+
 # 配色主題
 COLORS = {
     'primary': '#4A90E2',      # 主要藍色 - 用於重要按鈕和標題
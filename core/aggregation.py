@@ -0,0 +1,65 @@
+"""
+鋼筋標記合併
+
+同一個框線內重複出現的相同鋼筋（類型、號數、分段長度、角度、半徑皆相同）合併為一筆：
+數量與重量相加，各次出現的插入點保存在 source_positions，寫入 Excel 時放在「來源位置」欄；
+其餘欄位（讀取CAD文字、圖示標籤等）沿用第一次出現的標記。
+以雜湊表一次掃描完成，合併後的資料列數與需要產生的圖示數量隨重複程度減少。
+"""
+
+from dataclasses import replace
+
+from config import AGGREGATE_POSITION_LIMIT
+from core.rebar_record import Rebar
+from utils import instrumentation
+
+
+def get_merge_key(rebar):
+    """合併鍵值：幾何資料相同的鋼筋視為同一種"""
+    return (rebar.type, rebar.rebar_number, rebar.segments, rebar.angles, rebar.radius)
+
+
+def aggregate_rebars(rebar_list):
+    """
+    合併單一區塊內的相同鋼筋（保留第一次出現的順序）
+
+    Args:
+        rebar_list: 鋼筋列表（Rebar 記錄或舊格式字典）
+
+    Returns:
+        list: 合併後的 Rebar 記錄列表
+    """
+    merged = {}
+    for rebar in rebar_list:
+        rebar = Rebar.from_dict(rebar)
+        key = get_merge_key(rebar)
+        entry = merged.get(key)
+        if entry is None:
+            merged[key] = [rebar, rebar.count, rebar.weight, [rebar.position]]
+            continue
+        entry[1] += rebar.count
+        entry[2] += rebar.weight
+        entry[3].append(rebar.position)
+
+    instrumentation.count('marks.merged', len(rebar_list) - len(merged))
+    return [
+        replace(first, count=count, weight=weight,
+                source_positions=tuple(position for position in positions if position is not None))
+        for first, count, weight, positions in merged.values()
+    ]
+
+
+def aggregate_grouped(grouped):
+    """合併 process_drawing 分組結果中每個區塊的相同鋼筋（不跨區塊合併）"""
+    return {frame: aggregate_rebars(rebar_list) for frame, rebar_list in grouped.items()}
+
+
+def format_source_positions(rebar, limit=AGGREGATE_POSITION_LIMIT):
+    """「來源位置」欄的文字：出現次數與各插入點座標，超過 limit 個時省略其餘"""
+    positions = rebar.get('source_positions') or ()
+    if not positions:
+        return ''
+    text = "、".join(f"({x:.1f}, {y:.1f})" for x, y in positions[:limit])
+    if len(positions) > limit:
+        text += f"…等 {len(positions)} 處"
+    return f"{len(positions)} 處：{text}"
@@ -2,8 +2,10 @@
 CAD 檔案讀取相關功能模組
 """
 
-import ezdxf
 from core.rebar_processor import RebarProcessor
+from core.rebar_record import Rebar
+from utils import instrumentation
+from utils.progress import ConversionCancelled
 
 class CADReader:
     """CAD 檔案讀取器"""
@@ -15,8 +17,11 @@ class CADReader:
     
     def open_file(self, file_path):
         """開啟 DXF 檔案"""
+        # ezdxf 載入成本高，延遲到第一次開檔才匯入以縮短程式啟動時間
+        import ezdxf
         try:
-            self.dxf_file = ezdxf.readfile(file_path)
+            with instrumentation.timer('dxf.load'):
+                self.dxf_file = ezdxf.readfile(file_path)
             self.modelspace = self.dxf_file.modelspace()
             return True
         except Exception as e:
@@ -28,42 +33,76 @@ class CADReader:
         if self.dxf_file:
             self.dxf_file = None
             self.modelspace = None
+
+    def has_drawing(self):
+        """是否已開啟圖面"""
+        return self.modelspace is not None
     
-    def extract_rebar_texts(self):
-        """提取圖面中的鋼筋文字標記"""
+    def count_text_entities(self):
+        """TEXT 與 MTEXT 實體總數"""
+        if not self.modelspace:
+            return 0
+        return len(self.modelspace.query('TEXT')) + len(self.modelspace.query('MTEXT'))
+
+    def iter_text_lines(self):
+        """
+        依序產生圖面中的文字行（先 TEXT 後 MTEXT，多行文字逐行拆開）
+
+        Yields:
+            tuple: (已處理特殊編碼的文字, 原始文字, 插入點, 旋轉角度, 已掃描實體數)
+        """
         if not self.modelspace:
+            return
+        scanned = 0
+        for text in self.modelspace.query('TEXT'):
+            scanned += 1
+            instrumentation.count('entities.scanned')
+            # 處理 DXF 特殊編碼
+            processed_text = text.dxf.text.replace('%%D', '°')
+            print(f"[DEBUG][TEXT] {text.dxf.text} -> {processed_text}")
+            yield processed_text, text.dxf.text, text.dxf.insert, text.dxf.rotation, scanned
+
+        for mtext in self.modelspace.query('MTEXT'):
+            scanned += 1
+            instrumentation.count('entities.scanned')
+            text_content = mtext.text
+            print(f"[DEBUG][MTEXT] {text_content}")
+            # 分割多行文字
+            for line in text_content.split('\n'):
+                # 處理 DXF 特殊編碼
+                yield line.replace('%%D', '°'), line, mtext.dxf.insert, mtext.dxf.rotation, scanned
+
+    def parse_text_line(self, processed_text, raw_text, position, rotation):
+        """解析單行文字，回傳帶有插入點的 Rebar 記錄，非鋼筋標記時回傳 None"""
+        rebar_info = self.rebar_processor.parse_rebar_text(processed_text)
+        if rebar_info:
+            # 插入點轉為浮點數保存，不保留 ezdxf 的 Vec3
+            rebar_info = Rebar.from_dict(rebar_info).with_position(position, rotation, raw_text)
+        return rebar_info
+
+    def extract_rebar_texts(self, progress=None):
+        """
+        提取圖面中的鋼筋文字標記
+        
+        Args:
+            progress: ProgressReporter，逐一實體回報進度並檢查取消
+        """
+        if not self.has_drawing():
             return []
         
         rebar_texts = []
         
         try:
-            # 遍歷所有文字實體
-            for text in self.modelspace.query('TEXT'):
-                # 處理 DXF 特殊編碼
-                processed_text = text.dxf.text.replace('%%D', '°')
-                print(f"[DEBUG][TEXT] {text.dxf.text} -> {processed_text}")
-                rebar_info = self.rebar_processor.parse_rebar_text(processed_text)
+            total = self.count_text_entities()
+            for processed_text, raw_text, position, rotation, scanned in self.iter_text_lines():
+                if progress:
+                    progress.update(scanned, total)
+                rebar_info = self.parse_text_line(processed_text, raw_text, position, rotation)
                 if rebar_info:
-                    rebar_info['position'] = text.dxf.insert
-                    rebar_info['rotation'] = text.dxf.rotation
-                    rebar_info['raw_text'] = text.dxf.text
                     rebar_texts.append(rebar_info)
-            
-            # 遍歷所有多行文字實體
-            for mtext in self.modelspace.query('MTEXT'):
-                text_content = mtext.text
-                print(f"[DEBUG][MTEXT] {text_content}")
-                # 分割多行文字
-                for line in text_content.split('\n'):
-                    # 處理 DXF 特殊編碼
-                    processed_line = line.replace('%%D', '°')
-                    rebar_info = self.rebar_processor.parse_rebar_text(processed_line)
-                    if rebar_info:
-                        rebar_info['position'] = mtext.dxf.insert
-                        rebar_info['rotation'] = mtext.dxf.rotation
-                        rebar_info['raw_text'] = line
-                        rebar_texts.append(rebar_info)
         
+        except ConversionCancelled:
+            raise
         except Exception as e:
             print(f"提取鋼筋文字錯誤: {str(e)}")
         
@@ -74,12 +113,20 @@ class CADReader:
         if not self.modelspace:
             return []
         tables = []
-        for polyline in self.modelspace.query('LWPOLYLINE'):
-            layer = polyline.dxf.layer if hasattr(polyline.dxf, 'layer') else ''
-            if layer.startswith('$P-'):
-                name = layer[3:] if len(layer) > 3 else layer
-                points = [(point[0], point[1]) for point in polyline.get_points()]
-                tables.append({'name': name, 'points': points})
+        with instrumentation.timer('frames.tables'):
+            for polyline in self.modelspace.query('LWPOLYLINE'):
+                layer = polyline.dxf.layer if hasattr(polyline.dxf, 'layer') else ''
+                if layer.startswith('$P-'):
+                    name = layer[3:] if len(layer) > 3 else layer
+                    points = [(point[0], point[1]) for point in polyline.get_points()]
+                    tables.append({'name': name, 'points': points})
+        return tables
+
+    def get_frame_tables(self):
+        """取得分組用的框線，若沒框線，全部歸入 '全部'"""
+        tables = self.get_rebar_tables()
+        if not tables:
+            tables = [{'name': '全部', 'points': None}]
         return tables
 
     @staticmethod
@@ -98,47 +145,99 @@ class CADReader:
             j = i
         return inside
 
-    def process_drawing(self):
-        """處理整個圖面，依據框線分組回傳 dict: {區塊名稱: [rebar list]}"""
-        if not self.modelspace:
+    @staticmethod
+    def points_in_polygon(xs, ys, polygon):
+        """point_in_polygon 的向量版本：xs、ys 為座標陣列，回傳布林陣列（浮點運算與逐點判斷相同）"""
+        # numpy 載入成本高，延遲到第一次使用才匯入以縮短程式啟動時間
+        import numpy as np
+
+        inside = np.zeros(len(xs), dtype=bool)
+        j = len(polygon) - 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i in range(len(polygon)):
+                xi, yi = polygon[i]
+                xj, yj = polygon[j]
+                crossing = (ys < yi) != (ys < yj)
+                inside ^= crossing & (xs < (xj - xi) * (ys - yi) / (yj - yi + 1e-12) + xi)
+                j = i
+        return inside
+
+    def find_frame(self, position, tables):
+        """找出插入點所在的框線名稱，不在任何框線內時歸入第一個區塊"""
+        with instrumentation.timer('frames.assign'):
+            if position:
+                x, y = position[0], position[1]
+                for tb in tables:
+                    if tb['points'] and self.point_in_polygon(x, y, tb['points']):
+                        return tb['name']
+            return tables[0]['name']
+
+    def find_frames(self, xs, ys, tables):
+        """
+        find_frame 的向量版本，一次判斷多個插入點
+
+        Returns:
+            numpy.ndarray: 各插入點所在框線在 tables 中的索引，不在任何框線內時為 0
+        """
+        import numpy as np
+
+        with instrumentation.timer('frames.assign'):
+            frame_ids = np.zeros(len(xs), dtype=np.int32)
+            assigned = np.zeros(len(xs), dtype=bool)
+            for index, tb in enumerate(tables):
+                if tb['points']:
+                    # 射線法只有 y 座標介於邊的兩端點之間才計算交點，頂點 y 範圍外的插入點必在框線外，
+                    # 只對範圍內且尚未分配的插入點判斷（結果與逐點判斷相同，取第一個包含插入點的框線）
+                    polygon_ys = [point[1] for point in tb['points']]
+                    candidates = np.flatnonzero(~assigned & (ys >= min(polygon_ys)) & (ys <= max(polygon_ys)))
+                    hit = candidates[self.points_in_polygon(xs[candidates], ys[candidates], tb['points'])]
+                    frame_ids[hit] = index
+                    assigned[hit] = True
+            return frame_ids
+
+    def make_rebar_entry(self, rebar_text):
+        """
+        建立鋼筋條目（不包含線條相關資訊）
+
+        處理器產生的 Rebar 記錄已包含直徑、單位重量與材質等級，直接沿用不再複製；
+        舊格式的字典則轉為 Rebar 記錄並依號數補上這些欄位。
+        """
+        return Rebar.from_dict(rebar_text)
+
+    def process_drawing(self, progress=None, stage_range=(0, 100)):
+        """
+        處理整個圖面，依據框線分組回傳 dict: {區塊名稱: [rebar list]}
+        
+        Args:
+            progress: ProgressReporter，回報實體掃描與框線分組進度並檢查取消
+            stage_range: 本步驟在整體進度中所佔的百分比範圍
+        """
+        if not self.has_drawing():
             return None
+        start, end = stage_range
+        middle = start + (end - start) * 2 // 3
         try:
-            rebar_texts = self.extract_rebar_texts()
-            tables = self.get_rebar_tables()
+            if progress:
+                progress.stage(start, middle, "正在掃描文字實體")
+            rebar_texts = self.extract_rebar_texts(progress)
+            tables = self.get_frame_tables()
             
             # 預設分組: {區塊名稱: [rebar list]}
             grouped = {tb['name']: [] for tb in tables}
             
-            # 若沒框線，全部歸入 '全部'
-            if not tables:
-                grouped = {'全部': []}
-                tables = [{'name': '全部', 'points': None}]
-            
             # 處理每個鋼筋文字
-            for rebar_text in rebar_texts:
-                pos = rebar_text.get('position')
-                target_name = tables[0]['name']  # 預設歸入第一個區塊
-                
-                if pos:
-                    x, y = pos[0], pos[1]
-                    for tb in tables:
-                        if tb['points'] and self.point_in_polygon(x, y, tb['points']):
-                            target_name = tb['name']
-                            break
-                
-                # 建立鋼筋條目（不包含線條相關資訊）
-                rebar_entry = dict(rebar_text)
-                rebar_entry.update({
-                    'diameter': self.rebar_processor.get_rebar_diameter(rebar_entry['rebar_number']),
-                    'unit_weight': self.rebar_processor.get_rebar_unit_weight(rebar_entry['rebar_number']),
-                    'grade': self.rebar_processor.get_rebar_grade(rebar_entry['rebar_number']),
-                    'position': rebar_text.get('position'),
-                })
-                
-                grouped[target_name].append(rebar_entry)
+            if progress:
+                progress.stage(middle, end, "正在依框線分組")
+            for index, rebar_text in enumerate(rebar_texts, 1):
+                if progress:
+                    progress.update(index, len(rebar_texts))
+                target_name = self.find_frame(rebar_text.get('position'), tables)
+                grouped[target_name].append(self.make_rebar_entry(rebar_text))
             
             return grouped
             
+        except ConversionCancelled:
+            raise
         except Exception as e:
             print(f"處理圖面錯誤: {str(e)}")
             return None 
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""
+DXF → Excel 轉換流程模組
+
+將「開啟 CAD → 處理圖面 → 寫入 Excel → 儲存」的完整流程包裝為單一函數，
+供 UI 執行緒、批次佇列等不同入口共用。
+"""
+
+import os
+import time
+
+from config import AGGREGATE_MARKS, MEMORY_BUDGET_MB
+from core.dxf_lexer import create_cad_reader
+from core.parse_cache import ParseCache
+from utils import instrumentation
+from utils.progress import ConversionCancelled
+
+
+class ConversionError(Exception):
+    """轉換失敗（無法開啟檔案或處理圖面）"""
+    pass
+
+
+def lookup_cached_rebar_data(cad_file_path):
+    """
+    查詢解析結果快取
+
+    Returns:
+        tuple: (ParseCache, 快取鍵, 快取的分組資料或 None)；無法讀取時快取鍵為 None
+    """
+    cache = ParseCache()
+    try:
+        cache_key = cache.make_key(cad_file_path)
+        return cache, cache_key, cache.get(cache_key)
+    except OSError as e:
+        print(f"⚠️ 無法讀取解析快取: {e}")
+        return cache, None, None
+
+
+def store_cached_rebar_data(cache, cache_key, rebar_data):
+    """寫入解析結果快取（失敗時僅顯示警告）"""
+    if not cache_key:
+        return
+    try:
+        cache.put(cache_key, rebar_data)
+    except OSError as e:
+        print(f"⚠️ 無法寫入解析快取: {e}")
+
+
+def load_rebar_data(cad_file_path, progress=None, stage_range=(0, 100), use_cache=True):
+    """
+    讀取並解析 DXF 檔案，優先使用解析結果快取
+
+    Args:
+        cad_file_path: DXF 檔案路徑
+        progress: ProgressReporter，None 表示不回報進度
+        stage_range: 本步驟在整體進度中所佔的百分比範圍
+        use_cache: 是否讀寫解析結果快取
+
+    Returns:
+        dict: 依框線分組的鋼筋資料 {區塊名稱: [rebar list]}（合併模式為合併後的資料）
+
+    Raises:
+        ConversionError: 無法開啟 CAD 檔案或處理圖面失敗
+        ConversionCancelled: 解析過程中被取消
+    """
+    start, end = stage_range
+    opened = start + (end - start) // 4
+    cache, cache_key = None, None
+    if use_cache:
+        cache, cache_key, rebar_data = lookup_cached_rebar_data(cad_file_path)
+        if rebar_data:
+            print(f"⚡ 使用解析快取：{cad_file_path}")
+            if progress:
+                progress.stage(end, end, "已載入解析快取")
+            return rebar_data
+
+    cad_reader = create_cad_reader()
+    try:
+        # 開啟 CAD 檔案
+        if progress:
+            progress.stage(start, opened, "正在開啟 CAD 檔案...")
+        with instrumentation.stage('reader'):
+            if not cad_reader.open_file(cad_file_path):
+                raise ConversionError("無法開啟 CAD 檔案")
+
+        # 處理圖面
+        with instrumentation.stage('parser'):
+            rebar_data = cad_reader.process_drawing(progress, stage_range=(opened, end))
+        if not rebar_data:
+            raise ConversionError("處理圖面失敗")
+    finally:
+        cad_reader.close_file()
+
+    store_cached_rebar_data(cache, cache_key, rebar_data)
+    return rebar_data
+
+
+def convert_file(cad_file_path, excel_file_path, progress=None, image_mode="mixed", rebar_data=None,
+                 use_cache=True, pipelined=True, report_path=None, profile_memory=False,
+                 memory_budget_mb=MEMORY_BUDGET_MB, aggregate=AGGREGATE_MARKS, sharded=None,
+                 parallel_render=None):
+    """
+    轉換單一 DXF 檔案為 Excel 鋼筋計料表
+
+    Args:
+        cad_file_path: DXF 檔案路徑
+        excel_file_path: Excel 輸出路徑
+        progress: ProgressReporter，None 表示不回報進度
+        image_mode: ExcelWriter 圖片處理模式
+        rebar_data: 已解析的分組資料（例如預覽結果），提供時略過 CAD 讀取與解析
+        use_cache: 是否讀寫解析結果快取
+        pipelined: 需要解析 DXF 時，是否以管線方式同時進行解析、產生圖示與寫入
+        report_path: 執行報告 JSON 輸出路徑，提供時記錄各階段耗時與計數（失敗時也會寫出）
+        profile_memory: 是否啟用記憶體分析模式（停用管線，各階段依序執行並量測記憶體）
+        memory_budget_mb: 記憶體分析模式的 RSS 上限 (MB)，超過時拋出 MemoryBudgetExceeded
+        aggregate: 是否將同一框線內相同的鋼筋合併為一筆（停用管線，解析完成後合併再寫入）
+        sharded: 需要解析 DXF 時，是否依框線分給多個行程平行處理；None 表示檔案達 SHARD_MIN_BYTES
+                 且有多個 CPU 核心時自動啟用（記憶體分析與合併模式不使用；批次佇列、HTTP 服務與
+                 監看資料夾的 convert_file_job 已在行程池中執行，一律不使用）
+        parallel_render: 逐步寫入工作表時（未使用管線或分框平行處理，例如預覽資料、快取與合併模式），
+                         是否以 RenderService 行程池產生圖示；None 表示有多個 CPU 核心時啟用
+                         （記憶體分析模式與 convert_file_job 不使用）
+
+    Returns:
+        dict: 依框線分組的鋼筋資料 {區塊名稱: [rebar list]}
+
+    Raises:
+        ConversionError: 無法開啟 CAD 檔案或處理圖面失敗
+        ConversionCancelled: 轉換過程中被取消
+        MemoryBudgetExceeded: 記憶體分析模式下 RSS 超過預算
+    """
+    if report_path or profile_memory:
+        if profile_memory:
+            from utils.memory_profile import MemoryProfiler
+            run = MemoryProfiler(memory_budget_mb).start()
+        else:
+            run = instrumentation.RunInstrumentation()
+        with instrumentation.activate(run):
+            run.record('input', cad_file_path)
+            run.record('output', excel_file_path)
+            status = "failed"
+            try:
+                with run.timer('total'):
+                    rebar_data = convert_file(cad_file_path, excel_file_path, progress, image_mode, rebar_data,
+                                              use_cache, pipelined and not profile_memory,
+                                              aggregate=aggregate, sharded=False if profile_memory else sharded,
+                                              parallel_render=False if profile_memory else parallel_render)
+                run.record('sheets', len(rebar_data))
+                run.record('bars', sum(len(rebar_list) for rebar_list in rebar_data.values()))
+                status = "ok"
+                return rebar_data
+            except ConversionCancelled:
+                status = "cancelled"
+                raise
+            except Exception as e:
+                run.record('error', str(e))
+                raise
+            finally:
+                run.record('status', status)
+                if profile_memory:
+                    run.stop()
+                    run.print_report()
+                if report_path:
+                    run.write_json(report_path)
+
+    # openpyxl 與圖形模組載入成本高，延遲到第一次轉換才匯入
+    from core.excel_writer import ExcelWriter
+
+    if rebar_data is None and not aggregate and sharded is None:
+        from core.sharding import should_shard
+        sharded = should_shard(cad_file_path)
+
+    if rebar_data is None and (pipelined or sharded) and not aggregate:
+        cache, cache_key = None, None
+        if use_cache:
+            cache, cache_key, rebar_data = lookup_cached_rebar_data(cad_file_path)
+        if not rebar_data:
+            if sharded:
+                from core.sharding import run_sharded_conversion
+                rebar_data = run_sharded_conversion(cad_file_path, excel_file_path, progress, image_mode)
+            else:
+                from core.pipeline import run_conversion_pipeline
+                rebar_data, _ = run_conversion_pipeline(cad_file_path, excel_file_path, progress, image_mode)
+            store_cached_rebar_data(cache, cache_key, rebar_data)
+            return rebar_data
+        print(f"⚡ 使用解析快取：{cad_file_path}")
+
+    if rebar_data is None:
+        rebar_data = load_rebar_data(cad_file_path, progress, stage_range=(0, 40), use_cache=use_cache)
+
+    if aggregate:
+        from core.aggregation import aggregate_grouped
+        rebar_data = aggregate_grouped(rebar_data)
+
+    if parallel_render is None:
+        parallel_render = (os.cpu_count() or 1) > 1
+    render_service = None
+    if parallel_render:
+        from utils.graphics.render_service import RenderService
+        render_service = RenderService()
+    excel_writer = ExcelWriter(image_mode=image_mode, aggregated=aggregate, render_service=render_service)
+    try:
+        # 生成 Excel
+        excel_writer.create_workbook()
+        excel_writer.write_multi_sheet_rebar_data(rebar_data, progress=progress, stage_range=(40, 90))
+        if progress:
+            progress.stage(90, 100, "正在儲存 Excel 檔案...")
+        excel_writer.save_workbook(excel_file_path, progress=progress)
+
+        if progress:
+            progress.stage(100, 100, "轉換完成！")
+        return rebar_data
+    finally:
+        # 清理資源
+        excel_writer._cleanup_temp_files()
+        if render_service is not None:
+            render_service.shutdown()
+
+
+def convert_file_job(cad_file_path, excel_file_path, image_mode="mixed", report_path=None):
+    """
+    批次佇列用的轉換函數（於子行程中執行，只回傳可序列化的摘要）
+
+    Args:
+        report_path: 執行報告 JSON 輸出路徑，None 表示不量測
+
+    Returns:
+        dict: {'output': 輸出路徑, 'sheets': 區塊數, 'bars': 鋼筋筆數, 'seconds': 耗時}
+    """
+    start = time.perf_counter()
+    # 已在批次行程池中執行，行程數由行程池控制，不再分框平行處理或建立圖示行程池
+    rebar_data = convert_file(cad_file_path, excel_file_path, image_mode=image_mode, report_path=report_path,
+                              sharded=False, parallel_render=False)
+    return {
+        'output': excel_file_path,
+        'sheets': len(rebar_data),
+        'bars': sum(len(rebar_list) for rebar_list in rebar_data.values()),
+        'seconds': time.perf_counter() - start,
+    }
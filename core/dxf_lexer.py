@@ -0,0 +1,324 @@
+"""
+DXF 標籤快速掃描
+
+只需要文字與框線時，不必讓 ezdxf 建立整份圖面的實體物件。本模組以 mmap 對應 ASCII DXF 檔案：
+- 以正則表達式在 ENTITIES 區段中直接搜尋 TEXT、MTEXT、LWPOLYLINE 的起點（群組碼 0），
+  線條、圖塊插入等其他實體在正則表達式引擎內跳過，不進入 Python 迴圈
+- 只拆解 TEXT、MTEXT 與 $P- 圖層 LWPOLYLINE 的群組碼／值配對：
+  文字（1、3）、插入點（10、20）、旋轉角度（50）、圖層（8）、多段線頂點（10、20）
+- 只解碼需要的字串，其餘值保持 bytes 比對
+
+LexerCADReader 以掃描結果取代 ezdxf 的 modelspace，解析、框線分組沿用 CADReader 的程式，
+結果與 ezdxf 路徑相同：
+- 文字依 ezdxf 讀檔的編碼（R2007 以上為 UTF-8，其餘依 $DWGCODEPAGE）解碼
+- MTEXT 內容依 ezdxf 的方式串接各段 3 與最後的 1
+- 圖紙空間（群組碼 67 為 1）的實體略過，與 modelspace 查詢相同
+二進位 DXF 或結構無法辨識的檔案自動改用 ezdxf 讀取。
+"""
+
+import codecs
+import mmap
+import re
+
+from config import DXF_FAST_LEXER
+from core.cad_reader import CADReader
+from utils import instrumentation
+
+# 區段與實體的起點：群組碼 0／2 與名稱各佔一行（群組碼行可能右對齊補空白，行尾可能是 \r\n）
+# 實體名稱以英文字母開頭（3DFACE、3DSOLID 除外），值為 "0" 的行之後是純數字的群組碼，不會誤判為實體起點
+ENTITIES_SECTION_RE = re.compile(rb'\n *2\r?\nENTITIES\r?\n')
+SECTION_END_RE = re.compile(rb'\n *0\r?\nENDSEC\r?\n')
+ENTITY_RE = re.compile(rb'\n *0\r?\n([A-Z_][A-Z0-9_]*|3D[A-Z]+)\r?\n')
+WANTED_ENTITY_RE = re.compile(rb'\n *0\r?\n(TEXT|MTEXT|LWPOLYLINE)\r?\n')
+HEADER_VALUE_RE = {
+    'version': re.compile(rb'\$ACADVER\r?\n *1\r?\n([^\r\n]*)'),
+    'codepage': re.compile(rb'\$DWGCODEPAGE\r?\n *3\r?\n([^\r\n]*)'),
+}
+
+BINARY_DXF_SENTINEL = b'AutoCAD Binary DXF'
+
+# 需要拆解的實體類型
+POLYLINE_TYPE = b'LWPOLYLINE'
+FRAME_LAYER_PREFIX = '$P-'
+FRAME_LAYER_PREFIX_BYTES = FRAME_LAYER_PREFIX.encode('ascii')
+
+# 標頭沒有 $DWGCODEPAGE 時 ezdxf 使用的編碼
+DEFAULT_ENCODING = 'cp1252'
+
+
+class DxfLexerError(Exception):
+    """無法以快速掃描處理的 DXF 檔案"""
+    pass
+
+
+def get_encoding(version, codepage):
+    """
+    依 $ACADVER 與 $DWGCODEPAGE 決定文字編碼（與 ezdxf 讀檔相同）
+
+    Args:
+        version: $ACADVER，例如 b'AC1021'
+        codepage: $DWGCODEPAGE，例如 b'ANSI_950'
+    """
+    if version is not None and version >= b'AC1021':
+        return 'utf-8'
+    digits = codepage.rpartition(b'_')[2].decode('ascii', 'replace') if codepage else ''
+    encoding = f'cp{digits}' if digits.isdigit() else DEFAULT_ENCODING
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return DEFAULT_ENCODING
+    return encoding
+
+
+def split_tags(body):
+    """
+    將單一實體的內容拆為群組碼與值兩個列表
+
+    群組碼去除空白；值保留行尾可能的 \\r（float() 會忽略，字串使用前再去除）。
+    MTEXT 的內嵌物件（群組碼 101 之後）會重複 10、11 等群組碼，不屬於實體本身，予以截斷。
+    """
+    lines = body.split(b'\n')
+    if len(lines) % 2:
+        lines.pop()
+    codes = list(map(bytes.strip, lines[0::2]))
+    values = lines[1::2]
+    if b'101' in codes:
+        cut = codes.index(b'101')
+        del codes[cut:], values[cut:]
+    return codes, values
+
+
+def scan_text_entity(body, encoding):
+    """
+    拆解 TEXT／MTEXT 實體
+
+    Returns:
+        tuple: (文字, x, y, 旋轉角度)，圖紙空間的實體回傳 None
+    """
+    codes, values = split_tags(body)
+    tags = dict(zip(codes, values))
+    if tags.get(b'67', b'0').strip() == b'1':
+        return None
+    text = tags.get(b'1', b'').rstrip(b'\r')
+    if b'3' in tags:
+        # MTEXT 超過 250 字元時以多個 3 分段，最後一段為 1
+        parts = [value.rstrip(b'\r') for code, value in zip(codes, values) if code == b'3']
+        text = b''.join(parts) + text
+    return (text.decode(encoding, 'surrogateescape'), float(tags.get(b'10', 0.0)), float(tags.get(b'20', 0.0)),
+            float(tags.get(b'50', 0.0)))
+
+
+def scan_frame_polyline(body, encoding):
+    """
+    拆解 LWPOLYLINE 實體，只保留 $P- 圖層的框線
+
+    Returns:
+        dict: {'name': 框線名稱, 'points': [(x, y), ...]}，其他圖層或圖紙空間回傳 None
+    """
+    # 大多數多段線不在框線圖層，先以位元組搜尋排除，不必拆解
+    if FRAME_LAYER_PREFIX_BYTES not in body:
+        return None
+    codes, values = split_tags(body)
+    tags = dict(zip(codes, values))
+    layer = tags.get(b'8', b'').rstrip(b'\r')
+    if not layer.startswith(FRAME_LAYER_PREFIX_BYTES) or tags.get(b'67', b'0').strip() == b'1':
+        return None
+    xs = [float(value) for code, value in zip(codes, values) if code == b'10']
+    ys = [float(value) for code, value in zip(codes, values) if code == b'20']
+    layer = layer.decode(encoding, 'surrogateescape')
+    name = layer[3:] if len(layer) > 3 else layer
+    return {'name': name, 'points': list(zip(xs, ys))}
+
+
+def _open_entities_section(file, file_path):
+    """
+    以 mmap 對應 DXF 檔案並找出 ENTITIES 區段
+
+    Returns:
+        tuple: (mmap, 區段起點（群組碼 0 前的換行）, 區段結尾, 文字編碼)
+
+    Raises:
+        DxfLexerError: 二進位 DXF、空檔案或找不到 ENTITIES 區段
+    """
+    try:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError as e:
+        raise DxfLexerError(f"空的 DXF 檔案: {file_path}") from e
+    try:
+        if data[:len(BINARY_DXF_SENTINEL)] == BINARY_DXF_SENTINEL:
+            raise DxfLexerError("不支援二進位 DXF")
+        section = ENTITIES_SECTION_RE.search(data)
+        if section is None:
+            raise DxfLexerError("找不到 ENTITIES 區段")
+        header = {}
+        for key, pattern in HEADER_VALUE_RE.items():
+            match = pattern.search(data, 0, section.start())
+            header[key] = match.group(1).strip() if match else None
+        encoding = get_encoding(header['version'], header['codepage'])
+        section_end = SECTION_END_RE.search(data, section.start())
+        end = section_end.start() + 1 if section_end else len(data)
+    except BaseException:
+        data.close()
+        raise
+    return data, section.end() - 1, end, encoding
+
+
+def _scan_range(data, position, end, encoding):
+    """
+    掃描 ENTITIES 區段中 [position, end) 範圍內起始的實體
+
+    position 必須是實體起點（群組碼 0 前的換行）；範圍內最後一個實體的內容截止於 end。
+
+    Returns:
+        tuple: (texts, mtexts, frames)
+    """
+    texts, mtexts, frames = [], [], []
+    # 只在需要的實體起點停下，其他類型的實體由正則表達式直接跳過；
+    # 實體內容為起點到下一個實體起點（任何類型）之間
+    while True:
+        match = WANTED_ENTITY_RE.search(data, position, end)
+        if match is None:
+            break
+        following = ENTITY_RE.search(data, match.end(), end)
+        body_end = following.start() + 1 if following else end
+        entity_type = match.group(1)
+        if entity_type == POLYLINE_TYPE:
+            frame = scan_frame_polyline(data[match.end():body_end], encoding)
+            if frame is not None:
+                frames.append(frame)
+        else:
+            entry = scan_text_entity(data[match.end():body_end], encoding)
+            if entry is not None:
+                (texts if entity_type == b'TEXT' else mtexts).append(entry)
+        position = body_end - 1
+    instrumentation.count('entities.lexed', len(texts) + len(mtexts) + len(frames))
+    return texts, mtexts, frames
+
+
+def scan_entities(file_path):
+    """
+    掃描 DXF 檔案的 ENTITIES 區段
+
+    Returns:
+        dict: {
+            'texts': [(文字, x, y, 旋轉角度)]（TEXT，依檔案順序）,
+            'mtexts': [(內容, x, y, 旋轉角度)]（MTEXT，依檔案順序）,
+            'frames': [{'name', 'points'}]（$P- 圖層的 LWPOLYLINE）,
+            'encoding': 文字編碼,
+        }
+
+    Raises:
+        DxfLexerError: 二進位 DXF、空檔案或找不到 ENTITIES 區段
+    """
+    with open(file_path, 'rb') as file:
+        data, start, end, encoding = _open_entities_section(file, file_path)
+    with data:
+        texts, mtexts, frames = _scan_range(data, start, end, encoding)
+    return {'texts': texts, 'mtexts': mtexts, 'frames': frames, 'encoding': encoding}
+
+
+def split_entity_ranges(file_path, parts):
+    """
+    將 ENTITIES 區段依位元組大小切成 parts 段，切點對齊實體起點，供多個行程分別掃描
+
+    Returns:
+        tuple: (文字編碼, [(起點, 結尾)])，各段依檔案順序排列
+
+    Raises:
+        DxfLexerError: 二進位 DXF、空檔案或找不到 ENTITIES 區段
+    """
+    with open(file_path, 'rb') as file:
+        data, start, end, encoding = _open_entities_section(file, file_path)
+    with data:
+        boundaries = [start]
+        for part in range(1, parts):
+            offset = max(start + (end - start) * part // parts, boundaries[-1] + 1)
+            match = ENTITY_RE.search(data, offset, end)
+            if match is None:
+                break
+            boundaries.append(match.start())
+    ranges = [(first, following + 1) for first, following in zip(boundaries, boundaries[1:])]
+    ranges.append((boundaries[-1], end))
+    return encoding, ranges
+
+
+def scan_entity_range(file_path, start, end, encoding):
+    """
+    掃描 split_entity_ranges 切出的單一範圍（於工作行程中執行）
+
+    Returns:
+        dict: 與 scan_entities 相同，只包含範圍內起始的實體
+    """
+    with open(file_path, 'rb') as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    with data:
+        texts, mtexts, frames = _scan_range(data, start, end, encoding)
+    return {'texts': texts, 'mtexts': mtexts, 'frames': frames, 'encoding': encoding}
+
+
+class LexerCADReader(CADReader):
+    """以快速掃描結果提供文字與框線的 CAD 讀取器（無法掃描時改用 ezdxf）"""
+
+    def __init__(self):
+        super().__init__()
+        self.scan = None
+
+    def open_file(self, file_path):
+        """掃描 DXF 檔案，格式不支援時改用 ezdxf 開啟"""
+        try:
+            with instrumentation.timer('dxf.load'):
+                self.scan = scan_entities(file_path)
+            return True
+        except DxfLexerError as e:
+            print(f"⚠️ 無法快速掃描，改用 ezdxf 讀取: {str(e)}")
+        except Exception as e:
+            print(f"開啟檔案錯誤: {str(e)}")
+            return False
+        return super().open_file(file_path)
+
+    def close_file(self):
+        """釋放掃描結果"""
+        self.scan = None
+        super().close_file()
+
+    def has_drawing(self):
+        """是否已開啟圖面"""
+        return self.scan is not None or super().has_drawing()
+
+    def count_text_entities(self):
+        """TEXT 與 MTEXT 實體總數"""
+        if self.scan is None:
+            return super().count_text_entities()
+        return len(self.scan['texts']) + len(self.scan['mtexts'])
+
+    def iter_text_lines(self):
+        """
+        依序產生圖面中的文字行（先 TEXT 後 MTEXT，與 CADReader 相同）
+
+        Yields:
+            tuple: (已處理特殊編碼的文字, 原始文字, 插入點, 旋轉角度, 已掃描實體數)
+        """
+        if self.scan is None:
+            yield from super().iter_text_lines()
+            return
+        scanned = 0
+        for text, x, y, rotation in self.scan['texts']:
+            scanned += 1
+            instrumentation.count('entities.scanned')
+            yield text.replace('%%D', '°'), text, (x, y), rotation, scanned
+        for content, x, y, rotation in self.scan['mtexts']:
+            scanned += 1
+            instrumentation.count('entities.scanned')
+            for line in content.split('\n'):
+                yield line.replace('%%D', '°'), line, (x, y), rotation, scanned
+
+    def get_rebar_tables(self):
+        """取得所有 $P- 開頭的 LWPOLYLINE 框線及名稱與多邊形座標"""
+        if self.scan is None:
+            return super().get_rebar_tables()
+        return self.scan['frames']
+
+
+def create_cad_reader(fast=DXF_FAST_LEXER):
+    """建立 CAD 讀取器，fast 為 True 時使用快速掃描"""
+    return LexerCADReader() if fast else CADReader()
@@ -0,0 +1,364 @@
+"""
+快速估算模式
+
+只需要各號數、材質等級、框線的總重量與總長度時，不產生圖示也不寫 Excel：
+- 以 mmap 快速掃描文字與框線；檔案達 ESTIMATE_PARALLEL_MIN_BYTES 且有多個 CPU 核心時，ENTITIES 區段
+  依實體起點切段（split_entity_ranges），由多個行程平行掃描，各行程只回傳不重複的文字、每行的文字索引
+  與插入點陣列（無法快速掃描時自動改用 ezdxf 逐行讀取）
+- 相同的標記文字只解析一次，不建立每支鋼筋的 Rebar 記錄
+- 以 (標記, 框線) 的出現次數作為累加器，記憶體用量與不同標記數成正比，與圖面大小無關
+- 插入點每 ESTIMATE_BATCH_SIZE 行以向量運算判斷框線（CADReader.find_frames），結果與逐點判斷相同
+
+掃描是主要成本（單一核心每 100 MB 約 2.5–3 秒），平行掃描的耗時約與 CPU 核心數成反比。
+
+重量與長度依 RebarTable 的算法逐支計算（單位重量 × 長度 × 數量 / 100），最後以精確加總
+（math.fsum，與加總順序無關）得到各框線的總計，與 write_summary（RebarTable.totals）完全相同。
+合併模式（AGGREGATE_MARKS）會以合併後的數量重新計算重量，估算結果對應未合併的料表。
+
+使用方式（於專案根目錄）：
+    python -m core.estimate 圖面.dxf
+    python -m core.estimate 圖面.dxf --json 估算結果.json
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from config import ESTIMATE_BATCH_SIZE, ESTIMATE_PARALLEL_MIN_BYTES, REBAR_GRADES, REBAR_UNIT_WEIGHT
+from core.cad_reader import CADReader
+from core.dxf_lexer import DxfLexerError, LexerCADReader, scan_entity_range, split_entity_ranges
+from core.processors import get_mark_parser
+from core.sharding import get_worker_count
+from utils import instrumentation
+
+
+class EstimateAccumulator:
+    """以 (標記, 框線) 出現次數累加的估算結果"""
+
+    def __init__(self, reader, tables, batch_size=ESTIMATE_BATCH_SIZE):
+        """
+        Args:
+            reader: CADReader，使用其 find_frames 判斷框線
+            tables: get_frame_tables() 的框線列表
+            batch_size: 每批判斷框線的文字行數
+        """
+        self.reader = reader
+        self.tables = tables
+        self.batch_size = batch_size
+        self.marks = []          # 不同標記的 (號數, 單支重量, 長度 × 數量, 數量)，重量與長度以 _split 拆為兩項
+        self.mark_index = {}     # 標記文字 → self.marks 的索引，無法解析為 None
+        self.occurrences = {}    # (標記索引, 框線索引) → 出現次數
+        self.batch = ([], [], [])  # 本批的標記索引、x、y
+        self.lines = 0
+        self.missed = 0
+
+    def lookup(self, text):
+        """標記文字在 self.marks 的索引（相同文字只解析一次），非鋼筋標記時回傳 None"""
+        index = self.mark_index.get(text, -1)
+        if index == -1:
+            index = self.mark_index[text] = self.parse(text)
+        return index
+
+    def add(self, text, position):
+        """加入一行文字（無法解析的文字只計入 missed）"""
+        self.lines += 1
+        index = self.lookup(text)
+        if index is None:
+            self.missed += 1
+            return
+        indexes, xs, ys = self.batch
+        indexes.append(index)
+        xs.append(position[0])
+        ys.append(position[1])
+        if len(indexes) >= self.batch_size:
+            self.flush()
+
+    def add_lines(self, texts, indexes, xs, ys):
+        """
+        一次加入多行文字（scan_text_part 的結果）
+
+        Args:
+            texts: 不重複的文字列表
+            indexes: 每行文字在 texts 中的索引（numpy 陣列）
+            xs, ys: 每行文字的插入點座標（numpy 陣列）
+        """
+        marks = np.array([-1 if index is None else index for index in map(self.lookup, texts)], dtype=np.int64)
+        line_marks = marks[indexes]
+        parsed = line_marks >= 0
+        self.lines += len(line_marks)
+        self.missed += int(len(line_marks) - np.count_nonzero(parsed))
+        line_marks, xs, ys = line_marks[parsed], xs[parsed], ys[parsed]
+        for start in range(0, len(line_marks), self.batch_size):
+            end = start + self.batch_size
+            self._count(line_marks[start:end], xs[start:end], ys[start:end])
+
+    def flush(self):
+        """判斷本批插入點的框線並累加出現次數"""
+        indexes, xs, ys = self.batch
+        if not indexes:
+            return
+        self._count(np.array(indexes, dtype=np.int64), np.array(xs, dtype=np.float64),
+                    np.array(ys, dtype=np.float64))
+        self.batch = ([], [], [])
+
+    def _count(self, indexes, xs, ys):
+        """判斷插入點的框線並累加 (標記, 框線) 的出現次數"""
+        frame_ids = self.reader.find_frames(xs, ys, self.tables)
+        keys = indexes * len(self.tables) + frame_ids
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        for key, occurrences in zip(unique_keys.tolist(), counts.tolist()):
+            key = divmod(key, len(self.tables))
+            self.occurrences[key] = self.occurrences.get(key, 0) + occurrences
+
+    def parse(self, text):
+        """解析新出現的標記文字，回傳索引，非鋼筋標記時回傳 None"""
+        rebar = get_mark_parser().parse(text)
+        if rebar is None:
+            return None
+        # 與 RebarTable 相同的逐支算法：長度為各段以 math.fsum 精確加總，重量依號數表重新計算
+        length = math.fsum(rebar.segments) if rebar.segments else rebar.length
+        weight = REBAR_UNIT_WEIGHT.get(rebar.rebar_number, 0) * length * rebar.count / 100
+        self.marks.append((rebar.rebar_number, _split(weight), _split(length * rebar.count), rebar.count))
+        return len(self.marks) - 1
+
+    def summarize(self):
+        """
+        彙整估算結果
+
+        Returns:
+            dict: {
+                'frames': {框線: {'entries', 'count', 'total_length', 'total_weight', 'numbers',
+                                  'by_number': {號數: {...}}}},
+                'by_number': {號數: {'grade', 'entries', 'count', 'total_length', 'total_weight'}},
+                'totals': {'entries', 'count', 'total_length', 'total_weight', 'numbers'},
+                'lines': 掃描的文字行數, 'missed': 無法解析的行數,
+            }
+        """
+        self.flush()
+        frames = [{} for _ in self.tables]
+        overall = {}
+        for (index, frame_index), occurrences in self.occurrences.items():
+            number, weight, length, count = self.marks[index]
+            # 各項乘以出現次數皆無捨入誤差，math.fsum 即得正確捨入的精確總和
+            if occurrences < SPLIT_EXACT_LIMIT:
+                multiples = (occurrences,)
+            else:
+                # 出現次數過大時改拆為 2 的次方
+                multiples = [1 << bit for bit in range(occurrences.bit_length()) if occurrences >> bit & 1]
+            for groups in (frames[frame_index], overall):
+                group = groups.setdefault(number, [0, 0, [], []])
+                group[0] += occurrences
+                group[1] += count * occurrences
+                group[2].extend(part * multiple for part in length for multiple in multiples)
+                group[3].extend(part * multiple for part in weight for multiple in multiples)
+
+        frame_results = {}
+        for table, groups in zip(self.tables, frames):
+            result = _totals(groups.values(), len(groups))
+            result['by_number'] = _by_number(groups)
+            frame_results[table['name']] = result
+        return {
+            'frames': frame_results,
+            'by_number': _by_number(overall),
+            'totals': _totals(overall.values(), len(overall)),
+            'lines': self.lines,
+            'missed': self.missed,
+        }
+
+
+# Veltkamp 拆分常數（2^27 + 1）：拆出的兩項各不超過 26 個有效位元
+SPLIT_FACTOR = 134217729.0
+# 拆分後的各項乘以小於 2^26 的整數不會有捨入誤差
+SPLIT_EXACT_LIMIT = 1 << 26
+
+
+def _split(value):
+    """將浮點數拆為兩項（高位、低位），兩項相加等於原值"""
+    scaled = SPLIT_FACTOR * value
+    high = scaled - (scaled - value)
+    return high, value - high
+
+
+def _totals(groups, numbers):
+    """由各號數的累加項計算總計"""
+    groups = list(groups)
+    return {
+        'entries': sum(group[0] for group in groups),
+        'count': sum(group[1] for group in groups),
+        'total_length': math.fsum(term for group in groups for term in group[2]),
+        'total_weight': math.fsum(term for group in groups for term in group[3]),
+        'numbers': numbers,
+    }
+
+
+def _by_number(groups):
+    """各號數的統計（依號數排序）"""
+    return {
+        number: {
+            'grade': REBAR_GRADES.get(number, "未知"),
+            'entries': entries,
+            'count': count,
+            'total_length': math.fsum(length),
+            'total_weight': math.fsum(weight),
+        }
+        for number, (entries, count, length, weight) in sorted(
+            groups.items(), key=lambda item: (len(item[0]), item[0]))
+    }
+
+
+def scan_text_part(cad_file_path, start, end, encoding):
+    """
+    掃描 ENTITIES 區段的一段（於工作行程中執行），整理為陣列以減少行程間傳遞的資料
+
+    Returns:
+        dict: {'texts': 不重複的文字（已處理特殊編碼並去除空白）, 'indexes': 每行文字的索引,
+               'xs', 'ys': 插入點座標, 'frames': 範圍內的框線, 'entities': 文字實體數}
+    """
+    scan = scan_entity_range(cad_file_path, start, end, encoding)
+    index = {}
+    indexes, xs, ys = [], [], []
+    lines = [(text, x, y) for text, x, y, _ in scan['texts']]
+    # MTEXT 逐行拆開，每行使用實體的插入點（與 iter_text_lines 相同）
+    lines.extend((line, x, y) for content, x, y, _ in scan['mtexts'] for line in content.split('\n'))
+    for text, x, y in lines:
+        indexes.append(index.setdefault(text.replace('%%D', '°').strip(), len(index)))
+        xs.append(x)
+        ys.append(y)
+    return {
+        'texts': list(index),
+        'indexes': np.array(indexes, dtype=np.int64),
+        'xs': np.array(xs, dtype=np.float64),
+        'ys': np.array(ys, dtype=np.float64),
+        'frames': scan['frames'],
+        'entities': len(scan['texts']) + len(scan['mtexts']),
+    }
+
+
+def scan_text_parts(cad_file_path, encoding, ranges, progress=None):
+    """掃描各段（多段時以行程池平行處理），依檔案順序回傳 scan_text_part 的結果"""
+    if len(ranges) == 1:
+        return [scan_text_part(cad_file_path, *ranges[0], encoding)]
+    executor = ProcessPoolExecutor(max_workers=len(ranges))
+    try:
+        futures = [executor.submit(scan_text_part, cad_file_path, start, end, encoding) for start, end in ranges]
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if progress:
+                progress.update(len(futures) - len(pending), len(futures))
+        results = [future.result() for future in futures]
+    except BaseException:
+        # 取消或任一段失敗時不等待其他段完成
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    return results
+
+
+def estimate_drawing(cad_file_path, progress=None, workers=None):
+    """
+    快速估算圖面的鋼筋總重量與總長度
+
+    Args:
+        cad_file_path: DXF 檔案路徑
+        progress: ProgressReporter，None 表示不回報進度
+        workers: 平行掃描的行程數，None 表示 SHARD_WORKERS（預設為 CPU 核心數）；
+                 檔案小於 ESTIMATE_PARALLEL_MIN_BYTES 時一律在目前行程掃描
+
+    Returns:
+        dict: EstimateAccumulator.summarize() 的結果，另加 'seconds'（耗時）
+
+    Raises:
+        ValueError: 無法開啟 CAD 檔案
+    """
+    start = time.perf_counter()
+    workers = get_worker_count(workers)
+    try:
+        if workers > 1 and os.path.getsize(cad_file_path) < ESTIMATE_PARALLEL_MIN_BYTES:
+            workers = 1
+        encoding, ranges = split_entity_ranges(cad_file_path, workers)
+    except DxfLexerError as e:
+        print(f"⚠️ 無法快速掃描，改用 ezdxf 讀取: {str(e)}")
+        result = _estimate_lines(cad_file_path, progress)
+    except OSError as e:
+        raise ValueError(f"無法開啟 CAD 檔案: {cad_file_path}") from e
+    else:
+        with instrumentation.stage('reader'):
+            parts = scan_text_parts(cad_file_path, encoding, ranges, progress)
+        with instrumentation.stage('parser'):
+            # 以各段依序合併的框線建立讀取器，框線順序與整份檔案掃描相同
+            reader = LexerCADReader()
+            reader.scan = {'texts': [], 'mtexts': [], 'encoding': encoding,
+                           'frames': [frame for part in parts for frame in part['frames']]}
+            accumulator = EstimateAccumulator(reader, reader.get_frame_tables())
+            for part in parts:
+                accumulator.add_lines(part['texts'], part['indexes'], part['xs'], part['ys'])
+            result = accumulator.summarize()
+        instrumentation.count('entities.scanned', sum(part['entities'] for part in parts))
+
+    instrumentation.count('marks.parsed', result['totals']['entries'])
+    instrumentation.count('marks.missed', result['missed'])
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _estimate_lines(cad_file_path, progress=None):
+    """以 ezdxf 逐行讀取並估算（無法快速掃描的 DXF）"""
+    reader = CADReader()
+    with instrumentation.stage('reader'):
+        if not reader.open_file(cad_file_path):
+            raise ValueError(f"無法開啟 CAD 檔案: {cad_file_path}")
+    try:
+        with instrumentation.stage('parser'):
+            accumulator = EstimateAccumulator(reader, reader.get_frame_tables())
+            total = reader.count_text_entities()
+            for processed_text, _, position, _, scanned in reader.iter_text_lines():
+                if progress:
+                    progress.update(scanned, total)
+                accumulator.add(processed_text.strip(), position)
+            return accumulator.summarize()
+    finally:
+        reader.close_file()
+
+
+def format_estimate(result):
+    """估算結果的文字報表"""
+    lines = []
+    for name, frame in result['frames'].items():
+        lines.append(f"📐 {name}：{frame['count']} 支，{frame['total_weight']:.1f} kg，{frame['total_length']:.1f} cm")
+        for number, group in frame['by_number'].items():
+            lines.append(f"    {number:<5} {group['grade']:<8} {group['count']:>10} 支"
+                         f"  {group['total_weight']:>14.1f} kg  {group['total_length']:>16.1f} cm")
+    lines.append("📊 依號數合計：")
+    for number, group in result['by_number'].items():
+        lines.append(f"    {number:<5} {group['grade']:<8} {group['count']:>10} 支"
+                     f"  {group['total_weight']:>14.1f} kg  {group['total_length']:>16.1f} cm")
+    totals = result['totals']
+    lines.append(f"✅ 總計：{totals['count']} 支，{totals['total_weight']:.1f} kg"
+                 f"（{totals['total_weight'] / 1000:.3f} 噸），{totals['total_length']:.1f} cm，"
+                 f"{totals['numbers']} 種號數；無法解析 {result['missed']} 行，耗時 {result['seconds']:.2f}s")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="快速估算 DXF 圖面的鋼筋總重量（不產生圖示與 Excel）")
+    parser.add_argument('input', help="DXF 檔案路徑")
+    parser.add_argument('--json', default=None, help="估算結果 JSON 輸出路徑")
+    parser.add_argument('--workers', type=int, default=None, help="平行掃描的行程數，預設為 CPU 核心數")
+    args = parser.parse_args(argv)
+
+    result = estimate_drawing(args.input, workers=args.workers)
+    print(format_estimate(result))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(result, file, ensure_ascii=False, indent=2)
+        print(f"✅ 結果已寫入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
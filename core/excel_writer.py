@@ -12,25 +12,33 @@ import tempfile
 import os
 import re
 
-# 圖形相關模組
-try:
-    from utils.graphics.manager import GraphicsManager
-    print("✅ 圖形管理器初始化成功")
-except ImportError:
-    GraphicsManager = None
-    print("⚠️ 圖形管理器初始化失敗")
+from config import FOOTER_RUN_SUMMARY
+from core.aggregation import format_source_positions
+from core.rebar_table import RebarTable
+from utils import instrumentation
+from utils.progress import ConversionCancelled
 
-# Excel 寫入器模組
-try:
-    from core.excel_writers import get_excel_writer, create_excel_writer_for_rebar
-    print("✅ Excel 寫入器模組載入成功")
-except ImportError:
-    print("⚠️ Excel 寫入器模組載入失敗")
+# 圖形管理器（PIL、NumPy 與材料清單）延遲到第一次建立 ExcelWriter 時才載入
+_graphics_manager = None
+
+
+def get_graphics_manager():
+    """取得行程共用的圖形管理器，無法載入時回傳 None"""
+    global _graphics_manager
+    if _graphics_manager is None:
+        try:
+            from utils.graphics.manager import GraphicsManager
+            _graphics_manager = GraphicsManager()
+            print("✅ 圖形管理器初始化成功")
+        except Exception as e:
+            _graphics_manager = False
+            print(f"⚠️ 圖形管理器初始化失敗: {e}")
+    return _graphics_manager or None
 
 class ExcelWriter:
     """Excel 檔案寫入器 - 增強版"""
     
-    def __init__(self, image_mode="mixed"):
+    def __init__(self, image_mode="mixed", footer_summary=FOOTER_RUN_SUMMARY, aggregated=False, render_service=None):
         """
         初始化 Excel 寫入器
         
@@ -40,24 +48,24 @@ class ExcelWriter:
                 - "text": 僅使用文字描述
                 - "mixed": 圖片+文字描述（推薦）
                 - "auto": 自動檢測並選擇最佳模式
+            footer_summary: 啟用執行量測時，是否在頁尾附上量測摘要
+            aggregated: 資料為合併模式的結果時，加上「來源位置」欄
+            render_service: RenderService，提供時整張工作表的圖示交給其行程池渲染（由呼叫端負責關閉）
         """
         self.workbook = None
         self.worksheet = None
+        self.reuse_active_sheet = False
         self.temp_files = []  # 暫存圖片檔案列表
         self.image_mode = image_mode
+        self.footer_summary = footer_summary
+        self.aggregated = aggregated
+        self.render_service = render_service
+        # 最後一欄（讀取CAD文字，合併模式多一欄來源位置）
+        self.last_column = 16 if aggregated else 15
         
-        # 圖形管理器初始化
-        if GraphicsManager:
-            try:
-                self.graphics_manager = GraphicsManager()
-                self.graphics_available = True
-                print("✅ 圖形管理器初始化成功")
-            except Exception as e:
-                print(f"⚠️ 圖形管理器初始化失敗: {e}")
-                self.graphics_available = False
-        else:
-            self.graphics_available = False
-            print("⚠️ 圖形管理器不可用")
+        # 圖形管理器初始化（行程內共用，首次使用時才載入）
+        self.graphics_manager = get_graphics_manager()
+        self.graphics_available = self.graphics_manager is not None
         
         # 根據可用性調整模式
         if self.image_mode == "auto":
@@ -95,9 +103,33 @@ class ExcelWriter:
         self.workbook = openpyxl.Workbook()
         self.worksheet = self.workbook.active
         self.worksheet.title = "鋼筋計料表"
+        # 預設工作表尚未使用，add_sheet 會先沿用它
+        self.reuse_active_sheet = True
     
-    def save_workbook(self, file_path):
-        """儲存工作簿，並在儲存後清理暫存檔案"""
+    def save_workbook(self, file_path, progress=None):
+        """
+        儲存工作簿，並在儲存後清理暫存檔案
+        
+        Args:
+            file_path: 輸出路徑
+            progress: ProgressReporter，儲存期間定期回報經過時間；
+                      儲存中途無法中斷，若期間收到取消要求則捨棄輸出檔案
+        """
+        if self.workbook and progress:
+            temp_path = f"{file_path}.tmp"
+            try:
+                with progress.heartbeat(), instrumentation.stage('writer'), instrumentation.timer('excel.save'):
+                    self.workbook.save(temp_path)
+                progress.check_cancelled()
+                os.replace(temp_path, file_path)
+                instrumentation.count('excel.bytes_saved', os.path.getsize(file_path))
+                print(f"✅ Excel 檔案已儲存: {file_path}")
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                self._cleanup_temp_files()
+            return
+        
         if self.workbook:
             try:
                 # 檢查保存前的圖片狀態
@@ -107,7 +139,9 @@ class ExcelWriter:
                         for i, img in enumerate(self.worksheet._images):
                             print(f"   圖片 {i+1}: {img}")
                 
-                self.workbook.save(file_path)
+                with instrumentation.stage('writer'), instrumentation.timer('excel.save'):
+                    self.workbook.save(file_path)
+                instrumentation.count('excel.bytes_saved', os.path.getsize(file_path))
                 print(f"✅ Excel 檔案已儲存: {file_path}")
             except Exception as e:
                 print(f"❌ Excel 儲存失敗: {e}")
@@ -135,6 +169,9 @@ class ExcelWriter:
             "圖示", "長度(cm)", "數量", "重量(kg)", "備註", "讀取CAD文字"
         ]
         column_widths = [8, 8, 8, 8, 8, 8, 8, 8, 8, 20, 12, 8, 12, 20, 45]
+        if self.aggregated:
+            headers.append("來源位置")
+            column_widths.append(60)
 
         for col, header in enumerate(headers, 1):
             cell = self.worksheet.cell(row=start_row, column=col)
@@ -149,7 +186,8 @@ class ExcelWriter:
     def write_title(self, title, subtitle=None):
         """寫入標題和副標題"""
         # 主標題
-        self.worksheet.merge_cells('A1:O1')
+        last_column = get_column_letter(self.last_column)
+        self.worksheet.merge_cells(f'A1:{last_column}1')
         cell = self.worksheet.cell(row=1, column=1)
         cell.value = title
         cell.font = self.styles['title_font']
@@ -158,7 +196,7 @@ class ExcelWriter:
         
         # 副標題（如果提供）
         if subtitle:
-            self.worksheet.merge_cells('A2:O2')
+            self.worksheet.merge_cells(f'A2:{last_column}2')
             cell = self.worksheet.cell(row=2, column=1)
             cell.value = subtitle
             cell.font = self.styles['normal_font']
@@ -175,7 +213,7 @@ class ExcelWriter:
     def _get_rebar_segments(self, rebar):
         """從鋼筋資料中提取分段長度"""
         # 直接檢查 segments 欄位
-        if 'segments' in rebar and isinstance(rebar['segments'], list) and rebar['segments']:
+        if 'segments' in rebar and isinstance(rebar['segments'], (list, tuple)) and rebar['segments']:
             return rebar['segments']
         # 如果沒有 segments，嘗試其他欄位
         segments = []
@@ -199,15 +237,13 @@ class ExcelWriter:
         """
         生成鋼筋視覺表示（圖片或文字描述）- 使用模組化寫入器
         """
+        from core.excel_writers import create_excel_writer_for_rebar
+
         try:
-            # 使用模組化的 Excel 寫入器
-            excel_writer = create_excel_writer_for_rebar(rebar, self.graphics_manager)
+            # 使用模組化的 Excel 寫入器（無狀態單例，暫存檔案直接記錄於主寫入器）
+            excel_writer = create_excel_writer_for_rebar(rebar)
             if excel_writer:
-                visual_info = excel_writer.generate_visual(rebar)
-                # 將暫存檔案轉移到主寫入器
-                self.temp_files.extend(excel_writer.temp_files)
-                excel_writer.temp_files.clear()
-                return visual_info
+                return excel_writer.generate_visual(rebar, self._get_graphics_manager(), self.temp_files)
             else:
                 # 如果沒有對應的寫入器，使用預設文字描述
                 return self._generate_default_text_description(rebar)
@@ -215,6 +251,32 @@ class ExcelWriter:
             print(f"⚠️ 生成鋼筋視覺表示失敗: {e}")
             return self._generate_default_text_description(rebar)
     
+    def _get_graphics_manager(self):
+        """取得可用的圖形管理器，不可用時回傳 None"""
+        return self.graphics_manager if self.graphics_available else None
+
+    def generate_visuals(self, rebar_data, progress=None):
+        """
+        批次生成整張工作表的鋼筋視覺表示
+
+        Returns:
+            list: 與 rebar_data 順序一致的視覺表示（圖片路徑或文字描述）
+        """
+        from core.excel_writers import generate_visuals
+
+        try:
+            visuals = generate_visuals(rebar_data, self._get_graphics_manager(), self.temp_files, progress,
+                                       self.render_service)
+        except ConversionCancelled:
+            raise
+        except Exception as e:
+            print(f"⚠️ 批次生成鋼筋視覺表示失敗: {e}")
+            visuals = {}
+        return [
+            visuals[index] if index in visuals else self._generate_default_text_description(rebar)
+            for index, rebar in enumerate(rebar_data)
+        ]
+
     def _generate_default_text_description(self, rebar):
         """生成預設文字描述"""
         segments = self._get_rebar_segments(rebar)
@@ -229,117 +291,134 @@ class ExcelWriter:
         else:
             return f"複雜鋼筋 {rebar_id}\n{' + '.join(str(int(s)) for s in segments)}cm"
 
-    def write_rebar_data(self, rebar_data, start_row=3):
+    def write_rebar_data(self, rebar_data, start_row=3, progress=None, stage_range=(0, 100)):
         """
         將鋼筋資料寫入工作表，包含圖示和詳細描述
         
         Args:
             rebar_data: 包含鋼筋資訊的字典列表
             start_row: 起始寫入行號
+            progress: ProgressReporter，逐筆回報圖示與資料列進度並檢查取消
+            stage_range: 本步驟在整體進度中所佔的百分比範圍
         
         Returns:
             int: 下一個可用行號
         """
         current_row = start_row
-        for idx, rebar in enumerate(rebar_data, 1):
-            # 基本資料
-            self.worksheet.cell(row=current_row, column=1).value = idx
-            self.worksheet.cell(row=current_row, column=2).value = rebar.get('rebar_number', '')
-            
-            # 確保 rebar 資料包含 segments
-            if 'segments' not in rebar or not rebar['segments']:
+        stage_start, stage_end = stage_range
+        stage_middle = (stage_start + stage_end) // 2
+        # 確保舊格式的 rebar 字典包含 segments（Rebar 記錄由處理器產生，必定包含）
+        for rebar in rebar_data:
+            if isinstance(rebar, dict) and not rebar.get('segments'):
                 rebar['segments'] = self._get_rebar_segments(rebar)
 
-            # 寫入 A-G 欄位
-            segments = rebar.get('segments', [])
-            for i, segment in enumerate(segments):
-                if i < 7: # 最多寫入 7 個分段
-                    self.worksheet.cell(row=current_row, column=3 + i).value = segment
-            
-            # 生成鋼筋視覺表示
-            visual_info = self._generate_rebar_visual(rebar)
-            
-            # 圖示欄處理
-            diagram_cell = self.worksheet.cell(row=current_row, column=10) # 圖示在第10欄
+        # 一次生成整張工作表的鋼筋視覺表示
+        if progress:
+            progress.stage(stage_start, stage_middle, f"正在產生圖示（{self.worksheet.title}）")
+        with instrumentation.stage('renderer'):
+            visuals = self.generate_visuals(rebar_data, progress)
+
+        if progress:
+            progress.stage(stage_middle, stage_end, f"正在寫入資料列（{self.worksheet.title}）")
+        with instrumentation.stage('writer'):
+            for idx, (rebar, visual_info) in enumerate(zip(rebar_data, visuals), 1):
+                if progress:
+                    progress.update(idx, len(rebar_data))
+                self.write_rebar_row(current_row, idx, rebar, visual_info)
+                current_row += 1
             
-            # 檢查是否為圖片路徑
-            if isinstance(visual_info, str) and os.path.exists(visual_info) and self.image_mode in ['image', 'mixed']:
-                # 插入圖片
-                try:
-                    print(f"🔍 嘗試插入圖片: {visual_info}")
-                    img = ExcelImage(visual_info)
-                    # 調整圖片大小 - 撐滿儲存格
-                    img.width = 200
-                    img.height = 120
-                    
-                    # 先清空圖示欄的文字內容
-                    diagram_cell.value = ""
-                    
-                    # 使用 Claude 建議的正確語法
-                    self.worksheet.add_image(img, f'J{current_row}')
-                    
-                    print(f"✅ 圖片插入成功到儲存格 J{current_row}")
-                    
-                    # 檢查圖片是否真的被添加
-                    print(f"🔍 工作表圖片數量: {len(self.worksheet._images)}")
-                    
-                    # 再次確保圖示欄是空的
-                    diagram_cell.value = ""
-                    
-                    # 調整行高以容納圖片 - 撐滿儲存格
-                    self.worksheet.row_dimensions[current_row].height = 120
-                    
-                except Exception as e:
-                    print(f"⚠️ 圖片插入失敗: {e}")
-                    # 如果圖片插入失敗，使用文字描述
-                    diagram_cell.value = visual_info
-                    self.worksheet.row_dimensions[current_row].height = 60
-            else:
-                # 使用文字描述
+        return current_row
+    
+    def write_rebar_row(self, current_row, idx, rebar, visual_info):
+        """
+        寫入單筆鋼筋資料列
+        
+        Args:
+            current_row: 寫入行號
+            idx: 編號欄的值
+            rebar: 鋼筋資料
+            visual_info: 視覺表示（暫存圖片路徑或文字描述）
+        """
+        instrumentation.count('rows.written')
+        # 基本資料
+        self.worksheet.cell(row=current_row, column=1).value = idx
+        self.worksheet.cell(row=current_row, column=2).value = rebar.get('rebar_number', '')
+
+        # 寫入 A-G 欄位
+        segments = rebar.get('segments', [])
+        for i, segment in enumerate(segments):
+            if i < 7: # 最多寫入 7 個分段
+                self.worksheet.cell(row=current_row, column=3 + i).value = segment
+        
+        # 圖示欄處理
+        diagram_cell = self.worksheet.cell(row=current_row, column=10) # 圖示在第10欄
+        
+        # 檢查是否為圖片路徑
+        if isinstance(visual_info, str) and os.path.exists(visual_info) and self.image_mode in ['image', 'mixed']:
+            # 插入圖片
+            try:
+                print(f"🔍 嘗試插入圖片: {visual_info}")
+                img = ExcelImage(visual_info)
+                # 調整圖片大小 - 撐滿儲存格
+                img.width = 200
+                img.height = 120
+                
+                # 先清空圖示欄的文字內容
+                diagram_cell.value = ""
+                
+                # 使用 Claude 建議的正確語法
+                self.worksheet.add_image(img, f'J{current_row}')
+                
+                print(f"✅ 圖片插入成功到儲存格 J{current_row}")
+                
+                # 檢查圖片是否真的被添加
+                print(f"🔍 工作表圖片數量: {len(self.worksheet._images)}")
+                
+                # 再次確保圖示欄是空的
+                diagram_cell.value = ""
+                
+                # 調整行高以容納圖片 - 撐滿儲存格
+                self.worksheet.row_dimensions[current_row].height = 120
+                
+            except Exception as e:
+                print(f"⚠️ 圖片插入失敗: {e}")
+                # 如果圖片插入失敗，使用文字描述
                 diagram_cell.value = visual_info
                 self.worksheet.row_dimensions[current_row].height = 60
-            
-            # 其他資料欄位
-            self.worksheet.cell(row=current_row, column=11).value = round(rebar.get('length', 0), 1)
-            self.worksheet.cell(row=current_row, column=12).value = rebar.get('count', 1)
-            self.worksheet.cell(row=current_row, column=13).value = round(rebar.get('weight', 0), 1)
-            self.worksheet.cell(row=current_row, column=14).value = rebar.get('note', '')
-            self.worksheet.cell(row=current_row, column=15).value = rebar.get('raw_text', '')
-            
-            # 設定儲存格樣式
-            for col in range(1, 16):
-                cell = self.worksheet.cell(row=current_row, column=col)
-                if col != 10:  # 圖示欄已單獨處理
-                    cell.font = self.styles['normal_font']
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = self.styles['border']
-            
-            current_row += 1
-            
-        return current_row
+        else:
+            # 使用文字描述
+            diagram_cell.value = visual_info
+            self.worksheet.row_dimensions[current_row].height = 60
+        
+        # 其他資料欄位
+        self.worksheet.cell(row=current_row, column=11).value = round(rebar.get('length', 0), 1)
+        self.worksheet.cell(row=current_row, column=12).value = rebar.get('count', 1)
+        self.worksheet.cell(row=current_row, column=13).value = round(rebar.get('weight', 0), 1)
+        self.worksheet.cell(row=current_row, column=14).value = rebar.get('note', '')
+        self.worksheet.cell(row=current_row, column=15).value = rebar.get('raw_text', '')
+        if self.aggregated:
+            self.worksheet.cell(row=current_row, column=16).value = format_source_positions(rebar)
+        
+        # 設定儲存格樣式
+        for col in range(1, self.last_column + 1):
+            cell = self.worksheet.cell(row=current_row, column=col)
+            if col != 10:  # 圖示欄已單獨處理
+                cell.font = self.styles['normal_font']
+                cell.alignment = Alignment(horizontal='center', vertical='center')
+            cell.border = self.styles['border']
     
     def write_summary(self, rebar_data, start_row):
         """寫入統計摘要"""
         if not rebar_data:
             return start_row
         
-        # 計算統計資料
-        total_count = sum(rebar.get('count', 1) for rebar in rebar_data)
-        total_weight = sum(rebar.get('weight', 0) for rebar in rebar_data)
-        total_length = sum(rebar.get('length', 0) * rebar.get('count', 1) for rebar in rebar_data)
-        
-        # 鋼筋類型統計
-        rebar_types = {}
-        for rebar in rebar_data:
-            rebar_num = rebar.get('rebar_number', '')
-            if rebar_num not in rebar_types:
-                rebar_types[rebar_num] = {'count': 0, 'weight': 0}
-            rebar_types[rebar_num]['count'] += rebar.get('count', 1)
-            rebar_types[rebar_num]['weight'] += rebar.get('weight', 0)
+        # 計算統計資料（欄式表格向量運算，重量依號數表重新計算）
+        totals = RebarTable.from_records(rebar_data).totals()
         
         # 寫入摘要標題
         summary_row = start_row + 1
-        self.worksheet.merge_cells(f'A{summary_row}:O{summary_row}')
+        last_column = get_column_letter(self.last_column)
+        self.worksheet.merge_cells(f'A{summary_row}:{last_column}{summary_row}')
         cell = self.worksheet.cell(row=summary_row, column=1)
         cell.value = "統計摘要"
         cell.font = Font(name='Calibri', size=12, bold=True)
@@ -350,10 +429,10 @@ class ExcelWriter:
         # 總計資料
         summary_row += 1
         summary_data = [
-            ("總數量", f"{total_count} 支"),
-            ("總重量", f"{total_weight:.1f} kg"),
-            ("總長度", f"{total_length:.1f} cm"),
-            ("鋼筋類型", f"{len(rebar_types)} 種")
+            ("總數量", f"{totals['count']} 支"),
+            ("總重量", f"{totals['total_weight']:.1f} kg"),
+            ("總長度", f"{totals['total_length']:.1f} cm"),
+            ("鋼筋類型", f"{totals['numbers']} 種")
         ]
         
         for i, (label, value) in enumerate(summary_data):
@@ -377,7 +456,7 @@ class ExcelWriter:
     def write_footer(self, row):
         """寫入頁尾"""
         # 生成時間
-        self.worksheet.merge_cells(f'A{row}:O{row}')
+        self.worksheet.merge_cells(f'A{row}:{get_column_letter(self.last_column)}{row}')
         cell = self.worksheet.cell(row=row, column=1)
         
         # 根據圖形管理器狀態顯示模式資訊
@@ -388,6 +467,9 @@ class ExcelWriter:
         
         cell.value = (f"生成時間：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | "
                      f"{mode_info}")
+        run = instrumentation.get_active()
+        if self.footer_summary and run is not None:
+            cell.value += f" | {run.summary_text()}"
         cell.font = self.styles['small_font']
         cell.alignment = Alignment(horizontal='right', vertical='center')
         cell.border = self.styles['border']
@@ -421,25 +503,53 @@ class ExcelWriter:
         if self.worksheet.max_row > 2:
             self.worksheet.auto_filter.ref = f'A2:{get_column_letter(self.worksheet.max_column)}{self.worksheet.max_row}'
     
-    def write_multi_sheet_rebar_data(self, grouped_data, main_title="鋼筋計料表"):
-        """依據分組資料寫入多個 sheet，每個分組一張表"""
+    def write_multi_sheet_rebar_data(self, grouped_data, main_title="鋼筋計料表", progress=None, stage_range=(0, 100)):
+        """
+        依據分組資料寫入多個 sheet，每個分組一張表
+        
+        Args:
+            progress: ProgressReporter，依各表資料筆數分配進度範圍
+            stage_range: 本步驟在整體進度中所佔的百分比範圍
+        """
         if not self.workbook:
             self.create_workbook()
-        first = True
+        stage_start, stage_end = stage_range
+        total_rows = sum(len(rebar_list) for rebar_list in grouped_data.values()) or 1
+        written_rows = 0
         for sheet_name, rebar_list in grouped_data.items():
-            if first:
-                ws = self.worksheet
-                ws.title = sheet_name if sheet_name else "料表"
-                first = False
-            else:
-                ws = self.workbook.create_sheet(title=sheet_name if sheet_name else "料表")
-            self.worksheet = ws
-            header_row = self.write_title(main_title, subtitle=sheet_name)
-            self.write_header(start_row=header_row)
-            next_row = self.write_rebar_data(rebar_list, start_row=header_row + 1)
-            summary_row = self.write_summary(rebar_list, next_row)
-            self.write_footer(summary_row + 1)
-            self.format_worksheet()
+            first_row = self.add_sheet(sheet_name, main_title)
+            sheet_start = stage_start + (stage_end - stage_start) * written_rows // total_rows
+            written_rows += len(rebar_list)
+            sheet_end = stage_start + (stage_end - stage_start) * written_rows // total_rows
+            next_row = self.write_rebar_data(rebar_list, start_row=first_row,
+                                             progress=progress, stage_range=(sheet_start, sheet_end))
+            self.finish_sheet(rebar_list, next_row)
+
+    def add_sheet(self, sheet_name, main_title="鋼筋計料表"):
+        """
+        新增區塊工作表（第一張沿用預設工作表）並寫入標題與表頭
+        
+        Returns:
+            int: 第一筆資料的行號
+        """
+        title = sheet_name if sheet_name else "料表"
+        if not self.workbook:
+            self.create_workbook()
+        if self.reuse_active_sheet:
+            self.reuse_active_sheet = False
+            self.worksheet = self.workbook.active
+            self.worksheet.title = title
+        else:
+            self.worksheet = self.workbook.create_sheet(title=title)
+        header_row = self.write_title(main_title, subtitle=sheet_name)
+        self.write_header(start_row=header_row)
+        return header_row + 1
+
+    def finish_sheet(self, rebar_list, next_row):
+        """寫入目前工作表的統計摘要、頁尾並設定格式"""
+        summary_row = self.write_summary(rebar_list, next_row)
+        self.write_footer(summary_row + 1)
+        self.format_worksheet()
 
 
 # 便利函數
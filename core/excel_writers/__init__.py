@@ -8,32 +8,113 @@ from .type11_excel_writer import Type11ExcelWriter
 from .type12_excel_writer import Type12ExcelWriter
 from .type18_excel_writer import Type18ExcelWriter
 from .type19_excel_writer import Type19ExcelWriter
+from utils import instrumentation
 
-# 註冊所有 Excel 寫入器
+# 註冊所有 Excel 寫入器（無狀態單例）
 EXCEL_WRITERS = {
-    'type10': Type10ExcelWriter,
-    'type11': Type11ExcelWriter,
-    'type12': Type12ExcelWriter,
-    'type18': Type18ExcelWriter,
-    'type19': Type19ExcelWriter,
+    'type10': Type10ExcelWriter(),
+    'type11': Type11ExcelWriter(),
+    'type12': Type12ExcelWriter(),
+    'type18': Type18ExcelWriter(),
+    'type19': Type19ExcelWriter(),
 }
 
-def get_excel_writer(rebar_type, graphics_manager=None):
+def get_excel_writer(rebar_type):
     """根據鋼筋類型獲取對應的 Excel 寫入器"""
-    writer_class = EXCEL_WRITERS.get(rebar_type)
-    if writer_class:
-        return writer_class(graphics_manager)
-    return None
+    return EXCEL_WRITERS.get(rebar_type)
 
 def get_all_excel_writers():
     """獲取所有 Excel 寫入器"""
     return EXCEL_WRITERS
 
-def create_excel_writer_for_rebar(rebar, graphics_manager=None):
-    """根據鋼筋資料創建對應的 Excel 寫入器"""
+def create_excel_writer_for_rebar(rebar):
+    """根據鋼筋資料取得對應的 Excel 寫入器"""
     rebar_type = rebar.get('type')
     if rebar_type:
-        return get_excel_writer(rebar_type, graphics_manager)
+        return get_excel_writer(rebar_type)
     return None
 
-__all__ = ['BaseExcelWriter', 'get_excel_writer', 'get_all_excel_writers', 'create_excel_writer_for_rebar']
+# 以 RenderService 渲染時每批送出的圖示數量，批次之間回報進度並檢查取消
+RENDER_SERVICE_BATCH = 256
+
+def generate_visuals(rebars, graphics_manager=None, temp_files=None, progress=None, render_service=None):
+    """
+    批次生成鋼筋視覺表示
+
+    依類型分組，幾何資料相同的鋼筋只生成一次視覺表示。
+
+    Args:
+        rebars: 鋼筋資料列表
+        graphics_manager: 圖形管理器
+        temp_files: 暫存圖片路徑會加入此列表，由呼叫端負責清理
+        progress: ProgressReporter，逐筆回報進度並檢查取消
+        render_service: RenderService，提供且圖形管理器可用時，不重複的圖示交給其行程池渲染
+                        （小批次由 RenderService 在目前行程渲染），渲染失敗者改由寫入器逐一產生
+
+    Returns:
+        dict: {鋼筋在列表中的索引: 視覺表示（暫存圖片路徑或文字描述）}，
+              沒有對應寫入器的鋼筋不會出現在結果中
+    """
+    # 依類型分組
+    groups = {}
+    for index, rebar in enumerate(rebars):
+        writer = create_excel_writer_for_rebar(rebar)
+        if writer:
+            groups.setdefault(writer.get_rebar_type(), []).append(index)
+
+    if render_service is not None and graphics_manager is not None:
+        return _render_visuals(rebars, groups, graphics_manager, temp_files, progress, render_service)
+
+    visuals = {}
+    done = 0
+    total = sum(len(indexes) for indexes in groups.values())
+    for rebar_type, indexes in groups.items():
+        writer = EXCEL_WRITERS[rebar_type]
+        generated = {}
+        for index in indexes:
+            done += 1
+            if progress:
+                progress.update(done, total)
+            rebar = rebars[index]
+            key = writer.get_visual_key(rebar)
+            if key not in generated:
+                generated[key] = writer.generate_visual(rebar, graphics_manager, temp_files)
+            else:
+                instrumentation.count('images.reused')
+            visuals[index] = generated[key]
+    return visuals
+
+def _render_visuals(rebars, groups, graphics_manager, temp_files, progress, render_service):
+    """generate_visuals 的 RenderService 版本：先收集不重複的圖示規格，再分批渲染"""
+    unique = {}  # 去重鍵值 → 第一支鋼筋的索引
+    keys = {}
+    for rebar_type, indexes in groups.items():
+        writer = EXCEL_WRITERS[rebar_type]
+        for index in indexes:
+            key = keys[index] = writer.get_visual_key(rebars[index])
+            if key in unique:
+                instrumentation.count('images.reused')
+            else:
+                unique[key] = index
+
+    generated = {}
+    pending = list(unique.items())
+    for start in range(0, len(pending), RENDER_SERVICE_BATCH):
+        batch = pending[start:start + RENDER_SERVICE_BATCH]
+        specs = [create_excel_writer_for_rebar(rebars[index]).get_render_spec(rebars[index]) for _, index in batch]
+        with instrumentation.timer('render.image'):
+            images = render_service.render(specs)
+        for (key, index), data in zip(batch, images):
+            writer = create_excel_writer_for_rebar(rebars[index])
+            if data is None:
+                # 渲染失敗時與逐一產生相同，由寫入器重試或改用文字描述
+                generated[key] = writer.generate_visual(rebars[index], graphics_manager, temp_files)
+            else:
+                instrumentation.count('images.rendered')
+                generated[key] = writer._save_png_to_temp(data, temp_files)
+        if progress:
+            progress.update(start + len(batch), len(pending))
+    return {index: generated[key] for index, key in keys.items()}
+
+__all__ = ['BaseExcelWriter', 'get_excel_writer', 'get_all_excel_writers', 'create_excel_writer_for_rebar',
+           'generate_visuals']
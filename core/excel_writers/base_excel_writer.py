@@ -3,17 +3,20 @@
 """
 
 from abc import ABC, abstractmethod
-import os
 import tempfile
 
+from utils import instrumentation
+
 
 class BaseExcelWriter(ABC):
-    """Excel 寫入器基礎類"""
+    """
+    Excel 寫入器基礎類
+
+    寫入器為無狀態的單例：圖形管理器與暫存檔案列表皆由呼叫端於每次呼叫時傳入，
+    同一個實例可在所有工作表與所有鋼筋間共用。
+    """
     
-    def __init__(self, graphics_manager=None):
-        self.graphics_manager = graphics_manager
-        self.graphics_available = graphics_manager is not None
-        self.temp_files = []
+    def __init__(self):
         self.rebar_type = None
     
     @abstractmethod
@@ -22,10 +25,45 @@ class BaseExcelWriter(ABC):
         pass
     
     @abstractmethod
-    def generate_visual(self, rebar):
-        """生成鋼筋視覺表示（圖片或文字描述）"""
+    def generate_visual(self, rebar, graphics_manager=None, temp_files=None):
+        """
+        生成鋼筋視覺表示（圖片或文字描述）
+
+        Args:
+            rebar: 鋼筋資料
+            graphics_manager: 圖形管理器，None 時僅產生文字描述
+            temp_files: 暫存圖片路徑會加入此列表，由呼叫端負責清理
+
+        Returns:
+            str: 暫存圖片路徑或文字描述
+        """
         pass
+
+    def get_visual_key(self, rebar):
+        """取得視覺表示的去重鍵值，幾何資料相同的鋼筋共用同一個視覺表示"""
+        return (
+            self.get_rebar_type(),
+            tuple(self._get_rebar_segments(rebar)),
+            tuple(rebar.get('angles', []) or []),
+            rebar.get('radius', 0),
+            rebar.get('raw_text', rebar.get('rebar_number', '#4')),
+        )
     
+    def get_render_spec(self, rebar):
+        """
+        取得 RenderService 的圖示規格，產生的圖片與 generate_visual 相同
+
+        Returns:
+            dict: {'type', 'segments', 'angles', 'radius', 'label'}
+        """
+        return {
+            'type': self.get_rebar_type(),
+            'segments': list(self._get_rebar_segments(rebar)),
+            'angles': list(rebar.get('angles', []) or []),
+            'radius': rebar.get('radius', 0),
+            'label': rebar.get('raw_text', rebar.get('rebar_number', '#4')),
+        }
+
     def generate_text_description(self, rebar):
         """生成文字描述"""
         segments = self._get_rebar_segments(rebar)
@@ -43,7 +81,7 @@ class BaseExcelWriter(ABC):
     def _get_rebar_segments(self, rebar):
         """從鋼筋資料中提取分段長度"""
         # 直接檢查 segments 欄位
-        if 'segments' in rebar and isinstance(rebar['segments'], list) and rebar['segments']:
+        if 'segments' in rebar and isinstance(rebar['segments'], (list, tuple)) and rebar['segments']:
             return rebar['segments']
         # 如果沒有 segments，嘗試其他欄位
         segments = []
@@ -63,22 +101,23 @@ class BaseExcelWriter(ABC):
             segments = [rebar['length']]
         return segments
     
-    def _save_image_to_temp(self, image):
-        """將圖片保存到臨時檔案"""
+    def _save_image_to_temp(self, image, temp_files=None):
+        """將圖片保存到臨時檔案，並將路徑加入呼叫端的暫存檔案列表"""
         if image:
             temp_img_path = tempfile.mktemp(suffix='.png')
-            image.save(temp_img_path)
-            self.temp_files.append(temp_img_path)
+            with instrumentation.timer('render.save_png'):
+                image.save(temp_img_path)
+            if temp_files is not None:
+                temp_files.append(temp_img_path)
             return temp_img_path
         return None
-    
-    def cleanup_temp_files(self):
-        """清理暫存檔案"""
-        for temp_file in self.temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-                    print(f"🗑️ 已清理暫存檔案: {temp_file}")
-            except Exception as e:
-                print(f"⚠️ 清理暫存檔案失敗: {e}")
-        self.temp_files.clear()
+
+    def _save_png_to_temp(self, data, temp_files=None):
+        """將 RenderService 產生的 PNG 位元組保存到臨時檔案，並將路徑加入呼叫端的暫存檔案列表"""
+        temp_img_path = tempfile.mktemp(suffix='.png')
+        with instrumentation.timer('render.save_png'):
+            with open(temp_img_path, 'wb') as f:
+                f.write(data)
+        if temp_files is not None:
+            temp_files.append(temp_img_path)
+        return temp_img_path
@@ -0,0 +1,219 @@
+"""
+DXF 解析結果快取模組
+
+以「DXF 內容雜湊 + 解析器版本」為鍵，快取 process_drawing 的分組結果，
+同一張圖面再次轉換（例如只切換圖片模式）時可略過 ezdxf 讀檔與整個解析流程。
+
+- 解析器版本涵蓋 config.py 的鋼筋表格、各處理器的正則表達式與處理器原始碼，
+  任何一項變更都會產生新的鍵，舊項目自然失效
+- 快取內容以 pickle + zlib 壓縮的二進位格式儲存，檔案開頭帶有格式標記
+- 總大小超過 PARSE_CACHE_MAX_MB 時，依最後使用時間刪除最舊的項目
+
+清除快取（於專案根目錄）：
+    python -m core.parse_cache clear
+    python -m core.parse_cache invalidate 圖面.dxf
+    python -m core.parse_cache stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import zlib
+from functools import lru_cache
+
+from config import (
+    REBAR_UNIT_WEIGHT, REBAR_DIAMETERS, REBAR_GRADES,
+    PARSE_CACHE_DIR, PARSE_CACHE_MAX_MB, DXF_FAST_LEXER
+)
+from core.rebar_record import Rebar
+from utils.helpers import hash_file
+
+# 快取檔案格式標記與版本，格式變更時遞增
+CACHE_MAGIC = b"CRPC"
+CACHE_FORMAT_VERSION = 2
+CACHE_SUFFIX = ".bin"
+
+
+def get_default_cache_dir():
+    """使用者快取目錄下的解析結果快取資料夾"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'cad_rebar_tool', 'parse_cache')
+
+
+@lru_cache(maxsize=1)
+def get_parser_version():
+    """
+    計算解析器版本雜湊
+
+    涵蓋鋼筋表格、DXF 讀取設定、已註冊處理器的正則表達式，以及讀取、解析、分組模組的原始碼
+    （打包後無原始碼時僅使用正則表達式）。
+    """
+    import inspect
+    from core.processors import get_all_processors
+    import core.cad_reader
+    import core.dxf_lexer
+    import core.rebar_processor
+    import core.rebar_record
+    import core.processors.base_processor
+    import core.processors.grammar
+    import core.sharding
+
+    digest = hashlib.sha256()
+    digest.update(f"format={CACHE_FORMAT_VERSION};python={sys.version_info[:2]}".encode())
+    tables = {'unit_weight': REBAR_UNIT_WEIGHT, 'diameters': REBAR_DIAMETERS, 'grades': REBAR_GRADES}
+    digest.update(json.dumps(tables, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    digest.update(f"fast_lexer={DXF_FAST_LEXER}".encode())
+
+    sources = [core.cad_reader, core.dxf_lexer, core.sharding, core.rebar_processor, core.rebar_record,
+               core.processors.base_processor, core.processors.grammar]
+    for rebar_type, processor in sorted(get_all_processors().items()):
+        digest.update(f"{rebar_type}={processor.get_pattern()}".encode('utf-8'))
+    for source in sources:
+        try:
+            digest.update(inspect.getsource(source).encode('utf-8'))
+        except (OSError, TypeError):
+            pass
+    return digest.hexdigest()[:16]
+
+
+class ParseCache:
+    """process_drawing 分組結果的磁碟快取"""
+
+    def __init__(self, cache_dir=None, max_bytes=PARSE_CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir or PARSE_CACHE_DIR or get_default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def make_key(self, cad_file_path):
+        """快取鍵：DXF 內容雜湊 + 解析器版本"""
+        return f"{hash_file(cad_file_path)}-{get_parser_version()}"
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def get(self, key):
+        """讀取快取，不存在或格式不符時回傳 None"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) <= len(CACHE_MAGIC) or not data.startswith(CACHE_MAGIC) or data[len(CACHE_MAGIC)] != CACHE_FORMAT_VERSION:
+            return None
+        try:
+            grouped = pickle.loads(zlib.decompress(data[len(CACHE_MAGIC) + 1:]))
+        except Exception as e:
+            print(f"⚠️ 快取項目損壞，將重新解析: {e}")
+            self._remove(path)
+            return None
+        # 更新修改時間作為最後使用時間，供清除最舊項目使用
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return grouped
+
+    def put(self, key, grouped):
+        """寫入快取（先寫暫存檔再取代），並在超過大小上限時清除舊項目"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        payload = zlib.compress(pickle.dumps(_to_plain(grouped), protocol=pickle.HIGHEST_PROTOCOL))
+        path = self._entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(CACHE_MAGIC + bytes([CACHE_FORMAT_VERSION]) + payload)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def entries(self):
+        """列出快取項目 [(路徑, 大小, 最後使用時間)]，依最後使用時間由舊至新排序"""
+        result = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return result
+        for name in names:
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            result.append((path, stat.st_size, stat.st_mtime))
+        result.sort(key=lambda entry: entry[2])
+        return result
+
+    def evict(self):
+        """總大小超過上限時刪除最久未使用的項目，回傳刪除數量"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def invalidate(self, cad_file_path):
+        """刪除指定 DXF 檔案（任何解析器版本）的快取，回傳刪除數量"""
+        content_hash = hash_file(cad_file_path)
+        removed = 0
+        for path, _, _ in self.entries():
+            if os.path.basename(path).startswith(content_hash + "-"):
+                self._remove(path)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """刪除所有快取項目，回傳刪除數量"""
+        entries = self.entries()
+        for path, _, _ in entries:
+            self._remove(path)
+        return len(entries)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _to_plain(grouped):
+    """統一轉為 Rebar 記錄（插入點為浮點數），載入快取時不需匯入 ezdxf"""
+    return {frame: [Rebar.from_dict(rebar) for rebar in rebar_list] for frame, rebar_list in grouped.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DXF 解析結果快取管理")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('clear', help="清除所有快取")
+    subparsers.add_parser('stats', help="顯示快取統計")
+    invalidate_parser = subparsers.add_parser('invalidate', help="清除指定 DXF 檔案的快取")
+    invalidate_parser.add_argument('files', nargs='+', help="DXF 檔案路徑")
+    args = parser.parse_args(argv)
+
+    cache = ParseCache()
+    if args.command == 'clear':
+        print(f"🗑️ 已清除 {cache.clear()} 個快取項目：{cache.cache_dir}")
+    elif args.command == 'invalidate':
+        for file_path in args.files:
+            print(f"🗑️ {file_path}：已清除 {cache.invalidate(file_path)} 個快取項目")
+    else:
+        entries = cache.entries()
+        total = sum(size for _, size, _ in entries)
+        print(f"📁 快取資料夾：{cache.cache_dir}")
+        print(f"📊 {len(entries)} 個項目，共 {total / 1024 / 1024:.2f} MB / 上限 {cache.max_bytes / 1024 / 1024:.0f} MB")
+        print(f"🔖 解析器版本：{get_parser_version()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+管線式轉換模組
+
+將「讀取 → 解析 → 分組 → 產生圖示 → 寫入資料列」拆成以有界佇列串接的階段，
+各階段於獨立執行緒中同時運作，前一階段產出的項目可立即交給下一階段處理：
+
+    擷取文字實體 → 解析鋼筋標記 → 框線分組 → 產生圖示 → 寫入資料列（呼叫端執行緒）
+
+- 階段間以批次傳遞，佇列長度有上限，同時在記憶體中的項目數量受佇列深度限制
+- 每個階段記錄處理數量、忙碌時間與等待時間，結束時找出瓶頸階段
+- 輸出內容與 convert_file 的逐步流程相同（各區塊內的列順序與實體順序一致）
+"""
+
+import queue
+import threading
+import time
+
+from config import PIPELINE_BATCH_SIZE, PIPELINE_QUEUE_DEPTH
+from core.dxf_lexer import create_cad_reader
+from utils import instrumentation
+from utils.progress import ConversionCancelled
+
+# 佇列結束標記
+_END = object()
+
+# 等待佇列時檢查中止旗標的間隔（秒）
+_POLL_INTERVAL = 0.1
+
+
+class PipelineAborted(Exception):
+    """其他階段發生錯誤，管線已中止"""
+    pass
+
+
+class StageMetrics:
+    """單一階段的統計資料"""
+
+    def __init__(self, name):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.busy_seconds = 0.0
+        self.wait_input_seconds = 0.0
+        self.wait_output_seconds = 0.0
+
+    def to_dict(self):
+        return {
+            'stage': self.name,
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'busy_seconds': round(self.busy_seconds, 6),
+            'wait_input_seconds': round(self.wait_input_seconds, 6),
+            'wait_output_seconds': round(self.wait_output_seconds, 6),
+            'items_per_second': round(self.items_in / self.busy_seconds, 1) if self.busy_seconds > 0 else None,
+        }
+
+
+class ConversionPipeline:
+    """單一 DXF 檔案的管線式轉換"""
+
+    def __init__(self, cad_reader, excel_writer, progress=None,
+                 batch_size=PIPELINE_BATCH_SIZE, queue_depth=PIPELINE_QUEUE_DEPTH):
+        """
+        初始化管線
+
+        Args:
+            cad_reader: 已開啟檔案的 CADReader
+            excel_writer: 已建立工作簿的 ExcelWriter
+            progress: ProgressReporter，於擷取階段逐一實體回報進度並檢查取消
+            batch_size: 階段間每次傳遞的項目數
+            queue_depth: 階段間佇列可容納的批次數
+        """
+        self.cad_reader = cad_reader
+        self.excel_writer = excel_writer
+        self.progress = progress
+        self.batch_size = batch_size
+        self.queue_depth = queue_depth
+        self.metrics = []
+        self.abort = threading.Event()
+        self.errors = []
+        self.visual_cache = {}
+
+    # ----- 佇列操作 -----
+
+    def _put(self, outbox, batch, metrics):
+        """放入佇列，佇列已滿時等待（期間檢查中止旗標）"""
+        started = time.perf_counter()
+        while True:
+            if self.abort.is_set():
+                raise PipelineAborted()
+            try:
+                outbox.put(batch, timeout=_POLL_INTERVAL)
+                break
+            except queue.Full:
+                continue
+        metrics.wait_output_seconds += time.perf_counter() - started
+
+    def _get(self, inbox, metrics):
+        """從佇列取出，佇列為空時等待（期間檢查中止旗標）"""
+        started = time.perf_counter()
+        while True:
+            if self.abort.is_set():
+                raise PipelineAborted()
+            try:
+                batch = inbox.get(timeout=_POLL_INTERVAL)
+                break
+            except queue.Empty:
+                continue
+        metrics.wait_input_seconds += time.perf_counter() - started
+        return batch
+
+    # ----- 階段執行 -----
+
+    def _run_source(self, metrics, iterator, outbox):
+        """來源階段：從迭代器取出項目並分批送出"""
+        batch = []
+        busy_started = time.perf_counter()
+        for item in iterator:
+            metrics.items_in += 1
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                metrics.busy_seconds += time.perf_counter() - busy_started
+                metrics.items_out += len(batch)
+                self._put(outbox, batch, metrics)
+                batch = []
+                busy_started = time.perf_counter()
+        metrics.busy_seconds += time.perf_counter() - busy_started
+        if batch:
+            metrics.items_out += len(batch)
+            self._put(outbox, batch, metrics)
+
+    def _run_stage(self, metrics, handler, inbox, outbox):
+        """中間階段：逐批處理，handler 回傳 None 的項目會被丟棄"""
+        while True:
+            batch = self._get(inbox, metrics)
+            if batch is _END:
+                return
+            started = time.perf_counter()
+            results = []
+            for item in batch:
+                result = handler(item)
+                if result is not None:
+                    results.append(result)
+            metrics.items_in += len(batch)
+            metrics.busy_seconds += time.perf_counter() - started
+            if results:
+                metrics.items_out += len(results)
+                self._put(outbox, results, metrics)
+
+    def _start_thread(self, name, target, *args):
+        """於背景執行緒執行階段，結束時送出結束標記；發生錯誤時中止整條管線"""
+        metrics = StageMetrics(name)
+        self.metrics.append(metrics)
+        outbox = args[-1]
+
+        def run():
+            try:
+                target(metrics, *args)
+                self._put(outbox, _END, metrics)
+            except PipelineAborted:
+                pass
+            except BaseException as e:
+                self.errors.append(e)
+                self.abort.set()
+
+        thread = threading.Thread(target=run, name=f"pipeline-{name}", daemon=True)
+        thread.start()
+        return thread
+
+    # ----- 各階段處理 -----
+
+    def _extract(self):
+        """擷取階段：逐一產生文字行並回報進度"""
+        total = self.cad_reader.count_text_entities()
+        for item in self.cad_reader.iter_text_lines():
+            if self.progress:
+                self.progress.update(item[-1], total)
+            yield item
+
+    def _parse(self, item):
+        """解析階段：文字行 → 鋼筋標記"""
+        processed_text, raw_text, position, rotation, _ = item
+        return self.cad_reader.parse_text_line(processed_text, raw_text, position, rotation)
+
+    def _assign(self, rebar_text):
+        """分組階段：鋼筋標記 → (區塊名稱, 鋼筋條目)"""
+        frame = self.cad_reader.find_frame(rebar_text.get('position'), self.tables)
+        return frame, self.cad_reader.make_rebar_entry(rebar_text)
+
+    def _render(self, item):
+        """圖示階段：產生視覺表示，幾何資料相同的鋼筋共用同一個結果"""
+        from core.excel_writers import create_excel_writer_for_rebar
+
+        frame, rebar = item
+        excel_writer = self.excel_writer
+        writer = create_excel_writer_for_rebar(rebar)
+        if writer is None:
+            return frame, rebar, excel_writer._generate_default_text_description(rebar)
+        key = writer.get_visual_key(rebar)
+        visual = self.visual_cache.get(key)
+        if visual is None:
+            try:
+                visual = writer.generate_visual(rebar, excel_writer._get_graphics_manager(), excel_writer.temp_files)
+            except Exception as e:
+                print(f"⚠️ 生成鋼筋視覺表示失敗: {e}")
+                visual = excel_writer._generate_default_text_description(rebar)
+            self.visual_cache[key] = visual
+        else:
+            instrumentation.count('images.reused')
+        return frame, rebar, visual
+
+    # ----- 執行 -----
+
+    def run(self, main_title="鋼筋計料表"):
+        """
+        執行管線，寫入所有工作表（不含儲存）
+
+        Returns:
+            dict: 依框線分組的鋼筋資料 {區塊名稱: [rebar list]}
+
+        Raises:
+            ConversionCancelled: 轉換過程中被取消
+            Exception: 任一階段發生的第一個錯誤
+        """
+        self.tables = self.cad_reader.get_frame_tables()
+        grouped = {tb['name']: [] for tb in self.tables}
+
+        # 先依框線順序建立所有工作表，資料列再依到達順序寫入各自的工作表
+        excel_writer = self.excel_writer
+        sheets = {}
+        next_rows = {}
+        for frame in grouped:
+            next_rows[frame] = excel_writer.add_sheet(frame, main_title)
+            sheets[frame] = excel_writer.worksheet
+
+        queues = [queue.Queue(maxsize=self.queue_depth) for _ in range(4)]
+        threads = [
+            self._start_thread("擷取文字", self._run_source, self._extract(), queues[0]),
+            self._start_thread("解析標記", self._run_stage, self._parse, queues[0], queues[1]),
+            self._start_thread("框線分組", self._run_stage, self._assign, queues[1], queues[2]),
+            self._start_thread("產生圖示", self._run_stage, self._render, queues[2], queues[3]),
+        ]
+
+        # 寫入階段在呼叫端執行緒執行（openpyxl 工作簿不可跨執行緒寫入）
+        metrics = StageMetrics("寫入資料列")
+        self.metrics.append(metrics)
+        try:
+            while True:
+                batch = self._get(queues[3], metrics)
+                if batch is _END:
+                    break
+                started = time.perf_counter()
+                for frame, rebar, visual in batch:
+                    rebar_list = grouped[frame]
+                    rebar_list.append(rebar)
+                    excel_writer.worksheet = sheets[frame]
+                    excel_writer.write_rebar_row(next_rows[frame], len(rebar_list), rebar, visual)
+                    next_rows[frame] += 1
+                metrics.items_in += len(batch)
+                metrics.items_out += len(batch)
+                metrics.busy_seconds += time.perf_counter() - started
+        except PipelineAborted:
+            pass
+        except BaseException:
+            self.abort.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+
+        if self.errors:
+            raise self.errors[0]
+
+        for frame, rebar_list in grouped.items():
+            excel_writer.worksheet = sheets[frame]
+            excel_writer.finish_sheet(rebar_list, next_rows[frame])
+        return grouped
+
+    def get_metrics(self):
+        """各階段統計資料列表"""
+        return [metrics.to_dict() for metrics in self.metrics]
+
+    def get_bottleneck(self):
+        """忙碌時間最長的階段名稱"""
+        if not self.metrics:
+            return None
+        return max(self.metrics, key=lambda metrics: metrics.busy_seconds).name
+
+    def print_metrics(self):
+        """輸出各階段統計"""
+        print("📊 管線階段統計：")
+        for metrics in self.metrics:
+            data = metrics.to_dict()
+            print(f"   {data['stage']}：{data['items_in']} → {data['items_out']} 項，"
+                  f"忙碌 {data['busy_seconds']:.3f}s，等待輸入 {data['wait_input_seconds']:.3f}s，"
+                  f"等待輸出 {data['wait_output_seconds']:.3f}s，{data['items_per_second']} 項/秒")
+        print(f"🐢 瓶頸階段：{self.get_bottleneck()}")
+
+
+def run_conversion_pipeline(cad_file_path, excel_file_path, progress=None, image_mode="mixed",
+                            main_title="鋼筋計料表"):
+    """
+    以管線方式轉換單一 DXF 檔案為 Excel 鋼筋計料表
+
+    Returns:
+        tuple: (依框線分組的鋼筋資料, 各階段統計資料列表)
+
+    Raises:
+        ConversionError: 無法開啟 CAD 檔案或處理圖面失敗
+        ConversionCancelled: 轉換過程中被取消
+    """
+    from core.converter import ConversionError
+    from core.excel_writer import ExcelWriter
+
+    cad_reader = create_cad_reader()
+    excel_writer = ExcelWriter(image_mode=image_mode)
+    try:
+        if progress:
+            progress.stage(0, 10, "正在開啟 CAD 檔案...")
+        with instrumentation.stage('reader'):
+            if not cad_reader.open_file(cad_file_path):
+                raise ConversionError("無法開啟 CAD 檔案")
+
+        if progress:
+            progress.stage(10, 90, "正在解析並寫入鋼筋資料")
+        excel_writer.create_workbook()
+        pipeline = ConversionPipeline(cad_reader, excel_writer, progress)
+        try:
+            # 解析、產生圖示與寫入資料列同時進行，記憶體分析只能視為同一個階段
+            with instrumentation.stage('pipeline'):
+                rebar_data = pipeline.run(main_title)
+        except (ConversionCancelled, ConversionError):
+            raise
+        except Exception as e:
+            raise ConversionError(f"處理圖面失敗: {e}") from e
+        pipeline.print_metrics()
+        instrumentation.record('pipeline_stages', pipeline.get_metrics())
+
+        if progress:
+            progress.stage(90, 100, "正在儲存 Excel 檔案...")
+        excel_writer.save_workbook(excel_file_path, progress=progress)
+        if progress:
+            progress.stage(100, 100, "轉換完成！")
+        return rebar_data, pipeline.get_metrics()
+    finally:
+        excel_writer._cleanup_temp_files()
+        cad_reader.close_file()
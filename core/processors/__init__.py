@@ -1,22 +1,14 @@
 """
 鋼筋處理器模組
+
+處理器由 grammar.py 的宣告式文法規格產生，每種鋼筋類型一個。
 """
 
 from .base_processor import BaseRebarProcessor
-from .type10_processor import Type10Processor
-from .type11_processor import Type11Processor
-from .type12_processor import Type12Processor
-from .type18_processor import Type18Processor
-from .type19_processor import Type19Processor
+from .grammar import MARK_GRAMMAR, GrammarProcessor, MarkParser, get_mark_parser
 
 # 註冊所有處理器
-PROCESSORS = {
-    'type10': Type10Processor(),
-    'type11': Type11Processor(),
-    'type12': Type12Processor(),
-    'type18': Type18Processor(),
-    'type19': Type19Processor(),
-}
+PROCESSORS = {processor.rebar_type: processor for processor in get_mark_parser().processors}
 
 def get_processor(rebar_type):
     """根據鋼筋類型獲取對應的處理器"""
@@ -26,4 +18,5 @@ def get_all_processors():
     """獲取所有處理器"""
     return PROCESSORS
 
-__all__ = ['BaseRebarProcessor', 'get_processor', 'get_all_processors']
+__all__ = ['BaseRebarProcessor', 'GrammarProcessor', 'MarkParser', 'MARK_GRAMMAR', 'get_processor',
+           'get_all_processors', 'get_mark_parser']
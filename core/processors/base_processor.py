@@ -4,6 +4,7 @@
 
 from abc import ABC, abstractmethod
 from config import REBAR_UNIT_WEIGHT, REBAR_DIAMETERS, REBAR_GRADES
+from core.rebar_record import Rebar
 
 class BaseRebarProcessor(ABC):
     """鋼筋處理器基礎類"""
@@ -56,6 +57,25 @@ class BaseRebarProcessor(ABC):
         unit_weight = self.get_rebar_unit_weight(rebar_number)
         return unit_weight * length * count / 100  # 轉換為 kg
     
+    def create_rebar(self, rebar_number, segments, count, text, note, angles=(), radius=0):
+        """建立鋼筋記錄：總長度為各段長度總和，並依號數補上直徑、單位重量與材質等級"""
+        length = sum(segments)
+        return Rebar(
+            rebar_number=rebar_number,
+            type=self.rebar_type,
+            segments=tuple(segments),
+            angles=tuple(angles),
+            count=count,
+            length=length,
+            weight=self.calculate_weight(rebar_number, length, count),
+            raw_text=text,
+            note=note,
+            radius=radius,
+            diameter=self.get_rebar_diameter(rebar_number),
+            unit_weight=self.get_rebar_unit_weight(rebar_number),
+            grade=self.get_rebar_grade(rebar_number),
+        )
+    
     @staticmethod
     def validate_rebar_number(number):
         """驗證鋼筋編號是否有效"""
@@ -0,0 +1,183 @@
+"""
+鋼筋標記文法
+
+每種鋼筋標記以一筆宣告式規格描述，新增形狀只需在 MARK_GRAMMAR 加一筆，不必再寫處理器類別：
+
+    {'type': 'type12', 'pattern': 'V{angle}°{number}-{segments:2}x{count}', 'note': '折料 {angle}°'}
+
+pattern 中的欄位：
+- {number}：鋼筋號數，例如 #10
+- {segments:N}：N 段以 + 連接的長度 (cm)，總長度為各段總和
+- {count}：數量
+- {angle}：彎折角度，存入 angles
+- {radius}：圓弧半徑，存入 radius
+其餘文字為字面前綴或後綴。note 為備註範本，可使用 {angle}、{radius}。
+
+所有規格編譯成一個合併的正則表達式，每個標記只比對一次，以比對到的分組決定類型，
+解析成本不會隨類型數量逐一嘗試而增加。規格依序排列，多種都能比對時以前面的為準。
+
+長度包含彎鉤或彎折延伸量、無法由標記段長直接加總的格式（例如 L#10-700、U#7-350、柱箍、繫筋）
+尚未列入，需要另外定義長度規則。
+"""
+
+import re
+from functools import lru_cache
+
+from .base_processor import BaseRebarProcessor
+
+# 欄位對應的正則表達式
+SLOT_PATTERNS = {
+    'number': r'#\d+',
+    'count': r'\d+',
+    'angle': r'\d+',
+    'radius': r'\d+',
+}
+# 分段長度：整數或一個小數點的小數，「1..2」、「.」等近似標記不比對（不會在 float() 時失敗）
+SEGMENT_PATTERN = r'\d+(?:\.\d+)?'
+SLOT_RE = re.compile(r'\{(\w+)(?::(\d+))?\}')
+
+MARK_GRAMMAR = [
+    # 直料與圓弧
+    {'type': 'type10', 'pattern': '{number}-{segments:1}x{count}', 'note': '直料'},
+    {'type': 'type11', 'pattern': '安{number}-{segments:1}x{count}', 'note': '安全彎鉤直'},
+    {'type': 'type12', 'pattern': 'V{angle}°{number}-{segments:2}x{count}', 'note': '折料 {angle}°'},
+    {'type': 'type18', 'pattern': '弧{radius}{number}-{segments:1}x{count}', 'note': '直料圓弧 R{radius}'},
+    {'type': 'type19', 'pattern': '直弧{radius}{number}-{segments:2}x{count}', 'note': '直段+弧段 R{radius}'},
+    # L 料
+    {'type': 'type20', 'pattern': '{number}-{segments:2}x{count}', 'note': 'L料'},
+    {'type': 'type23', 'pattern': '安{number}-{segments:2}x{count}', 'note': '安全彎鉤L'},
+    {'type': 'type28', 'pattern': '鉤弧{radius}{number}-{segments:2}x{count}', 'note': 'L料圓弧(左鉤) R{radius}'},
+    {'type': 'type29', 'pattern': '弧{radius}鉤{number}-{segments:2}x{count}', 'note': 'L料圓弧(右鉤) R{radius}'},
+    # U、N、Z 料
+    {'type': 'type30', 'pattern': '{number}-{segments:3}x{count}', 'note': 'U料'},
+    {'type': 'type32', 'pattern': '\\_/{number}-{segments:3}x{count}', 'note': '變形U料'},
+    {'type': 'type33', 'pattern': 'L/{number}-{segments:3}x{count}', 'note': '變形U料(type2)'},
+    {'type': 'type34', 'pattern': 'N{number}-{segments:3}x{count}', 'note': 'N料'},
+    {'type': 'type36', 'pattern': 'Z{number}-{segments:3}x{count}', 'note': 'Z料'},
+    # 車牙料
+    {'type': 'type60', 'pattern': '母{number}公-{segments:1}x{count}', 'note': '車牙料(母+公)'},
+    {'type': 'type61', 'pattern': '母{number}-{segments:1}x{count}', 'note': '車牙料(單邊母)'},
+    {'type': 'type62', 'pattern': '公{number}-{segments:1}x{count}', 'note': '車牙料(單邊公)'},
+    {'type': 'type63', 'pattern': '母{number}母-{segments:1}x{count}', 'note': '車牙料(母+母)'},
+    {'type': 'type64', 'pattern': '公{number}公-{segments:1}x{count}', 'note': '車牙料(公+公)'},
+    {'type': 'type65', 'pattern': '母{number}T-{segments:1}x{count}', 'note': '車牙料(母+T)'},
+    {'type': 'type66', 'pattern': '公{number}T-{segments:1}x{count}', 'note': '車牙料(公+T)'},
+    {'type': 'type67', 'pattern': '{number}T-{segments:1}x{count}', 'note': '車牙料(單邊T)'},
+    {'type': 'type70', 'pattern': '母{number}-{segments:2}x{count}', 'note': '車牙料(L+母)'},
+    {'type': 'type71', 'pattern': '公{number}-{segments:2}x{count}', 'note': '車牙料(L+公)'},
+    {'type': 'type73', 'pattern': 'T{number}-{segments:2}x{count}', 'note': '車牙料(L+T)'},
+]
+
+
+def compile_template(template, group_prefix=''):
+    """
+    將規格的 pattern 轉為正則表達式
+
+    Args:
+        template: 規格 pattern，例如 'V{angle}°{number}-{segments:2}x{count}'
+        group_prefix: 分組名稱前綴（合併成單一正則表達式時避免名稱重複）
+
+    Returns:
+        tuple: (正則表達式字串, 分段數)
+    """
+    parts = []
+    segment_count = 0
+    position = 0
+    for slot in SLOT_RE.finditer(template):
+        parts.append(re.escape(template[position:slot.start()]))
+        name, size = slot.group(1), slot.group(2)
+        if name == 'segments':
+            segment_count = int(size or 1)
+            parts.append(r'\+'.join(f'(?P<{group_prefix}s{i}>{SEGMENT_PATTERN})' for i in range(segment_count)))
+        elif name in SLOT_PATTERNS:
+            parts.append(f'(?P<{group_prefix}{name}>{SLOT_PATTERNS[name]})')
+        else:
+            raise ValueError(f"未知的標記欄位: {{{name}}}（{template}）")
+        position = slot.end()
+    parts.append(re.escape(template[position:]))
+    return ''.join(parts), segment_count
+
+
+class GrammarProcessor(BaseRebarProcessor):
+    """依單筆文法規格建立鋼筋記錄的處理器"""
+
+    def __init__(self, spec):
+        super().__init__()
+        self.spec = spec
+        self.rebar_type = spec['type']
+        self.pattern, self.segment_count = compile_template(spec['pattern'])
+
+    def get_pattern(self):
+        """獲取正則表達式模式"""
+        return self.pattern
+
+    def parse_match(self, match, text):
+        """解析匹配結果"""
+        return self.build(match.groupdict(), text)
+
+    def build(self, fields, text):
+        """
+        由比對到的欄位建立鋼筋記錄
+
+        Args:
+            fields: {欄位名稱: 字串}，分段長度為 s0、s1…
+            text: 標記文字
+        """
+        segments = [float(fields[f's{i}']) for i in range(self.segment_count)]
+        values = {name: int(fields[name]) for name in ('angle', 'radius') if name in fields}
+        return self.create_rebar(
+            fields['number'], segments, int(fields['count']), text,
+            self.spec['note'].format(**values),
+            angles=[values['angle']] if 'angle' in values else (),
+            radius=values.get('radius', 0),
+        )
+
+
+class MarkParser:
+    """由文法規格編譯出的單一標記解析器"""
+
+    def __init__(self, grammar=MARK_GRAMMAR):
+        self.processors = [GrammarProcessor(spec) for spec in grammar]
+        alternatives = []
+        for index, spec in enumerate(grammar):
+            pattern, _ = compile_template(spec['pattern'], f'g{index}_')
+            alternatives.append(f'(?P<g{index}>{pattern})')
+        self.pattern = '|'.join(alternatives)
+        self.regex = re.compile(self.pattern)
+        # 各規格的 (分組名稱, 欄位名稱)，比對後只取該規格的分組
+        self.field_groups = []
+        for index in range(len(grammar)):
+            prefix = f'g{index}_'
+            self.field_groups.append([
+                (name, name[len(prefix):]) for name in self.regex.groupindex if name.startswith(prefix)
+            ])
+
+    def match(self, text):
+        """
+        比對標記
+
+        Returns:
+            tuple: (處理器, {欄位: 字串})，無法比對時回傳 None
+        """
+        match = self.regex.match(text)
+        if match is None:
+            return None
+        # 外層分組最後結束，lastgroup 即為比對到的規格分組 g<index>
+        index = int(match.lastgroup[1:])
+        fields = {field: match.group(name) for name, field in self.field_groups[index]}
+        return self.processors[index], fields
+
+    def parse(self, text):
+        """解析標記文字，回傳 Rebar 記錄，無法比對時回傳 None"""
+        text = text.strip()
+        matched = self.match(text)
+        if matched is None:
+            return None
+        processor, fields = matched
+        return processor.build(fields, text)
+
+
+@lru_cache(maxsize=1)
+def get_mark_parser():
+    """取得行程共用的標記解析器"""
+    return MarkParser()
@@ -4,7 +4,8 @@
 
 import re
 from config import REBAR_UNIT_WEIGHT, REBAR_DIAMETERS, REBAR_GRADES
-from core.processors import get_processor, get_all_processors
+from core.processors import get_processor, get_all_processors, get_mark_parser
+from utils import instrumentation
 # 圖形相關模組已移除，改為使用 assets/materials/ 資料夾中的圖示檔案
 
 class RebarProcessor:
@@ -76,30 +77,28 @@ class RebarProcessor:
     @staticmethod
     def parse_rebar_text(text):
         """
-        解析鋼筋文字格式 - 使用模組化處理器
+        解析鋼筋文字格式 - 使用由文法規格編譯的單一解析器
         
-        支援格式：
+        支援格式（完整列表見 core/processors/grammar.py）：
         - #3-700x99 (type10 單段直料)
         - 安#3-390x40 (type11 安全彎鉤直)
         - V113°#10-900+200x2 (type12 折料)
         - 弧450#10-700x1 (type18 直料圓弧)
+        - #4-20+680x13 (type20 L料)、#5-25+650+105x46 (type30 U料)
+        - 母#10公-600x16 (type60 車牙料)
         """
         text = text.strip()
         
-        # 獲取所有處理器
-        processors = get_all_processors()
-        
-        # 嘗試每個處理器
-        for processor_type, processor in processors.items():
-            if processor.can_process(text):
-                print(f"🔍 使用 {processor_type} 處理器處理: {text}")
-                result = processor.process(text)
-                if result:
-                    print(f"🔍 {processor_type} 處理結果: {result}")
-                    return result
+        with instrumentation.timer('parse.marks'):
+            result = get_mark_parser().parse(text)
+        if result:
+            print(f"🔍 {result.type} 處理結果: {result}")
+            instrumentation.count('marks.parsed')
+            return result
         
         # 無法解析的格式
         print(f"⚠️ 無法解析的鋼筋文字格式: {text}")
+        instrumentation.count('marks.missed')
         return None
 
     @staticmethod
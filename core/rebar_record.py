@@ -0,0 +1,111 @@
+"""
+鋼筋資料記錄
+
+每支鋼筋以固定欄位的 Rebar 記錄表示，取代原本每支鋼筋一個 10～15 個鍵的字典：
+- 使用 __slots__，不帶每個實例的 __dict__
+- 插入點只保存 x、y 兩個浮點數，不再保留 ezdxf 的 Vec3 物件
+- 不可變（frozen），補上欄位時以 dataclasses.replace 產生新記錄
+
+為了相容既有程式，Rebar 同時實作唯讀的 Mapping 介面，
+rebar['weight']、rebar.get('radius', 0)、'segments' in rebar、dict(rebar) 等寫法照常可用。
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+
+from config import REBAR_UNIT_WEIGHT, REBAR_DIAMETERS, REBAR_GRADES
+
+# 字典檢視提供的鍵（position 由 x、y 組成）
+VIEW_KEYS = (
+    'rebar_number', 'segments', 'angles', 'count', 'raw_text', 'length', 'weight', 'type', 'note',
+    'radius', 'diameter', 'unit_weight', 'grade', 'position', 'rotation', 'source_positions',
+)
+_VIEW_KEY_SET = frozenset(VIEW_KEYS)
+
+
+@dataclass(frozen=True, slots=True)
+class Rebar(Mapping):
+    """單支鋼筋標記的解析結果"""
+
+    rebar_number: str
+    type: str
+    segments: tuple
+    angles: tuple
+    count: int
+    length: float
+    weight: float
+    raw_text: str = ''
+    note: str = ''
+    radius: int = 0
+    diameter: float = 0
+    unit_weight: float = 0
+    grade: str = "未知"
+    x: float = None
+    y: float = None
+    rotation: float = 0.0
+    source_positions: tuple = None  # 合併模式下各次出現的插入點 ((x, y), ...)
+
+    @property
+    def position(self):
+        """插入點 (x, y)，沒有插入點時為 None"""
+        if self.x is None:
+            return None
+        return (self.x, self.y)
+
+    def with_position(self, position, rotation=0.0, raw_text=None):
+        """回傳帶有插入點（轉為浮點數）與旋轉角度的新記錄"""
+        x = y = None
+        if position is not None:
+            x, y = float(position[0]), float(position[1])
+        return replace(self, x=x, y=y, rotation=float(rotation or 0.0),
+                       raw_text=self.raw_text if raw_text is None else raw_text)
+
+    # ----- 字典相容介面 -----
+
+    def __getitem__(self, key):
+        if key in _VIEW_KEY_SET:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(VIEW_KEYS)
+
+    def __len__(self):
+        return len(VIEW_KEYS)
+
+    def to_dict(self):
+        """轉為一般字典（segments、angles 為 list）"""
+        data = dict(self)
+        data['segments'] = list(self.segments)
+        data['angles'] = list(self.angles)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """由舊格式的鋼筋字典建立記錄，缺少的直徑、單位重量與材質等級依號數補上"""
+        if isinstance(data, cls):
+            return data
+        rebar_number = data.get('rebar_number', '')
+        position = data.get('position')
+        x = y = None
+        if position is not None:
+            x, y = float(position[0]), float(position[1])
+        return cls(
+            rebar_number=rebar_number,
+            type=data.get('type', ''),
+            segments=tuple(data.get('segments') or ()),
+            angles=tuple(data.get('angles') or ()),
+            count=data.get('count', 1),
+            length=data.get('length', 0),
+            weight=data.get('weight', 0),
+            raw_text=data.get('raw_text', ''),
+            note=data.get('note', ''),
+            radius=data.get('radius', 0),
+            diameter=data.get('diameter', REBAR_DIAMETERS.get(rebar_number, 0)),
+            unit_weight=data.get('unit_weight', REBAR_UNIT_WEIGHT.get(rebar_number, 0)),
+            grade=data.get('grade', REBAR_GRADES.get(rebar_number, "未知")),
+            x=x,
+            y=y,
+            rotation=data.get('rotation', 0.0),
+            source_positions=data.get('source_positions'),
+        )
@@ -0,0 +1,220 @@
+"""
+欄式鋼筋表
+
+將鋼筋記錄轉為 NumPy 欄位陣列（號數代碼、分段長度矩陣、數量、長度、重量、區塊代碼、x、y），
+單位重量、總長度與重量以向量運算一次算完，依區塊或號數的統計以 bincount 分組加總，
+不必再對每支鋼筋逐一以 Python 迴圈累加。
+
+    table = RebarTable.from_grouped(grouped)
+    table.totals()                  # 全部鋼筋的總數量、總長度、總重量
+    table.summary_by_number('A')    # 區塊 A 依號數統計
+    table.summary_by_frame()        # 依區塊統計
+
+重量公式與處理器相同：單位重量 (kg/m) × 長度 (cm) × 數量 / 100。
+"""
+
+import math
+
+import numpy as np
+
+from config import REBAR_UNIT_WEIGHT, REBAR_DIAMETERS, REBAR_GRADES, REBAR_TABLE_CHUNK_SIZE
+
+# 預先編碼的號數，順序即統計結果的排列順序；表格以外的號數依出現順序接在後面
+BAR_NUMBERS = tuple(REBAR_UNIT_WEIGHT)
+
+
+class RebarTable:
+    """鋼筋資料的欄式表格"""
+
+    def __init__(self, number_code, segments, count, frame_id, x, y, number_names, frame_names, length=None):
+        """
+        由欄位陣列建立表格（一般使用 from_grouped 或 from_records）
+
+        Args:
+            number_code: 號數代碼 (int16)，對應 number_names 的索引
+            segments: 分段長度矩陣 (float64，n × 最大段數，不足補 0)
+            count: 數量 (int64)
+            frame_id: 區塊代碼 (int32)，對應 frame_names 的索引
+            x, y: 插入點座標 (float64，沒有插入點時為 NaN)
+            number_names: 號數名稱列表
+            frame_names: 區塊名稱列表
+            length: 各筆長度 (float64)，None 表示由分段長度以 math.fsum 計算
+        """
+        self.number_code = number_code
+        self.segments = segments
+        self.count = count
+        self.frame_id = frame_id
+        self.x = x
+        self.y = y
+        self.number_names = number_names
+        self.frame_names = frame_names
+        self.unit_weight = self.get_unit_weights()[number_code]
+        if length is None:
+            length = np.array([math.fsum(row) for row in segments.tolist()], dtype=np.float64)
+        self.length = length
+        self.weight = self.unit_weight * self.length * count / 100  # 轉換為 kg
+
+    def __len__(self):
+        return len(self.count)
+
+    # ----- 建立 -----
+
+    @classmethod
+    def from_grouped(cls, grouped, chunk_size=REBAR_TABLE_CHUNK_SIZE):
+        """由 process_drawing 的分組結果 {區塊名稱: [鋼筋]} 建立表格，每批轉換 chunk_size 筆"""
+        number_names = list(BAR_NUMBERS)
+        number_index = {name: code for code, name in enumerate(number_names)}
+        frame_names = list(grouped)
+        chunks = []
+        for frame_id, rebar_list in enumerate(grouped.values()):
+            for start in range(0, len(rebar_list), chunk_size):
+                chunk = rebar_list[start:start + chunk_size]
+                chunks.append(_convert_chunk(chunk, frame_id, number_names, number_index))
+        number_code, segments, count, frame_id, x, y, length = _concatenate(chunks)
+        return cls(number_code, segments, count, frame_id, x, y, number_names, frame_names, length=length)
+
+    @classmethod
+    def from_records(cls, rebar_list, frame_name='全部', chunk_size=REBAR_TABLE_CHUNK_SIZE):
+        """由單一區塊的鋼筋列表建立表格"""
+        return cls.from_grouped({frame_name: rebar_list}, chunk_size)
+
+    def get_unit_weights(self):
+        """各號數代碼的單位重量 (kg/m)，未知號數為 0"""
+        return np.array([REBAR_UNIT_WEIGHT.get(name, 0) for name in self.number_names], dtype=np.float64)
+
+    # ----- 統計 -----
+
+    def frame_mask(self, frame_name):
+        """指定區塊的布林遮罩，frame_name 為 None 時回傳 None（不篩選）"""
+        if frame_name is None:
+            return None
+        if frame_name not in self.frame_names:
+            return np.zeros(len(self), dtype=bool)
+        return self.frame_id == self.frame_names.index(frame_name)
+
+    def totals(self, frame_name=None):
+        """
+        總計
+
+        總長度與總重量以 math.fsum 精確加總，結果與鋼筋順序無關（快速估算模式依此對帳）。
+
+        Returns:
+            dict: {'entries': 鋼筋標記筆數, 'count': 總支數, 'total_length': 總長度 (cm，長度 × 數量),
+                   'total_weight': 總重量 (kg), 'numbers': 號數種類數}
+        """
+        mask = self.frame_mask(frame_name)
+        count, length, weight, codes = self.count, self.length, self.weight, self.number_code
+        if mask is not None:
+            count, length, weight, codes = count[mask], length[mask], weight[mask], codes[mask]
+        return {
+            'entries': int(len(count)),
+            'count': int(count.sum()),
+            'total_length': math.fsum(length * count),
+            'total_weight': math.fsum(weight),
+            'numbers': int(len(np.unique(codes))),
+        }
+
+    def summary_by_number(self, frame_name=None):
+        """
+        依號數統計（依號數表順序排列）
+
+        Returns:
+            dict: {號數: {'entries', 'count', 'total_length', 'total_weight', 'diameter', 'grade'}}
+        """
+        mask = self.frame_mask(frame_name)
+        codes, count, length, weight = self.number_code, self.count, self.length, self.weight
+        if mask is not None:
+            codes, count, length, weight = codes[mask], count[mask], length[mask], weight[mask]
+        groups = len(self.number_names)
+        entries = np.bincount(codes, minlength=groups)
+        counts = np.bincount(codes, weights=count, minlength=groups)
+        lengths = np.bincount(codes, weights=length * count, minlength=groups)
+        weights = np.bincount(codes, weights=weight, minlength=groups)
+        summary = {}
+        for code in np.flatnonzero(entries):
+            name = self.number_names[code]
+            summary[name] = {
+                'entries': int(entries[code]),
+                'count': int(counts[code]),
+                'total_length': float(lengths[code]),
+                'total_weight': float(weights[code]),
+                'diameter': REBAR_DIAMETERS.get(name, 0),
+                'grade': REBAR_GRADES.get(name, "未知"),
+            }
+        return summary
+
+    def summary_by_frame(self):
+        """
+        依區塊統計（依區塊出現順序排列，包含沒有鋼筋的區塊）
+
+        Returns:
+            dict: {區塊名稱: {'entries', 'count', 'total_length', 'total_weight'}}
+        """
+        groups = len(self.frame_names)
+        entries = np.bincount(self.frame_id, minlength=groups)
+        counts = np.bincount(self.frame_id, weights=self.count, minlength=groups)
+        lengths = np.bincount(self.frame_id, weights=self.length * self.count, minlength=groups)
+        weights = np.bincount(self.frame_id, weights=self.weight, minlength=groups)
+        return {
+            name: {
+                'entries': int(entries[frame_id]),
+                'count': int(counts[frame_id]),
+                'total_length': float(lengths[frame_id]),
+                'total_weight': float(weights[frame_id]),
+            }
+            for frame_id, name in enumerate(self.frame_names)
+        }
+
+
+def _convert_chunk(rebar_list, frame_id, number_names, number_index):
+    """將一批鋼筋記錄轉為欄位陣列，新出現的號數會加入 number_names"""
+    size = len(rebar_list)
+    codes = np.empty(size, dtype=np.int16)
+    count = np.empty(size, dtype=np.int64)
+    x = np.full(size, np.nan)
+    y = np.full(size, np.nan)
+    length = np.empty(size)
+    segment_lists = []
+    for i, rebar in enumerate(rebar_list):
+        name = rebar.get('rebar_number', '')
+        code = number_index.get(name)
+        if code is None:
+            code = number_index[name] = len(number_names)
+            number_names.append(name)
+        codes[i] = code
+        count[i] = rebar.get('count', 1)
+        position = rebar.get('position')
+        if position is not None:
+            x[i], y[i] = position[0], position[1]
+        # 沒有分段資料的舊格式字典以總長度作為單段
+        segment_lists.append(rebar.get('segments') or (rebar.get('length', 0),))
+        # 長度以 math.fsum 精確加總，與分段數、補零寬度無關（快速估算模式以相同算法對帳）
+        length[i] = math.fsum(segment_lists[-1])
+
+    width = max((len(segments) for segments in segment_lists), default=1)
+    segments = np.zeros((size, width))
+    for i, values in enumerate(segment_lists):
+        segments[i, :len(values)] = values
+    frame_ids = np.full(size, frame_id, dtype=np.int32)
+    return codes, segments, count, frame_ids, x, y, length
+
+
+def _concatenate(chunks):
+    """合併各批欄位陣列，分段矩陣補齊到相同段數"""
+    if not chunks:
+        return (np.empty(0, dtype=np.int16), np.zeros((0, 1)), np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.int32), np.empty(0), np.empty(0), np.empty(0))
+    width = max(chunk[1].shape[1] for chunk in chunks)
+    segments = [
+        np.pad(chunk[1], ((0, 0), (0, width - chunk[1].shape[1]))) if chunk[1].shape[1] < width else chunk[1]
+        for chunk in chunks
+    ]
+    return (
+        np.concatenate([chunk[0] for chunk in chunks]),
+        np.concatenate(segments),
+        np.concatenate([chunk[2] for chunk in chunks]),
+        np.concatenate([chunk[3] for chunk in chunks]),
+        np.concatenate([chunk[4] for chunk in chunks]),
+        np.concatenate([chunk[5] for chunk in chunks]),
+        np.concatenate([chunk[6] for chunk in chunks]),
+    )
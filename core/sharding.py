@@ -0,0 +1,371 @@
+"""
+分框平行處理模組
+
+單一大型圖面有數百個 $P- 框線時，process_drawing 只用到一個 CPU 核心。本模組依框線切分工作：
+
+    掃描文字與框線（主行程）→ 判斷框線（主行程，向量運算）
+        → 各行程解析、建立條目並產生圖示（依框線分片）→ 依框線順序寫入工作表（主行程）
+
+- 主行程只做一次快速掃描（LexerCADReader），文字行的座標、旋轉角度、框線索引與原始文字
+  放在共享記憶體中，工作行程直接讀取，不必序列化整份文字列表
+- 框線依文字行數以最長處理時間優先（LPT）的方式分配給各行程，同名框線視為同一區塊，只由一個行程處理
+- 工作行程回傳分組的鋼筋記錄與圖示（暫存圖片路徑或文字描述），暫存圖片由主行程於儲存後清理
+- 各框線內的列順序與實體順序一致，輸出內容與 convert_file 的逐步流程相同
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config import SHARD_MIN_BYTES, SHARD_WORKERS
+from core.cad_reader import CADReader
+from core.dxf_lexer import LexerCADReader
+from utils import instrumentation
+from utils.progress import ConversionCancelled
+
+# 等待工作行程時檢查取消要求的間隔（秒）
+_POLL_INTERVAL = 0.1
+
+# 共享記憶體中的數值欄位：名稱 → 資料型別（依序排列，之後接續 UTF-8 文字）
+SHARED_COLUMNS = (
+    ('x', np.float64),
+    ('y', np.float64),
+    ('rotation', np.float64),
+    ('offset', np.int64),     # 每行文字在文字區的起點，多一筆作為結尾
+    ('frame_id', np.int32),   # 框線名稱索引（同名框線共用）
+)
+
+
+def get_worker_count(workers=SHARD_WORKERS):
+    """分框平行處理使用的行程數"""
+    return workers or os.cpu_count() or 1
+
+
+def should_shard(cad_file_path, workers=SHARD_WORKERS):
+    """圖面是否大到值得分框平行處理（需要多個 CPU 核心）"""
+    try:
+        return get_worker_count(workers) > 1 and os.path.getsize(cad_file_path) >= SHARD_MIN_BYTES
+    except OSError:
+        return False
+
+
+class SharedTextLines:
+    """放在共享記憶體中的文字行欄位（座標、旋轉角度、框線索引與原始文字）"""
+
+    def __init__(self, memory, lines, text_bytes, owner):
+        self.memory = memory
+        self.lines = lines
+        self.text_bytes = text_bytes
+        self.owner = owner
+        self.columns = {}
+        offset = 0
+        for name, dtype in SHARED_COLUMNS:
+            size = lines + 1 if name == 'offset' else lines
+            self.columns[name] = np.ndarray((size,), dtype=dtype, buffer=memory.buf, offset=offset)
+            offset += size * np.dtype(dtype).itemsize
+        self.text = memory.buf[offset:offset + text_bytes]
+
+    @staticmethod
+    def get_size(lines, text_bytes):
+        """共享記憶體所需的位元組數"""
+        size = sum((lines + 1 if name == 'offset' else lines) * np.dtype(dtype).itemsize
+                   for name, dtype in SHARED_COLUMNS)
+        return max(1, size + text_bytes)
+
+    @classmethod
+    def create(cls, texts, xs, ys, rotations, frame_ids):
+        """建立共享記憶體並填入文字行（由主行程建立，使用完畢後呼叫 unlink）"""
+        # 快速掃描以 surrogateescape 解碼，無法解碼的位元組以 surrogatepass 原樣保存
+        encoded = [text.encode('utf-8', 'surrogatepass') for text in texts]
+        text_bytes = sum(map(len, encoded))
+        memory = shared_memory.SharedMemory(create=True, size=cls.get_size(len(texts), text_bytes))
+        shared = cls(memory, len(texts), text_bytes, owner=True)
+        shared.columns['x'][:] = xs
+        shared.columns['y'][:] = ys
+        shared.columns['rotation'][:] = rotations
+        shared.columns['frame_id'][:] = frame_ids
+        offsets = shared.columns['offset']
+        offsets[0] = 0
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        shared.text[:] = b''.join(encoded)
+        return shared
+
+    @classmethod
+    def attach(cls, layout):
+        """於工作行程依 layout 連接共享記憶體"""
+        try:
+            # Python 3.13 起可不向資源追蹤器登記，避免工作行程結束時誤刪主行程的共享記憶體
+            memory = shared_memory.SharedMemory(name=layout['name'], track=False)
+        except TypeError:
+            memory = shared_memory.SharedMemory(name=layout['name'])
+        return cls(memory, layout['lines'], layout['text_bytes'], owner=False)
+
+    def get_layout(self):
+        """傳給工作行程的連接資訊"""
+        return {'name': self.memory.name, 'lines': self.lines, 'text_bytes': self.text_bytes}
+
+    def select(self, frame_indexes):
+        """
+        複製指定框線的文字行（依實體順序）
+
+        Returns:
+            list: [(原始文字, x, y, 旋轉角度, 框線索引)]
+        """
+        columns = self.columns
+        indexes = np.flatnonzero(np.isin(columns['frame_id'], frame_indexes))
+        starts = columns['offset'][indexes].tolist()
+        ends = columns['offset'][indexes + 1].tolist()
+        texts = [bytes(self.text[start:end]).decode('utf-8', 'surrogatepass') for start, end in zip(starts, ends)]
+        return list(zip(texts, columns['x'][indexes].tolist(), columns['y'][indexes].tolist(),
+                        columns['rotation'][indexes].tolist(), columns['frame_id'][indexes].tolist()))
+
+    def close(self):
+        """釋放對共享記憶體的參照（建立者同時刪除共享記憶體）"""
+        self.columns = {}
+        self.text.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def plan_shards(line_counts, workers):
+    """
+    依各框線的文字行數分配框線給工作行程（最長處理時間優先）
+
+    Args:
+        line_counts: 各框線的文字行數（依框線順序）
+        workers: 行程數
+
+    Returns:
+        list: 每個分片的框線索引列表（依框線順序排列，不含空的分片）
+    """
+    shards = [[] for _ in range(max(1, min(workers, len(line_counts))))]
+    loads = [0] * len(shards)
+    for frame_index in sorted(range(len(line_counts)), key=lambda index: -line_counts[index]):
+        target = loads.index(min(loads))
+        shards[target].append(frame_index)
+        loads[target] += line_counts[frame_index]
+    return [sorted(shard) for shard in shards if shard]
+
+
+def process_shard(layout, frame_indexes, image_mode="mixed"):
+    """
+    工作行程：解析分片中各框線的文字行、建立鋼筋條目並產生圖示
+
+    Args:
+        layout: SharedTextLines.get_layout() 的連接資訊
+        frame_indexes: 本分片負責的框線名稱索引（同名框線共用一個索引）
+        image_mode: ExcelWriter 圖片處理模式
+
+    Returns:
+        dict: {'rebars': {框線索引: [鋼筋]}, 'visuals': {框線索引: [視覺表示]},
+               'temp_files': 暫存圖片路徑, 'lines': 文字行數, 'seconds': 耗時}
+    """
+    from core.excel_writer import ExcelWriter
+
+    start = time.perf_counter()
+    reader = CADReader()
+    grouped = {frame_index: [] for frame_index in frame_indexes}
+    shared = SharedTextLines.attach(layout)
+    try:
+        lines = shared.select(frame_indexes)
+    finally:
+        shared.close()
+    for raw_text, x, y, rotation, frame_index in lines:
+        rebar = reader.parse_text_line(raw_text.replace('%%D', '°'), raw_text, (x, y), rotation)
+        if rebar:
+            grouped[frame_index].append(reader.make_rebar_entry(rebar))
+
+    # 整個分片一起產生圖示，幾何資料相同的鋼筋跨框線共用同一張圖
+    excel_writer = ExcelWriter(image_mode=image_mode)
+    rebars = [rebar for rebar_list in grouped.values() for rebar in rebar_list]
+    visuals = excel_writer.generate_visuals(rebars)
+    split_visuals = {}
+    position = 0
+    for frame_index, rebar_list in grouped.items():
+        split_visuals[frame_index] = visuals[position:position + len(rebar_list)]
+        position += len(rebar_list)
+    return {
+        'rebars': grouped,
+        'visuals': split_visuals,
+        'temp_files': list(excel_writer.temp_files),
+        'lines': len(lines),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def collect_text_lines(cad_reader, progress=None):
+    """
+    單次掃描收集所有文字行
+
+    Returns:
+        tuple: (原始文字列表, x 列表, y 列表, 旋轉角度列表)
+    """
+    texts, xs, ys, rotations = [], [], [], []
+    total = cad_reader.count_text_entities()
+    for _, raw_text, position, rotation, scanned in cad_reader.iter_text_lines():
+        if progress:
+            progress.update(scanned, total)
+        texts.append(raw_text)
+        xs.append(position[0])
+        ys.append(position[1])
+        rotations.append(rotation or 0.0)
+    return texts, xs, ys, rotations
+
+
+def run_shards(shared, shards, image_mode, workers, progress=None):
+    """
+    執行各分片（只有一個分片時直接在目前行程處理）
+
+    Returns:
+        list: 與 shards 順序一致的 process_shard 結果
+    """
+    layout = shared.get_layout()
+    if len(shards) == 1 or workers <= 1:
+        results = []
+        for done, shard in enumerate(shards, 1):
+            results.append(process_shard(layout, shard, image_mode))
+            if progress:
+                progress.update(done, len(shards))
+        return results
+
+    results = [None] * len(shards)
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(shards)))
+    futures = {executor.submit(process_shard, layout, shard, image_mode): index
+               for index, shard in enumerate(shards)}
+    try:
+        pending = set(futures)
+        while pending:
+            # 定期檢查取消要求，不必等到下一個分片完成
+            finished, pending = wait(pending, timeout=_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in finished:
+                results[futures[future]] = future.result()
+            if progress:
+                progress.update(len(shards) - len(pending), len(shards))
+    except BaseException:
+        # 取消或失敗時不等待執行中的分片，立即返回；其暫存圖片於背景完成後清理
+        executor.shutdown(wait=False, cancel_futures=True)
+        _remove_files(path for result in results if result for path in result['temp_files'])
+        for future in futures:
+            if not future.done():
+                future.add_done_callback(_remove_shard_files)
+        raise
+    executor.shutdown(wait=True)
+    return results
+
+
+def _remove_shard_files(future):
+    """清理已不需要的分片產生的暫存圖片（分片失敗或被取消時略過）"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    _remove_files(future.result()['temp_files'])
+
+
+def _remove_files(paths):
+    """刪除暫存檔案（忽略已不存在的檔案）"""
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def run_sharded_conversion(cad_file_path, excel_file_path, progress=None, image_mode="mixed",
+                           main_title="鋼筋計料表", workers=SHARD_WORKERS):
+    """
+    以分框平行處理轉換單一 DXF 檔案為 Excel 鋼筋計料表
+
+    Args:
+        workers: 行程數，None 表示 CPU 核心數
+
+    Returns:
+        dict: 依框線分組的鋼筋資料 {區塊名稱: [rebar list]}
+
+    Raises:
+        ConversionError: 無法開啟 CAD 檔案或處理圖面失敗
+        ConversionCancelled: 轉換過程中被取消
+    """
+    from core.converter import ConversionError
+    from core.excel_writer import ExcelWriter
+
+    workers = get_worker_count(workers)
+    cad_reader = LexerCADReader()
+    shared = None
+    excel_writer = ExcelWriter(image_mode=image_mode)
+    try:
+        if progress:
+            progress.stage(0, 10, "正在開啟 CAD 檔案...")
+        with instrumentation.stage('reader'):
+            if not cad_reader.open_file(cad_file_path):
+                raise ConversionError("無法開啟 CAD 檔案")
+
+        # 主行程：收集文字行並以向量運算判斷框線
+        if progress:
+            progress.stage(10, 20, "正在掃描文字實體")
+        with instrumentation.stage('parser'):
+            tables = cad_reader.get_frame_tables()
+            texts, xs, ys, rotations = collect_text_lines(cad_reader, progress)
+            cad_reader.close_file()
+            frame_ids = cad_reader.find_frames(np.array(xs, dtype=np.float64), np.array(ys, dtype=np.float64),
+                                               tables)
+            # 同名框線與逐步流程相同合併為一張工作表，以名稱為分片單位，列順序維持實體順序
+            names = list(dict.fromkeys(table['name'] for table in tables))
+            name_index = {name: index for index, name in enumerate(names)}
+            name_ids = np.array([name_index[table['name']] for table in tables], dtype=np.int32)[frame_ids]
+            shared = SharedTextLines.create(texts, xs, ys, rotations, name_ids)
+            del texts, xs, ys, rotations
+            shards = plan_shards(np.bincount(name_ids, minlength=len(names)).tolist(), workers)
+        print(f"🧩 分框平行處理：{len(tables)} 個框線、{shared.lines} 行文字，分為 {len(shards)} 片")
+
+        # 工作行程：解析、建立條目並產生圖示
+        if progress:
+            progress.stage(20, 80, f"正在以 {min(workers, len(shards))} 個行程解析並產生圖示")
+        with instrumentation.stage('renderer'):
+            try:
+                results = run_shards(shared, shards, image_mode, workers, progress)
+            except (ConversionCancelled, ConversionError):
+                raise
+            except Exception as e:
+                raise ConversionError(f"處理圖面失敗: {e}") from e
+        for result in results:
+            excel_writer.temp_files.extend(result['temp_files'])
+        instrumentation.record('frame_shards', [
+            {'frames': len(shard), 'lines': result['lines'], 'seconds': round(result['seconds'], 6)}
+            for shard, result in zip(shards, results)
+        ])
+
+        # 主行程：依框線名稱順序合併並寫入工作表（每個名稱一張）
+        rebars, visuals = {}, {}
+        for result in results:
+            rebars.update(result['rebars'])
+            visuals.update(result['visuals'])
+        grouped = {}
+        if progress:
+            progress.stage(80, 90, "正在寫入資料列")
+        excel_writer.create_workbook()
+        with instrumentation.stage('writer'):
+            for name_id, name in enumerate(names):
+                rebar_list = rebars[name_id]
+                grouped[name] = rebar_list
+                next_row = excel_writer.add_sheet(name, main_title)
+                for idx, (rebar, visual) in enumerate(zip(rebar_list, visuals[name_id]), 1):
+                    excel_writer.write_rebar_row(next_row, idx, rebar, visual)
+                    next_row += 1
+                excel_writer.finish_sheet(rebar_list, next_row)
+                if progress:
+                    progress.update(name_id + 1, len(names))
+
+        if progress:
+            progress.stage(90, 100, "正在儲存 Excel 檔案...")
+        excel_writer.save_workbook(excel_file_path, progress=progress)
+        if progress:
+            progress.stage(100, 100, "轉換完成！")
+        return grouped
+    finally:
+        excel_writer._cleanup_temp_files()
+        cad_reader.close_file()
+        if shared is not None:
+            shared.close()
@@ -18,10 +18,23 @@ CAD 鋼筋計料轉換工具 Pro v2.1 - PyQt6 版本
 最後更新: 2025-06-03
 """
 
+import os
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 from ui.pyqt_main_window import PyQtMainWindow
 
+# 啟動時間量測：設定此環境變數為檔案路徑時，第一個視窗顯示後寫入該檔案並結束程式
+# （供 benchmarks/startup_profile.py 量測冷啟動時間，打包後的執行檔同樣適用）
+STARTUP_PROBE_ENV = "CAD_TOOL_STARTUP_PROBE"
+
+def finish_startup_probe(app, probe_path):
+    """第一個視窗已顯示，寫入標記檔並結束程式"""
+    with open(probe_path, "w", encoding="utf-8") as f:
+        f.write("first-window\n")
+    app.quit()
+
 def main():
     """主程式入口點"""
     print("正在啟動 PyQt6 應用程式...")
@@ -42,6 +55,10 @@ def main():
         window.show()
         print("視窗顯示成功")
         
+        probe_path = os.environ.get(STARTUP_PROBE_ENV)
+        if probe_path:
+            QTimer.singleShot(0, lambda: finish_startup_probe(app, probe_path))
+        
         print("啟動事件循環...")
         # 啟動事件循環
         sys.exit(app.exec())
@@ -53,4 +70,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # 打包後的執行檔需要此呼叫，圖示渲染行程池才能正常啟動
+    multiprocessing.freeze_support()
     main()
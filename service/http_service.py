@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+本機 HTTP 轉換服務（asyncio，僅使用標準函式庫）
+
+上傳 DXF 後立即回應工作編號，轉換在有上限的行程池中執行，完成後下載 Excel：
+
+    POST   /jobs?name=圖面.dxf     請求本體為 DXF 原始內容，回應 202 與工作編號
+    GET    /jobs/<id>              查詢工作狀態
+    GET    /jobs/<id>/result       下載 Excel（工作完成後）
+    DELETE /jobs/<id>              取消等待中的工作，或刪除已結束工作的檔案
+    GET    /metrics                佇列與工作統計
+    GET    /health                 健康檢查
+
+- 背壓：等待中工作達上限時回應 503 與 Retry-After，不再接收新上傳
+- 上傳大小上限：依 Content-Length 判斷，超過時回應 413 且不讀取本體
+- 已結束工作超過保留數量時，刪除最舊的工作檔案
+- 子行程崩潰時同一個行程池的工作都會中斷，這些工作重新排入佇列並以獨立行程重試，重試仍崩潰者才標記為失敗
+
+使用方式（於專案根目錄）：
+    python -m service.http_service --port 8765 --workers 4
+    curl --data-binary @圖面.dxf "http://127.0.0.1:8765/jobs?name=圖面.dxf"
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from urllib.parse import parse_qs, quote, urlsplit
+
+from config import (
+    BATCH_CRASH_RETRIES, BATCH_JOB_MEMORY_MB, BATCH_MAX_CONCURRENCY,
+    SERVICE_HOST, SERVICE_PORT, SERVICE_MAX_UPLOAD_MB, SERVICE_MAX_QUEUED_JOBS,
+    SERVICE_MAX_RETAINED_JOBS, SERVICE_REQUEST_TIMEOUT
+)
+from core.converter import convert_file_job
+from utils.helpers import get_default_concurrency, submit_isolated
+
+# 工作狀態
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+# 請求列與標頭的長度上限
+MAX_HEADER_LINE = 8192
+MAX_HEADER_COUNT = 64
+
+# 佇列已滿時建議用戶端重試的秒數
+RETRY_AFTER_SECONDS = 5
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _write_file(path, data):
+    """寫入上傳內容（於執行緒池執行）"""
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+class HTTPError(Exception):
+    """以指定狀態碼回應的請求錯誤"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class ServiceJob:
+    """服務中的單一轉換工作"""
+
+    def __init__(self, job_dir, filename):
+        self.id = os.path.basename(job_dir)
+        self.job_dir = job_dir
+        self.filename = filename
+        self.cad_file_path = os.path.join(job_dir, "input.dxf")
+        self.excel_file_path = os.path.join(job_dir, "output.xlsx")
+        self.status = STATUS_QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.crashes = 0   # 隨行程池崩潰的次數
+
+    def to_dict(self):
+        """狀態查詢回應內容"""
+        data = {
+            'id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if self.result:
+            data['sheets'] = self.result['sheets']
+            data['bars'] = self.result['bars']
+            data['seconds'] = round(self.result['seconds'], 3)
+            data['result_url'] = f"/jobs/{self.id}/result"
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+class ConversionService:
+    """HTTP 轉換服務"""
+
+    def __init__(self, work_dir=None, max_workers=None,
+                 max_queued=SERVICE_MAX_QUEUED_JOBS,
+                 max_upload_bytes=SERVICE_MAX_UPLOAD_MB * 1024 * 1024,
+                 max_retained=SERVICE_MAX_RETAINED_JOBS):
+        """
+        初始化轉換服務
+
+        Args:
+            work_dir: 工作檔案目錄，None 表示使用暫存目錄（關閉服務時刪除）
+            max_workers: 同時轉換數量，None 表示依 CPU 核心數與可用記憶體決定
+            max_queued: 等待中工作上限
+            max_upload_bytes: 單一上傳大小上限（位元組）
+            max_retained: 保留的已結束工作數量
+        """
+        self.owns_work_dir = work_dir is None
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix="cad_service_")
+        os.makedirs(self.work_dir, exist_ok=True)
+        self.max_workers = max_workers or min(get_default_concurrency(BATCH_JOB_MEMORY_MB), BATCH_MAX_CONCURRENCY)
+        self.max_queued = max_queued
+        self.max_upload_bytes = max_upload_bytes
+        self.max_retained = max_retained
+
+        self.jobs = OrderedDict()
+        self.queue = None
+        self.executor = None
+        self.server = None
+        self.worker_tasks = []
+        self.started_at = time.time()
+        self.counters = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'rejected_busy': 0,
+            'rejected_too_large': 0,
+            'crash_retries': 0,
+        }
+        self.peak_running = 0
+        self.total_conversion_seconds = 0.0
+
+    # ----- 生命週期 -----
+
+    async def start(self, host=SERVICE_HOST, port=SERVICE_PORT):
+        """啟動行程池、工作協程與 HTTP 伺服器"""
+        self.queue = asyncio.Queue()
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+        self.server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_LINE)
+        return self.server
+
+    async def close(self):
+        """停止接收請求並關閉行程池"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self.worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        if self.owns_work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    # ----- 工作 -----
+
+    def count_status(self, status):
+        """統計指定狀態的工作數量"""
+        return sum(1 for job in self.jobs.values() if job.status == status)
+
+    async def submit(self, data, filename):
+        """
+        建立工作並放入佇列
+
+        上傳內容於預設執行緒池寫入磁碟，不阻塞事件迴圈；工作在寫入前即登記為等待中，
+        寫入期間同時到達的上傳仍受等待中工作上限限制。
+
+        Raises:
+            HTTPError: 等待中工作已達上限（503）
+        """
+        if self.count_status(STATUS_QUEUED) >= self.max_queued:
+            self.counters['rejected_busy'] += 1
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "轉換佇列已滿，請稍後再試",
+                            {'Retry-After': str(RETRY_AFTER_SECONDS)})
+
+        job_dir = os.path.join(self.work_dir, uuid.uuid4().hex)
+        os.makedirs(job_dir)
+        job = ServiceJob(job_dir, filename)
+        self.jobs[job.id] = job
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, _write_file, job.cad_file_path, data)
+        except BaseException:
+            self._remove_job(job)
+            raise
+        self.counters['submitted'] += 1
+        if job.status == STATUS_QUEUED:
+            # 寫入期間已被取消的工作不放入佇列
+            self.queue.put_nowait(job)
+        return job
+
+    def cancel(self, job):
+        """取消等待中的工作，或刪除已結束工作的檔案"""
+        if job.status == STATUS_RUNNING:
+            raise HTTPError(HTTPStatus.CONFLICT, "工作轉換中，無法取消")
+        if job.status == STATUS_QUEUED:
+            # 工作仍在佇列中，由工作協程取出時略過
+            job.status = STATUS_CANCELLED
+            job.finished_at = time.time()
+            self.counters['cancelled'] += 1
+        self._remove_job(job)
+
+    def _remove_job(self, job):
+        """刪除工作紀錄與檔案"""
+        self.jobs.pop(job.id, None)
+        shutil.rmtree(job.job_dir, ignore_errors=True)
+
+    def _evict_finished(self):
+        """已結束工作超過保留數量時，刪除最舊的工作"""
+        finished = [job for job in self.jobs.values() if job.status in FINISHED_STATUSES]
+        for job in finished[:max(0, len(finished) - self.max_retained)]:
+            self._remove_job(job)
+
+    async def _worker(self):
+        """從佇列取出工作並交給行程池轉換"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            try:
+                if job.status != STATUS_QUEUED:
+                    continue
+                job.status = STATUS_RUNNING
+                job.started_at = time.time()
+                self.peak_running = max(self.peak_running, self.count_status(STATUS_RUNNING))
+                # 記錄送出的行程池，崩潰時只取代仍在使用中的同一個行程池
+                executor = self.executor
+                try:
+                    if job.crashes:
+                        # 曾隨行程池崩潰的工作以獨立行程重試，再次崩潰即可確定是該工作造成
+                        job.result = await asyncio.wrap_future(
+                            submit_isolated(convert_file_job, job.cad_file_path, job.excel_file_path)
+                        )
+                    else:
+                        job.result = await loop.run_in_executor(
+                            executor, convert_file_job, job.cad_file_path, job.excel_file_path
+                        )
+                    job.status = STATUS_DONE
+                    self.counters['completed'] += 1
+                    self.total_conversion_seconds += job.result['seconds']
+                    print(f"✅ 工作 {job.id} 轉換完成：{job.filename}")
+                except BrokenProcessPool:
+                    # 子行程崩潰，同一個行程池的工作都會收到 BrokenProcessPool，先重新排入佇列重試
+                    if job.crashes == 0:
+                        self._replace_executor(executor)
+                    job.crashes += 1
+                    if job.crashes <= BATCH_CRASH_RETRIES:
+                        job.status = STATUS_QUEUED
+                        job.started_at = None
+                        self.counters['crash_retries'] += 1
+                        self.queue.put_nowait(job)
+                        print(f"⚠️ 工作 {job.id} 轉換行程異常結束，將以獨立行程重試")
+                        continue
+                    job.status = STATUS_FAILED
+                    job.error = "轉換行程異常結束"
+                    self.counters['failed'] += 1
+                    print(f"❌ 工作 {job.id} 轉換行程異常結束")
+                except Exception as e:
+                    job.status = STATUS_FAILED
+                    job.error = str(e)
+                    self.counters['failed'] += 1
+                    print(f"❌ 工作 {job.id} 轉換失敗：{e}")
+                job.finished_at = time.time()
+                self._evict_finished()
+            finally:
+                self.queue.task_done()
+
+    def _replace_executor(self, executor):
+        """關閉已損壞的行程池並重新建立（已被其他工作協程取代時不處理）"""
+        if executor is self.executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def metrics(self):
+        """服務統計資料"""
+        completed = self.counters['completed']
+        return {
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'max_workers': self.max_workers,
+            'max_queued': self.max_queued,
+            'max_upload_bytes': self.max_upload_bytes,
+            'queued': self.count_status(STATUS_QUEUED),
+            'running': self.count_status(STATUS_RUNNING),
+            'peak_running': self.peak_running,
+            'retained_jobs': len(self.jobs),
+            **self.counters,
+            'average_conversion_seconds': round(self.total_conversion_seconds / completed, 3) if completed else None,
+        }
+
+    # ----- HTTP -----
+
+    async def handle_connection(self, reader, writer):
+        """處理單一連線（每個連線一個請求，回應後關閉）"""
+        try:
+            try:
+                status, body, content_type, headers = await asyncio.wait_for(
+                    self._handle_request(reader), SERVICE_REQUEST_TIMEOUT
+                )
+            except HTTPError as e:
+                status, content_type, headers = e.status, "application/json", e.headers
+                body = self._json_body({'error': e.message})
+            except asyncio.TimeoutError:
+                status, content_type, headers = HTTPStatus.REQUEST_TIMEOUT, "application/json", {}
+                body = self._json_body({'error': "讀取請求逾時"})
+            await self._send_response(writer, status, body, content_type, headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"❌ 處理請求時發生錯誤: {e}")
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader):
+        """
+        讀取並處理請求
+
+        Returns:
+            tuple: (狀態碼, 回應本體, Content-Type, 額外標頭)
+        """
+        method, target, headers = await self._read_head(reader)
+        url = urlsplit(target)
+        parts = [part for part in url.path.split('/') if part]
+
+        if parts == ['health'] and method == 'GET':
+            return self._json_response({'status': 'ok'})
+        if parts == ['metrics'] and method == 'GET':
+            return self._json_response(self.metrics())
+        if parts == ['jobs'] and method == 'POST':
+            data = await self._read_body(reader, headers)
+            filename = parse_qs(url.query).get('name', ['upload.dxf'])[0]
+            job = await self.submit(data, os.path.basename(filename))
+            return self._json_response(
+                dict(job.to_dict(), status_url=f"/jobs/{job.id}"),
+                HTTPStatus.ACCEPTED, {'Location': f"/jobs/{job.id}"}
+            )
+        if len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "找不到工作")
+            if len(parts) == 2 and method == 'GET':
+                return self._json_response(job.to_dict())
+            if len(parts) == 2 and method == 'DELETE':
+                self.cancel(job)
+                return self._json_response({'id': job.id, 'status': job.status})
+            if parts[2] == 'result' and method == 'GET':
+                return await self._result_response(job)
+        raise HTTPError(HTTPStatus.NOT_FOUND, "找不到資源")
+
+    async def _read_head(self, reader):
+        """讀取請求列與標頭"""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            if not request_line:
+                raise asyncio.IncompleteReadError(b"", None)
+            method, target, _ = request_line.split(' ', 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                if len(headers) >= MAX_HEADER_COUNT:
+                    raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "標頭數量過多")
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        except (ValueError, asyncio.LimitOverrunError):
+            # 請求列格式錯誤或單行超過長度上限
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "無效的 HTTP 請求")
+        return method.upper(), target, headers
+
+    async def _read_body(self, reader, headers):
+        """依 Content-Length 讀取上傳內容（超過上限時不讀取）"""
+        if 'content-length' not in headers:
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "需要 Content-Length 標頭")
+        try:
+            length = int(headers['content-length'])
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length 格式錯誤")
+        if length > self.max_upload_bytes:
+            self.counters['rejected_too_large'] += 1
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            f"檔案超過上限 {self.max_upload_bytes // (1024 * 1024)} MB")
+        if length <= 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "上傳內容為空")
+        return await reader.readexactly(length)
+
+    async def _result_response(self, job):
+        """下載轉換結果"""
+        if job.status != STATUS_DONE:
+            raise HTTPError(HTTPStatus.CONFLICT, f"工作尚未完成（{job.status}）")
+        loop = asyncio.get_running_loop()
+        with open(job.excel_file_path, 'rb') as f:
+            data = await loop.run_in_executor(None, f.read)
+        download_name = os.path.splitext(job.filename)[0] + '.xlsx'
+        return (HTTPStatus.OK, data, XLSX_CONTENT_TYPE,
+                {'Content-Disposition': f"attachment; filename*=UTF-8''{quote(download_name, safe='')}"})
+
+    def _json_body(self, data):
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def _json_response(self, data, status=HTTPStatus.OK, headers=None):
+        return status, self._json_body(data), "application/json; charset=utf-8", headers or {}
+
+    async def _send_response(self, writer, status, body, content_type, headers):
+        """寫出回應"""
+        status = HTTPStatus(status)
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+        await writer.drain()
+
+
+async def run_service(host, port, work_dir=None, max_workers=None):
+    """啟動服務並持續執行直到被中斷"""
+    service = ConversionService(work_dir=work_dir, max_workers=max_workers)
+    server = await service.start(host, port)
+    print(f"🚀 轉換服務已啟動：http://{host}:{port}（同時轉換 {service.max_workers} 個工作）")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="本機 HTTP 轉換服務")
+    parser.add_argument('--host', default=SERVICE_HOST, help="監聽位址（預設僅限本機）")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help="監聽埠號")
+    parser.add_argument('--workers', type=int, default=None, help="同時轉換數量")
+    parser.add_argument('--work-dir', default=None, help="工作檔案目錄（預設為暫存目錄）")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_service(args.host, args.port, args.work_dir, args.workers))
+    except KeyboardInterrupt:
+        print("👋 轉換服務已停止")
+
+
+if __name__ == "__main__":
+    main()
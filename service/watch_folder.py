@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+監看資料夾常駐程式 - DXF 內容變更時自動重新轉換
+
+- 以輪詢掃描來源資料夾（含子資料夾），不需額外套件
+- 防抖動：檔案大小與修改時間維持不變一段時間後才處理，避免轉換儲存中的檔案
+- 以 SHA-256 比對內容，只有內容真正變更時才轉換；只更新修改時間不會觸發轉換
+- 輸出至鏡像路徑（來源/a/b.dxf → 輸出/a/b.xlsx）
+- 狀態索引寫入輸出資料夾，重新啟動後不會重新轉換所有檔案
+- 以行程池同時轉換多個變更的檔案；使子行程崩潰的檔案以獨立行程重試，仍崩潰時記錄為失敗
+
+使用方式（於專案根目錄）：
+    python -m service.watch_folder 共用資料夾/圖面 共用資料夾/計料表 --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from config import (
+    BATCH_CRASH_RETRIES, BATCH_JOB_MEMORY_MB, BATCH_MAX_CONCURRENCY,
+    WATCH_POLL_INTERVAL, WATCH_DEBOUNCE_SECONDS, WATCH_STATE_FILENAME
+)
+from core.converter import convert_file_job
+from utils.helpers import get_default_concurrency, hash_file, submit_isolated
+
+# 行程崩潰時記錄的錯誤訊息
+CRASH_ERROR = "轉換行程異常結束"
+
+# 狀態索引格式版本
+STATE_VERSION = 1
+
+
+class FolderWatcher:
+    """監看資料夾並增量轉換變更的 DXF 檔案"""
+
+    def __init__(self, source_dir, output_dir, max_workers=None,
+                 poll_interval=WATCH_POLL_INTERVAL, debounce=WATCH_DEBOUNCE_SECONDS, state_path=None):
+        """
+        初始化監看程式
+
+        Args:
+            source_dir: 監看的 DXF 資料夾
+            output_dir: Excel 輸出資料夾（與來源資料夾結構相同）
+            max_workers: 同時轉換數量，None 表示依 CPU 核心數與可用記憶體決定
+            poll_interval: 掃描間隔（秒）
+            debounce: 檔案需維持不變的秒數
+            state_path: 狀態索引檔案路徑，預設為輸出資料夾中的 WATCH_STATE_FILENAME
+        """
+        self.source_dir = os.path.abspath(source_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        self.max_workers = max_workers or min(get_default_concurrency(BATCH_JOB_MEMORY_MB), BATCH_MAX_CONCURRENCY)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.state_path = state_path or os.path.join(self.output_dir, WATCH_STATE_FILENAME)
+
+        # 狀態索引 {相對路徑: {'sha256', 'size', 'mtime', 'output', 'converted_at', 'error'}}
+        self.state = self.load_state()
+        # 尚未穩定的檔案 {相對路徑: (大小, 修改時間, 最後一次變動的時間)}
+        self.pending = {}
+        # 轉換中的檔案 {相對路徑: (future, 行程池（獨立重試時為 None）, 內容雜湊, 大小, 修改時間, 崩潰次數)}
+        self.running = {}
+        # 隨行程池崩潰、等待以獨立行程重試的檔案 {相對路徑: (內容雜湊, 大小, 修改時間, 崩潰次數)}
+        self.retrying = {}
+        self.executor = None
+
+    # ----- 狀態索引 -----
+
+    def load_state(self):
+        """讀取狀態索引，不存在或格式不符時回傳空索引"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == STATE_VERSION:
+                return data.get('files', {})
+            print("⚠️ 狀態索引版本不符，將重新建立")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 無法讀取狀態索引，將重新建立: {e}")
+        return {}
+
+    def save_state(self):
+        """寫入狀態索引（先寫暫存檔再取代，避免中斷時損壞）"""
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        temp_path = self.state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, 'files': self.state}, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.state_path)
+
+    # ----- 掃描 -----
+
+    def output_path_for(self, relative_path):
+        """來源相對路徑對應的 Excel 輸出路徑"""
+        return os.path.join(self.output_dir, os.path.splitext(relative_path)[0] + '.xlsx')
+
+    def scan(self):
+        """掃描來源資料夾，回傳 {相對路徑: (大小, 修改時間)}"""
+        found = {}
+        for root, dirs, files in os.walk(self.source_dir):
+            # 不監看位於來源資料夾內的輸出資料夾
+            dirs[:] = [d for d in dirs if os.path.join(root, d) != self.output_dir]
+            for name in files:
+                if not name.lower().endswith('.dxf'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found[os.path.relpath(path, self.source_dir)] = (stat.st_size, stat.st_mtime)
+        return found
+
+    def find_ready(self, found, now):
+        """
+        找出已穩定且可能變更的檔案
+
+        大小與修改時間和狀態索引相同的檔案直接略過（不計算雜湊），
+        其餘檔案需維持不變 debounce 秒後才視為穩定。
+        """
+        ready = []
+        for relative_path, (size, mtime) in found.items():
+            if relative_path in self.running or relative_path in self.retrying:
+                continue
+            entry = self.state.get(relative_path)
+            if entry and entry['size'] == size and entry['mtime'] == mtime:
+                self.pending.pop(relative_path, None)
+                continue
+            previous = self.pending.get(relative_path)
+            if previous is None or previous[:2] != (size, mtime):
+                self.pending[relative_path] = (size, mtime, now)
+                continue
+            if now - previous[2] >= self.debounce:
+                ready.append(relative_path)
+
+        # 已刪除的檔案從索引與等待清單移除（保留已產生的 Excel）
+        for relative_path in list(self.pending):
+            if relative_path not in found:
+                del self.pending[relative_path]
+        for relative_path in [path for path in self.retrying if path not in found]:
+            del self.retrying[relative_path]
+        removed = [path for path in self.state if path not in found and path not in self.running]
+        for relative_path in removed:
+            del self.state[relative_path]
+        if removed:
+            self.save_state()
+        return ready
+
+    # ----- 轉換 -----
+
+    def _get_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    def submit_changed(self, ready):
+        """計算雜湊，內容變更的檔案送出轉換"""
+        state_changed = False
+        for relative_path in ready:
+            size, mtime, _ = self.pending.pop(relative_path)
+            source_path = os.path.join(self.source_dir, relative_path)
+            try:
+                digest = hash_file(source_path)
+            except OSError as e:
+                print(f"⚠️ 無法讀取 {relative_path}: {e}")
+                continue
+
+            entry = self.state.get(relative_path)
+            output_path = self.output_path_for(relative_path)
+            if entry and entry['sha256'] == digest and (entry.get('error') or os.path.exists(output_path)):
+                # 內容未變（只有修改時間改變），更新索引即可
+                entry['size'], entry['mtime'] = size, mtime
+                state_changed = True
+                continue
+
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            try:
+                future = self._get_executor().submit(convert_file_job, source_path, output_path)
+            except (BrokenProcessPool, RuntimeError):
+                self._discard_executor(self.executor)
+                future = self._get_executor().submit(convert_file_job, source_path, output_path)
+            self.running[relative_path] = (future, self.executor, digest, size, mtime, 0)
+            print(f"🔄 開始轉換：{relative_path}")
+        if state_changed:
+            self.save_state()
+
+    def submit_retries(self):
+        """以獨立行程重試隨行程池崩潰的檔案（同時重試數量不超過 max_workers）"""
+        isolated = sum(1 for _, executor, *_ in self.running.values() if executor is None)
+        for relative_path in list(self.retrying):
+            if isolated >= self.max_workers:
+                break
+            digest, size, mtime, crashes = self.retrying.pop(relative_path)
+            source_path = os.path.join(self.source_dir, relative_path)
+            future = submit_isolated(convert_file_job, source_path, self.output_path_for(relative_path))
+            self.running[relative_path] = (future, None, digest, size, mtime, crashes)
+            isolated += 1
+            print(f"🔁 以獨立行程重試：{relative_path}")
+
+    def _discard_executor(self, executor):
+        """關閉已損壞的行程池（已被取代時不處理）"""
+        if executor is not None and executor is self.executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def collect_finished(self):
+        """收集已完成的轉換並更新狀態索引"""
+        finished = [path for path, (future, *_) in self.running.items() if future.done()]
+        for relative_path in finished:
+            future, executor, digest, size, mtime, crashes = self.running.pop(relative_path)
+            entry = {
+                'sha256': digest,
+                'size': size,
+                'mtime': mtime,
+                'output': os.path.relpath(self.output_path_for(relative_path), self.output_dir),
+                'converted_at': time.time(),
+                'error': None,
+            }
+            try:
+                result = future.result()
+                print(f"✅ 轉換完成：{relative_path}（{result['bars']} 筆鋼筋，{result['seconds']:.1f} 秒）")
+            except BrokenProcessPool:
+                # 同一個行程池的所有工作都會收到 BrokenProcessPool，無法得知是哪個檔案造成，
+                # 先以獨立行程重試；重試仍崩潰時記錄內容雜湊，內容再次變更前不重複嘗試
+                self._discard_executor(executor)
+                crashes += 1
+                if crashes <= BATCH_CRASH_RETRIES:
+                    self.retrying[relative_path] = (digest, size, mtime, crashes)
+                    print(f"⚠️ 轉換行程異常結束，將以獨立行程重試：{relative_path}")
+                    continue
+                entry['error'] = CRASH_ERROR
+                print(f"❌ {CRASH_ERROR}：{relative_path}")
+            except Exception as e:
+                # 記錄失敗的內容雜湊，內容再次變更前不重複嘗試
+                entry['error'] = str(e)
+                print(f"❌ 轉換失敗：{relative_path}: {e}")
+            self.state[relative_path] = entry
+        if finished:
+            self.save_state()
+
+    def poll_once(self, now=None):
+        """執行一次掃描與轉換排程"""
+        self.collect_finished()
+        self.submit_retries()
+        ready = self.find_ready(self.scan(), time.monotonic() if now is None else now)
+        self.submit_changed(ready)
+
+    def run(self):
+        """持續監看直到被中斷"""
+        print(f"👀 監看資料夾：{self.source_dir} → {self.output_dir}（同時轉換 {self.max_workers} 個檔案）")
+        try:
+            while True:
+                self.poll_once()
+                time.sleep(self.poll_interval)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """等待轉換中的工作完成並關閉行程池（等待重試的檔案於下次啟動時重新轉換）"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        wait([future for future, *_ in self.running.values()])
+        self.collect_finished()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="監看資料夾並自動轉換變更的 DXF 檔案")
+    parser.add_argument('source_dir', help="監看的 DXF 資料夾")
+    parser.add_argument('output_dir', help="Excel 輸出資料夾")
+    parser.add_argument('--workers', type=int, default=None, help="同時轉換數量")
+    parser.add_argument('--interval', type=float, default=WATCH_POLL_INTERVAL, help="掃描間隔（秒）")
+    parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE_SECONDS, help="檔案需維持不變的秒數")
+    parser.add_argument('--state', default=None, help="狀態索引檔案路徑")
+    args = parser.parse_args(argv)
+
+    watcher = FolderWatcher(args.source_dir, args.output_dir, max_workers=args.workers,
+                            poll_interval=args.interval, debounce=args.debounce, state_path=args.state)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("👋 監看已停止")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+PyQt6 批次佇列面板 - 一次轉換多個 DXF 檔案
+
+- 支援拖放或多選加入檔案
+- 以行程池同時轉換，同時轉換數量可設定，預設依 CPU 核心數與可用記憶體決定
+- 每個工作各自顯示狀態、耗時與輸出路徑，單一工作失敗不影響其他工作
+- 子行程崩潰時同一個行程池的工作都會中斷，這些工作改以獨立行程重試，重試仍崩潰者才標記為失敗
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PyQt6.QtWidgets import (
+    QGroupBox, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog
+)
+from PyQt6.QtCore import QTimer
+from config import BATCH_CRASH_RETRIES, BATCH_JOB_MEMORY_MB, BATCH_MAX_CONCURRENCY
+from core.converter import convert_file_job
+from utils.helpers import format_time, get_default_concurrency, submit_isolated
+
+# 工作狀態
+STATUS_PENDING = "等待中"
+STATUS_RUNNING = "轉換中"
+STATUS_DONE = "完成"
+STATUS_FAILED = "失敗"
+
+# 表格欄位
+COLUMN_FILE = 0
+COLUMN_STATUS = 1
+COLUMN_TIME = 2
+COLUMN_OUTPUT = 3
+
+# 輪詢工作狀態的間隔（毫秒）
+POLL_INTERVAL_MS = 500
+
+
+class ConversionJob:
+    """批次佇列中的單一轉換工作"""
+
+    def __init__(self, cad_file_path, row):
+        self.cad_file_path = cad_file_path
+        self.excel_file_path = os.path.splitext(cad_file_path)[0] + '.xlsx'
+        self.row = row
+        self.status = STATUS_PENDING
+        self.future = None
+        self.executor = None   # 送出的行程池，以獨立行程重試時為 None
+        self.crashes = 0       # 隨行程池崩潰的次數
+        self.started_at = None
+        self.elapsed = None
+        self.message = ""
+
+
+class JobQueuePanel(QGroupBox):
+    """批次佇列面板"""
+
+    def __init__(self, parent=None):
+        super().__init__("批次佇列", parent)
+        self.jobs = []
+        self.executor = None
+        self.setAcceptDrops(True)
+        self.setup_ui()
+
+        # 於 UI 執行緒輪詢工作狀態，避免跨執行緒更新元件
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self.poll_jobs)
+
+    def setup_ui(self):
+        """建立使用者介面"""
+        layout = QVBoxLayout(self)
+
+        control_layout = QHBoxLayout()
+        self.add_button = QPushButton("加入檔案")
+        self.add_button.clicked.connect(self.browse_files)
+        control_layout.addWidget(self.add_button)
+
+        control_layout.addWidget(QLabel("同時轉換數量："))
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, BATCH_MAX_CONCURRENCY)
+        self.concurrency_spin.setValue(min(get_default_concurrency(BATCH_JOB_MEMORY_MB), BATCH_MAX_CONCURRENCY))
+        control_layout.addWidget(self.concurrency_spin)
+
+        self.start_queue_button = QPushButton("開始佇列")
+        self.start_queue_button.clicked.connect(self.start_queue)
+        control_layout.addWidget(self.start_queue_button)
+
+        self.clear_button = QPushButton("清除已完成")
+        self.clear_button.clicked.connect(self.clear_finished)
+        control_layout.addWidget(self.clear_button)
+        layout.addLayout(control_layout)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["檔案", "狀態", "耗時", "輸出路徑"])
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(COLUMN_FILE, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(COLUMN_OUTPUT, QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("拖放 DXF 檔案至此處，或點選「加入檔案」")
+        layout.addWidget(self.summary_label)
+
+    # ----- 加入檔案 -----
+
+    def dragEnterEvent(self, event):
+        """接受拖入的 DXF 檔案"""
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        """加入拖放的 DXF 檔案"""
+        paths = [url.toLocalFile() for url in event.mimeData().urls()]
+        self.add_files(paths)
+        event.acceptProposedAction()
+
+    def browse_files(self):
+        """多選加入 DXF 檔案"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "選擇 CAD 檔案", "", "DXF 檔案 (*.dxf);;所有檔案 (*.*)"
+        )
+        self.add_files(file_paths)
+
+    def add_files(self, file_paths):
+        """將檔案加入佇列（忽略非 DXF 與重複的檔案）"""
+        queued = {job.cad_file_path for job in self.jobs if job.status in (STATUS_PENDING, STATUS_RUNNING)}
+        for file_path in file_paths:
+            if not file_path.lower().endswith('.dxf') or file_path in queued:
+                continue
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            job = ConversionJob(file_path, row)
+            self.jobs.append(job)
+            queued.add(file_path)
+            self.table.setItem(row, COLUMN_FILE, QTableWidgetItem(os.path.basename(file_path)))
+            self.table.setItem(row, COLUMN_STATUS, QTableWidgetItem(STATUS_PENDING))
+            self.table.setItem(row, COLUMN_TIME, QTableWidgetItem(""))
+            self.table.setItem(row, COLUMN_OUTPUT, QTableWidgetItem(job.excel_file_path))
+        self.update_summary()
+        if self.poll_timer.isActive():
+            self.fill_slots()
+
+    # ----- 執行佇列 -----
+
+    def start_queue(self):
+        """開始執行佇列"""
+        if not self.poll_timer.isActive():
+            self.poll_timer.start()
+        self.fill_slots()
+
+    def _get_executor(self):
+        """取得（必要時重新建立）行程池"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=BATCH_MAX_CONCURRENCY)
+        return self.executor
+
+    def _discard_executor(self, executor):
+        """關閉已損壞的行程池（已被取代時不處理）"""
+        if executor is not None and executor is self.executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def fill_slots(self):
+        """在同時轉換數量限制內送出等待中的工作"""
+        running = sum(1 for job in self.jobs if job.status == STATUS_RUNNING)
+        for job in self.jobs:
+            if running >= self.concurrency_spin.value():
+                break
+            if job.status != STATUS_PENDING:
+                continue
+            if job.crashes:
+                # 曾隨行程池崩潰的工作以獨立行程重試，再次崩潰即可確定是該工作造成
+                job.future = submit_isolated(convert_file_job, job.cad_file_path, job.excel_file_path)
+                job.executor = None
+            else:
+                try:
+                    job.future = self._get_executor().submit(convert_file_job, job.cad_file_path, job.excel_file_path)
+                except (BrokenProcessPool, RuntimeError):
+                    # 行程池已損壞（例如子行程崩潰），重新建立後再送出
+                    self._discard_executor(self.executor)
+                    job.future = self._get_executor().submit(convert_file_job, job.cad_file_path, job.excel_file_path)
+                job.executor = self.executor
+            job.status = STATUS_RUNNING
+            job.started_at = time.monotonic()
+            running += 1
+            self.update_row(job)
+
+    def poll_jobs(self):
+        """更新執行中工作的狀態與耗時，並補上空出的名額"""
+        for job in self.jobs:
+            if job.status != STATUS_RUNNING:
+                continue
+            job.elapsed = time.monotonic() - job.started_at
+            if job.future.done():
+                try:
+                    result = job.future.result()
+                    job.status = STATUS_DONE
+                    job.message = f"{result['sheets']} 個區塊、{result['bars']} 筆鋼筋"
+                except BrokenProcessPool:
+                    # 同一個行程池的工作都會收到 BrokenProcessPool，先放回佇列以獨立行程重試
+                    self._discard_executor(job.executor)
+                    job.crashes += 1
+                    if job.crashes <= BATCH_CRASH_RETRIES:
+                        job.status = STATUS_PENDING
+                        job.message = "轉換行程異常結束，將以獨立行程重試"
+                    else:
+                        job.status = STATUS_FAILED
+                        job.message = "轉換行程異常結束"
+                except Exception as e:
+                    job.status = STATUS_FAILED
+                    job.message = str(e)
+            self.update_row(job)
+
+        self.fill_slots()
+        self.update_summary()
+        if not any(job.status in (STATUS_PENDING, STATUS_RUNNING) for job in self.jobs):
+            self.poll_timer.stop()
+
+    def clear_finished(self):
+        """移除已完成或失敗的工作"""
+        self.jobs = [job for job in self.jobs if job.status in (STATUS_PENDING, STATUS_RUNNING)]
+        self.table.setRowCount(0)
+        for row, job in enumerate(self.jobs):
+            job.row = row
+            self.table.insertRow(row)
+            self.table.setItem(row, COLUMN_FILE, QTableWidgetItem(os.path.basename(job.cad_file_path)))
+            self.table.setItem(row, COLUMN_STATUS, QTableWidgetItem(""))
+            self.table.setItem(row, COLUMN_TIME, QTableWidgetItem(""))
+            self.table.setItem(row, COLUMN_OUTPUT, QTableWidgetItem(job.excel_file_path))
+            self.update_row(job)
+        self.update_summary()
+
+    # ----- 顯示 -----
+
+    def update_row(self, job):
+        """更新單一工作的表格列"""
+        status = job.status
+        if job.message:
+            status = f"{status}：{job.message}"
+        self.table.item(job.row, COLUMN_STATUS).setText(status)
+        self.table.item(job.row, COLUMN_TIME).setText(format_time(job.elapsed) if job.elapsed is not None else "")
+
+    def update_summary(self):
+        """更新佇列摘要"""
+        counts = {status: 0 for status in (STATUS_PENDING, STATUS_RUNNING, STATUS_DONE, STATUS_FAILED)}
+        for job in self.jobs:
+            counts[job.status] += 1
+        self.summary_label.setText("    ".join(f"{status}：{count}" for status, count in counts.items()))
+
+    def shutdown(self):
+        """關閉行程池（視窗關閉時呼叫）"""
+        self.poll_timer.stop()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+PyQt6 解析預覽面板 - 在輸出 Excel 前檢查 process_drawing 的解析結果
+
+- RebarTableModel 以 QAbstractTableModel 包裝分組結果，儲存格於顯示時才計算，
+  並以 fetchMore 分批載入，十萬筆資料也能順暢捲動
+- 排序與篩選（區塊、號數、類型）在背景執行緒計算索引，完成後才替換模型內容
+"""
+
+from PyQt6.QtWidgets import (
+    QGroupBox, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+    QTableView, QHeaderView
+)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, pyqtSignal
+from core.converter import ConversionError, load_rebar_data
+from utils.progress import CancelToken, ConversionCancelled, ProgressReporter
+
+# 全部選項
+ALL_OPTION = "全部"
+
+# 每次 fetchMore 載入的列數
+FETCH_BATCH_SIZE = 1000
+
+# (欄位標題, 取值函數)，取值函數的參數為 (區塊名稱, 鋼筋資料)
+COLUMNS = [
+    ("區塊", lambda frame, rebar: frame),
+    ("號數", lambda frame, rebar: rebar.get('rebar_number', '')),
+    ("類型", lambda frame, rebar: rebar.get('type', '')),
+    ("段長(cm)", lambda frame, rebar: " + ".join(f"{segment:g}" for segment in rebar.get('segments', []))),
+    ("長度(cm)", lambda frame, rebar: round(rebar.get('length', 0), 1)),
+    ("數量", lambda frame, rebar: rebar.get('count', 1)),
+    ("重量(kg)", lambda frame, rebar: round(rebar.get('weight', 0), 1)),
+    ("備註", lambda frame, rebar: rebar.get('note', '')),
+    ("讀取CAD文字", lambda frame, rebar: rebar.get('raw_text', '')),
+]
+
+
+def flatten_grouped_data(grouped_data):
+    """將 {區塊名稱: [rebar list]} 攤平為 [(區塊名稱, rebar)] 列表"""
+    return [(frame, rebar) for frame, rebar_list in grouped_data.items() for rebar in rebar_list]
+
+
+def _sort_key(value):
+    """數值與文字混合排序：數值在前並依大小排序"""
+    if isinstance(value, (int, float)):
+        return (0, value, "")
+    return (1, 0, str(value))
+
+
+class PreviewWorker(QThread):
+    """背景解析 DXF 檔案"""
+    progress_updated = pyqtSignal(int, str)  # 進度, 狀態
+    preview_ready = pyqtSignal(str, dict)  # 檔案路徑, 分組資料
+    error_occurred = pyqtSignal(str)  # 錯誤訊息
+
+    def __init__(self, cad_file_path):
+        super().__init__()
+        self.cad_file_path = cad_file_path
+        self.cancel_token = CancelToken()
+        self.progress = ProgressReporter(self.progress_updated.emit, self.cancel_token)
+
+    def cancel(self):
+        """要求取消解析"""
+        self.cancel_token.cancel()
+
+    def run(self):
+        """執行解析"""
+        try:
+            grouped_data = load_rebar_data(self.cad_file_path, self.progress)
+            self.preview_ready.emit(self.cad_file_path, grouped_data)
+        except ConversionCancelled:
+            pass
+        except ConversionError as e:
+            self.error_occurred.emit(str(e))
+        except Exception as e:
+            self.error_occurred.emit(f"解析過程發生錯誤：{str(e)}")
+
+
+class ViewIndexWorker(QThread):
+    """背景計算篩選與排序後的列索引"""
+    indexes_ready = pyqtSignal(int, list)  # 請求序號, 列索引
+
+    def __init__(self, generation, rows, filters, sort_column, sort_order):
+        super().__init__()
+        self.generation = generation
+        self.rows = rows
+        self.filters = filters
+        self.sort_column = sort_column
+        self.sort_order = sort_order
+
+    def run(self):
+        """計算列索引"""
+        frame_filter, number_filter, type_filter = self.filters
+        indexes = [
+            i for i, (frame, rebar) in enumerate(self.rows)
+            if (frame_filter is None or frame == frame_filter)
+            and (number_filter is None or rebar.get('rebar_number') == number_filter)
+            and (type_filter is None or rebar.get('type') == type_filter)
+        ]
+        if self.sort_column is not None:
+            getter = COLUMNS[self.sort_column][1]
+            indexes.sort(
+                key=lambda i: _sort_key(getter(*self.rows[i])),
+                reverse=self.sort_order == Qt.SortOrder.DescendingOrder
+            )
+        self.indexes_ready.emit(self.generation, indexes)
+
+
+class RebarTableModel(QAbstractTableModel):
+    """鋼筋解析結果表格模型（依需求計算儲存格、分批載入）"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.view_indexes = []
+        self.loaded_count = 0
+        self.filters = (None, None, None)
+        self.sort_column = None
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self.generation = 0
+        self.index_workers = set()
+
+    def set_grouped_data(self, grouped_data):
+        """載入 process_drawing 的分組結果（篩選選項依新資料重建，清除篩選條件並保留排序）"""
+        self.beginResetModel()
+        self.filters = (None, None, None)
+        # 使仍在計算舊資料的背景結果失效
+        self.generation += 1
+        self.rows = flatten_grouped_data(grouped_data)
+        self.view_indexes = list(range(len(self.rows)))
+        self.loaded_count = min(FETCH_BATCH_SIZE, len(self.view_indexes))
+        self.endResetModel()
+        if self.sort_column is not None:
+            self.refresh_view()
+
+    def clear(self):
+        """清除資料"""
+        self.set_grouped_data({})
+
+    # ----- QAbstractTableModel 介面 -----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.loaded_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            frame, rebar = self.rows[self.view_indexes[index.row()]]
+            return str(COLUMNS[index.column()][1](frame, rebar))
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section][0]
+        return str(section + 1)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self.loaded_count < len(self.view_indexes)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        remaining = len(self.view_indexes) - self.loaded_count
+        count = min(FETCH_BATCH_SIZE, remaining)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded_count, self.loaded_count + count - 1)
+        self.loaded_count += count
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """排序（於背景執行緒計算）"""
+        self.sort_column = column
+        self.sort_order = order
+        self.refresh_view()
+
+    # ----- 篩選與排序 -----
+
+    def set_filters(self, frame=None, rebar_number=None, rebar_type=None):
+        """設定篩選條件（None 表示不篩選）"""
+        self.filters = (frame, rebar_number, rebar_type)
+        self.refresh_view()
+
+    def refresh_view(self):
+        """於背景執行緒重新計算篩選與排序結果"""
+        self.generation += 1
+        worker = ViewIndexWorker(self.generation, self.rows, self.filters, self.sort_column, self.sort_order)
+        worker.indexes_ready.connect(self._apply_view_indexes)
+        # 保留參考避免執行緒在完成前被回收
+        self.index_workers.add(worker)
+        worker.finished.connect(lambda: self.index_workers.discard(worker))
+        worker.start()
+
+    def _apply_view_indexes(self, generation, indexes):
+        """套用背景計算結果（忽略已過時的請求）"""
+        if generation != self.generation:
+            return
+        self.beginResetModel()
+        self.view_indexes = indexes
+        self.loaded_count = min(FETCH_BATCH_SIZE, len(indexes))
+        self.endResetModel()
+
+    def distinct_values(self):
+        """取得篩選選項：(區塊列表, 號數列表, 類型列表)"""
+        frames, numbers, types = {}, {}, {}
+        for frame, rebar in self.rows:
+            frames[frame] = None
+            numbers[rebar.get('rebar_number', '')] = None
+            types[rebar.get('type', '')] = None
+        return list(frames), sorted(numbers, key=lambda n: (len(n), n)), sorted(types)
+
+    def filtered_count(self):
+        """篩選後的總列數（含尚未載入的列）"""
+        return len(self.view_indexes)
+
+
+class PreviewPanel(QGroupBox):
+    """解析預覽面板"""
+
+    def __init__(self, parent=None):
+        super().__init__("解析預覽", parent)
+        self.model = RebarTableModel(self)
+        self.model.modelReset.connect(self.update_summary)
+        self.total_weight = 0
+        self.setup_ui()
+
+    def setup_ui(self):
+        """建立使用者介面"""
+        layout = QVBoxLayout(self)
+
+        filter_layout = QHBoxLayout()
+        self.frame_combo = self._add_filter(filter_layout, "區塊：")
+        self.number_combo = self._add_filter(filter_layout, "號數：")
+        self.type_combo = self._add_filter(filter_layout, "類型：")
+        layout.addLayout(filter_layout)
+
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.setAlternatingRowColors(True)
+        # 固定列高，避免大量資料時逐列計算高度
+        vertical_header = self.table_view.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(24)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table_view)
+
+        self.summary_label = QLabel("尚未解析")
+        layout.addWidget(self.summary_label)
+
+    def _add_filter(self, layout, label_text):
+        """加入篩選下拉選單"""
+        layout.addWidget(QLabel(label_text))
+        combo = QComboBox()
+        combo.addItem(ALL_OPTION)
+        combo.currentIndexChanged.connect(self.apply_filters)
+        layout.addWidget(combo)
+        return combo
+
+    def set_grouped_data(self, grouped_data):
+        """顯示 process_drawing 的分組結果"""
+        # NumPy 載入成本較高，延遲到第一次顯示預覽才匯入
+        from core.rebar_table import RebarTable
+
+        self.model.set_grouped_data(grouped_data)
+        self.total_weight = RebarTable.from_grouped(grouped_data).totals()['total_weight']
+        frames, numbers, types = self.model.distinct_values()
+        for combo, values in ((self.frame_combo, frames), (self.number_combo, numbers), (self.type_combo, types)):
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem(ALL_OPTION)
+            combo.addItems([str(value) for value in values])
+            combo.blockSignals(False)
+        self.update_summary()
+
+    def clear(self):
+        """清除預覽"""
+        self.set_grouped_data({})
+        self.summary_label.setText("尚未解析")
+
+    def apply_filters(self):
+        """套用篩選條件"""
+        def selected(combo):
+            text = combo.currentText()
+            return None if text == ALL_OPTION else text
+        self.model.set_filters(selected(self.frame_combo), selected(self.number_combo), selected(self.type_combo))
+
+    def update_summary(self):
+        """更新筆數摘要"""
+        self.summary_label.setText(
+            f"顯示 {self.model.filtered_count()} / {len(self.model.rows)} 筆    總重量：{self.total_weight:.1f} kg"
+        )
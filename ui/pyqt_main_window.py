@@ -9,56 +9,46 @@ import threading
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QLabel, QLineEdit, QPushButton, QProgressBar, 
-    QFileDialog, QMessageBox, QFrame, QGroupBox
+    QFileDialog, QMessageBox, QFrame, QGroupBox, QTabWidget
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QPalette, QColor
-from core.cad_reader import CADReader
-from core.excel_writer import ExcelWriter
+from core.converter import ConversionError, convert_file
+from ui.job_queue_panel import JobQueuePanel
+from ui.preview_panel import PreviewPanel, PreviewWorker
 from utils.helpers import get_file_info
+from utils.progress import CancelToken, ConversionCancelled, ProgressReporter
 
 class ConversionWorker(QThread):
     """轉換工作執行緒"""
     progress_updated = pyqtSignal(int, str)  # 進度, 狀態
     conversion_completed = pyqtSignal(dict)  # 結果資料
+    conversion_cancelled = pyqtSignal()  # 已取消
     error_occurred = pyqtSignal(str)  # 錯誤訊息
     
-    def __init__(self, cad_file_path, excel_file_path):
+    def __init__(self, cad_file_path, excel_file_path, rebar_data=None):
         super().__init__()
         self.cad_file_path = cad_file_path
         self.excel_file_path = excel_file_path
-        self.cad_reader = CADReader()
-        self.excel_writer = ExcelWriter()
+        self.rebar_data = rebar_data  # 預覽已解析的資料，提供時略過解析
+        self.cancel_token = CancelToken()
+        # 進度訊號限制在約 10 Hz，避免塞滿 Qt 事件迴圈
+        self.progress = ProgressReporter(self.progress_updated.emit, self.cancel_token)
+    
+    def cancel(self):
+        """要求取消轉換（由 UI 執行緒呼叫）"""
+        self.cancel_token.cancel()
     
     def run(self):
         """執行轉換"""
         try:
-            # 開啟 CAD 檔案
-            self.progress_updated.emit(20, "正在開啟 CAD 檔案...")
-            if not self.cad_reader.open_file(self.cad_file_path):
-                self.error_occurred.emit("無法開啟 CAD 檔案")
-                return
-            
-            # 處理圖面
-            self.progress_updated.emit(40, "正在處理圖面...")
-            rebar_data = self.cad_reader.process_drawing()
-            if not rebar_data:
-                self.error_occurred.emit("處理圖面失敗")
-                return
-            
-            # 生成 Excel
-            self.progress_updated.emit(60, "正在生成 Excel 檔案...")
-            self.excel_writer.create_workbook()
-            self.excel_writer.write_multi_sheet_rebar_data(rebar_data)
-            self.excel_writer.save_workbook(self.excel_file_path)
-            
-            # 清理資源
-            self.cad_reader.close_file()
-            
-            # 完成
-            self.progress_updated.emit(100, "轉換完成！")
+            rebar_data = convert_file(self.cad_file_path, self.excel_file_path,
+                                      progress=self.progress, rebar_data=self.rebar_data)
             self.conversion_completed.emit(rebar_data)
-            
+        except ConversionCancelled:
+            self.conversion_cancelled.emit()
+        except ConversionError as e:
+            self.error_occurred.emit(str(e))
         except Exception as e:
             self.error_occurred.emit(f"轉換過程發生錯誤：{str(e)}")
 
@@ -68,7 +58,7 @@ class PyQtMainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("CAD 鋼筋計料轉換工具")
-        self.setGeometry(100, 100, 800, 600)
+        self.setGeometry(100, 100, 900, 850)
         self.setup_ui()
         self.setup_styles()
         
@@ -76,6 +66,9 @@ class PyQtMainWindow(QMainWindow):
         self.cad_file_path = ""
         self.excel_file_path = ""
         self.conversion_worker = None
+        self.preview_worker = None
+        self.preview_file_path = ""  # 預覽資料對應的 CAD 檔案
+        self.preview_data = None
     
     def setup_ui(self):
         """建立使用者介面"""
@@ -142,14 +135,33 @@ class PyQtMainWindow(QMainWindow):
         
         main_layout.addWidget(progress_group)
         
+        # 解析預覽與批次佇列區域
+        self.tabs = QTabWidget()
+        self.preview_panel = PreviewPanel()
+        self.tabs.addTab(self.preview_panel, "解析預覽")
+        self.job_queue_panel = JobQueuePanel()
+        self.tabs.addTab(self.job_queue_panel, "批次佇列")
+        main_layout.addWidget(self.tabs, stretch=1)
+        
         # 按鈕區域
         button_layout = QHBoxLayout()
         
+        self.preview_button = QPushButton("預覽解析")
+        self.preview_button.setMinimumHeight(50)
+        self.preview_button.clicked.connect(self.start_preview)
+        button_layout.addWidget(self.preview_button)
+        
         self.start_button = QPushButton("開始轉換")
         self.start_button.setMinimumHeight(50)
         self.start_button.clicked.connect(self.start_conversion)
         button_layout.addWidget(self.start_button)
         
+        self.cancel_button = QPushButton("取消")
+        self.cancel_button.setMinimumHeight(50)
+        self.cancel_button.clicked.connect(self.cancel_conversion)
+        self.cancel_button.setEnabled(False)
+        button_layout.addWidget(self.cancel_button)
+        
         self.reset_button = QPushButton("重置")
         self.reset_button.setMinimumHeight(50)
         self.reset_button.clicked.connect(self.reset_form)
@@ -206,7 +218,7 @@ class PyQtMainWindow(QMainWindow):
             QPushButton:disabled {
                 background-color: #555555;
             }
-            QLineEdit {
+            QLineEdit, QSpinBox {
                 padding: 8px;
                 border: 2px solid #555555;
                 border-radius: 5px;
@@ -224,6 +236,11 @@ class PyQtMainWindow(QMainWindow):
             }
         """)
     
+    def closeEvent(self, event):
+        """關閉視窗時結束批次佇列的行程池"""
+        self.job_queue_panel.shutdown()
+        super().closeEvent(event)
+    
     def browse_cad_file(self):
         """瀏覽 CAD 檔案"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -280,6 +297,9 @@ class PyQtMainWindow(QMainWindow):
         self.status_label.setText("等待開始...")
         self.open_file_btn.setVisible(False)
         self.start_button.setEnabled(True)
+        self.preview_file_path = ""
+        self.preview_data = None
+        self.preview_panel.clear()
     
     def start_conversion(self):
         """開始轉換"""
@@ -297,12 +317,53 @@ class PyQtMainWindow(QMainWindow):
         self.progress_bar.setValue(0)
         self.status_label.setText("正在啟動轉換...")
         
-        # 創建並啟動轉換執行緒
-        self.conversion_worker = ConversionWorker(self.cad_file_path, self.excel_file_path)
+        # 創建並啟動轉換執行緒（若已預覽同一檔案則沿用解析結果）
+        rebar_data = self.preview_data if self.preview_file_path == self.cad_file_path else None
+        self.conversion_worker = ConversionWorker(self.cad_file_path, self.excel_file_path, rebar_data)
         self.conversion_worker.progress_updated.connect(self.update_progress)
         self.conversion_worker.conversion_completed.connect(self.conversion_completed)
+        self.conversion_worker.conversion_cancelled.connect(self.conversion_cancelled)
         self.conversion_worker.error_occurred.connect(self.conversion_error)
         self.conversion_worker.start()
+        self.cancel_button.setEnabled(True)
+    
+    def start_preview(self):
+        """於背景解析 CAD 檔案並顯示預覽"""
+        if not self.cad_file_path:
+            QMessageBox.critical(self, "錯誤", "請選擇 CAD 檔案")
+            return
+        
+        self.preview_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("正在解析預覽...")
+        
+        self.preview_worker = PreviewWorker(self.cad_file_path)
+        self.preview_worker.progress_updated.connect(self.update_progress)
+        self.preview_worker.preview_ready.connect(self.preview_ready)
+        self.preview_worker.error_occurred.connect(self.preview_error)
+        self.preview_worker.finished.connect(lambda: self.preview_button.setEnabled(True))
+        self.preview_worker.start()
+    
+    def preview_ready(self, cad_file_path, grouped_data):
+        """顯示預覽結果"""
+        self.preview_file_path = cad_file_path
+        self.preview_data = grouped_data
+        self.preview_panel.set_grouped_data(grouped_data)
+        self.tabs.setCurrentWidget(self.preview_panel)
+        self.progress_bar.setValue(100)
+        self.status_label.setText(f"解析完成，共 {len(grouped_data)} 個區塊")
+    
+    def preview_error(self, error_message):
+        """預覽錯誤"""
+        self.status_label.setText("解析失敗")
+        QMessageBox.critical(self, "錯誤", error_message)
+    
+    def cancel_conversion(self):
+        """取消轉換"""
+        if self.conversion_worker and self.conversion_worker.isRunning():
+            self.conversion_worker.cancel()
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("正在取消...")
     
     def update_progress(self, value, status):
         """更新進度"""
@@ -315,13 +376,22 @@ class PyQtMainWindow(QMainWindow):
         self.progress_bar.setValue(100)
         self.open_file_btn.setVisible(True)
         self.start_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
         
         QMessageBox.information(self, "完成", f"轉換完成！共處理 {len(rebar_data)} 個區塊。")
     
+    def conversion_cancelled(self):
+        """轉換已取消"""
+        self.status_label.setText("轉換已取消")
+        self.progress_bar.setValue(0)
+        self.start_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+    
     def conversion_error(self, error_message):
         """轉換錯誤"""
         self.status_label.setText("轉換失敗")
         self.start_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
         QMessageBox.critical(self, "錯誤", error_message)
     
     def open_excel_file(self):
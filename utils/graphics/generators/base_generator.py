@@ -5,12 +5,30 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 import xml.etree.ElementTree as ET
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
+from ..materials import MATERIALS_DIR
+from ..geometry import fit_to_canvas
+
+@lru_cache(maxsize=None)
+def _load_svg_root(svg_path):
+    """解析並快取 SVG 根節點（模板只讀不寫，可安全共用）"""
+    return ET.parse(svg_path).getroot()
+
+
+@lru_cache(maxsize=None)
+def _load_font(size):
+    """載入並快取指定大小的字體"""
+    try:
+        return ImageFont.truetype("/System/Library/Fonts/Arial.ttf", size)
+    except:
+        return ImageFont.load_default()
+
 
 class BaseImageGenerator(ABC):
     """圖形生成器基礎類"""
     
-    def __init__(self, materials_dir="assets/materials"):
+    def __init__(self, materials_dir=MATERIALS_DIR):
         self.materials_dir = Path(materials_dir)
         self.rebar_type = None
     
@@ -39,9 +57,7 @@ class BaseImageGenerator(ABC):
     def parse_svg(self, svg_path):
         """解析 SVG 檔案"""
         try:
-            tree = ET.parse(svg_path)
-            root = tree.getroot()
-            return root
+            return _load_svg_root(str(svg_path))
         except Exception as e:
             print(f"❌ SVG 解析失敗: {e}")
             return None
@@ -54,10 +70,7 @@ class BaseImageGenerator(ABC):
     
     def get_font(self, size=32):
         """獲取字體"""
-        try:
-            return ImageFont.truetype("/System/Library/Fonts/Arial.ttf", size)
-        except:
-            return ImageFont.load_default()
+        return _load_font(size)
     
     def draw_text_centered(self, draw, text, x, y, font, fill='black'):
         """繪製置中文字"""
@@ -65,3 +78,24 @@ class BaseImageGenerator(ABC):
         text_width = text_bbox[2] - text_bbox[0]
         text_x = x - text_width // 2
         draw.text((text_x, y), text, fill=fill, font=font)
+
+    def draw_primitives(self, draw, primitives, line_width=8, fill='black'):
+        """繪製已轉換為像素座標的圖元（折線與文字標註）"""
+        for primitive in primitives:
+            if primitive['kind'] == 'polyline':
+                points = [tuple(point) for point in primitive['points'].round().astype(int).tolist()]
+                draw.line(points, fill=fill, width=line_width, joint='curve')
+            elif primitive['kind'] == 'label':
+                font = self.get_font(primitive['size'])
+                text_bbox = draw.textbbox((0, 0), primitive['text'], font=font)
+                text_height = text_bbox[3] - text_bbox[1]
+                # 沿法向量偏移，避免文字壓在線條上
+                offset = primitive['normal'] * (text_height + line_width)
+                x, y = primitive['at'] + offset
+                self.draw_text_centered(draw, primitive['text'], int(x), int(y - text_height / 2), font, fill)
+
+    def render_primitives(self, primitives, width=800, height=400, padding=80):
+        """將模型座標圖元縮放置入畫布並繪製成圖片"""
+        image, draw = self.create_base_image(width, height)
+        self.draw_primitives(draw, fit_to_canvas(primitives, width, height, padding))
+        return image
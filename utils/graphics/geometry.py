@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+鋼筋圖示幾何模組 - 將段長、角度、半徑轉換為向量化座標
+
+所有形狀先在「模型座標」（單位 cm，Y 軸向上）中以 NumPy 陣列建立，
+再以單一仿射轉換縮放置入畫布（像素座標，Y 軸向下），
+最後交由生成器的 draw_primitives 繪製，各類型不再需要自己的縮放程式碼。
+
+圖元 (primitive) 為字典：
+    {'kind': 'polyline', 'points': ndarray(N, 2)}
+    {'kind': 'label', 'at': ndarray(2), 'normal': ndarray(2), 'text': str, 'size': int}
+"""
+
+import math
+import numpy as np
+
+# 圓弧離散化的點數（每個圓弧）
+ARC_RESOLUTION = 48
+
+# 未提供半徑或半徑無效時使用的預設掃掠角（弧度）
+DEFAULT_SWEEP = math.pi / 2
+
+
+def polyline(points):
+    """建立折線圖元"""
+    return {'kind': 'polyline', 'points': np.asarray(points, dtype=float)}
+
+
+def label(at, text, normal=(0.0, 1.0), size=32):
+    """建立文字標註圖元（normal 為模型座標中文字偏移方向）"""
+    return {
+        'kind': 'label',
+        'at': np.asarray(at, dtype=float),
+        'normal': np.asarray(normal, dtype=float),
+        'text': str(text),
+        'size': size,
+    }
+
+
+def bent_polyline(segments, angles, start=(0.0, 0.0), heading=0.0):
+    """
+    將段長與彎折角轉換為折線頂點
+
+    Args:
+        segments: 各段長度
+        angles: 相鄰兩段之間的內角（度），180° 表示不彎折
+        start: 起點
+        heading: 第一段的方向（弧度）
+
+    Returns:
+        ndarray(len(segments) + 1, 2): 折線頂點
+    """
+    lengths = np.asarray(segments, dtype=float)
+    inner = np.full(max(len(lengths) - 1, 0), 180.0)
+    given = np.asarray(list(angles)[:len(inner)], dtype=float)
+    inner[:len(given)] = given
+
+    # 每段方向 = 起始方向 + 累積轉角（轉角 = 180° - 內角）
+    turns = np.radians(180.0 - inner)
+    headings = heading + np.concatenate(([0.0], np.cumsum(turns)))
+
+    steps = np.column_stack((lengths * np.cos(headings), lengths * np.sin(headings)))
+    return np.vstack((np.asarray(start, dtype=float), np.asarray(start, dtype=float) + np.cumsum(steps, axis=0)))
+
+
+def tangent_arc(start, heading, radius, sweep, resolution=ARC_RESOLUTION):
+    """
+    建立與起點方向相切的圓弧頂點
+
+    Args:
+        start: 圓弧起點
+        heading: 起點切線方向（弧度）
+        radius: 半徑
+        sweep: 掃掠角（弧度），正值為逆時針（向左彎）
+
+    Returns:
+        ndarray(resolution, 2): 圓弧頂點
+    """
+    start = np.asarray(start, dtype=float)
+    side = 1.0 if sweep >= 0 else -1.0
+    # 圓心位於切線的左側（逆時針）或右側（順時針）
+    center = start + side * radius * np.array([-math.sin(heading), math.cos(heading)])
+    start_angle = math.atan2(start[1] - center[1], start[0] - center[0])
+    thetas = start_angle + np.linspace(0.0, sweep, resolution)
+    return center + radius * np.column_stack((np.cos(thetas), np.sin(thetas)))
+
+
+def arc_sweep(arc_length, radius, max_sweep=2 * math.pi * 0.9):
+    """由弧長與半徑計算掃掠角，並限制最大值避免圓弧自我重疊"""
+    if radius and radius > 0 and arc_length > 0:
+        return min(arc_length / radius, max_sweep)
+    return DEFAULT_SWEEP
+
+
+def _segment_midpoints(points):
+    """計算折線各段的中點與左側法向量"""
+    starts, ends = points[:-1], points[1:]
+    deltas = ends - starts
+    norms = np.linalg.norm(deltas, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    normals = np.column_stack((-deltas[:, 1], deltas[:, 0])) / norms
+    return (starts + ends) / 2, normals
+
+
+def bent_shape(segments, angles):
+    """折料（多段折線）圖元：每段標註長度，每個彎折點標註角度"""
+    points = bent_polyline(segments, angles)
+    midpoints, normals = _segment_midpoints(points)
+    primitives = [polyline(points)]
+    for midpoint, normal, length in zip(midpoints, normals, segments):
+        primitives.append(label(midpoint, int(length), normal))
+    for vertex, angle in zip(points[1:-1], angles):
+        primitives.append(label(vertex, f"{angle}°", (0.0, 1.0), size=24))
+    return primitives
+
+
+def arc_shape(arc_length, radius):
+    """直料圓弧圖元：以中點對稱的單一圓弧"""
+    sweep = min(arc_sweep(arc_length, radius), math.pi)
+    drawn_radius = radius if radius and radius > 0 else arc_length / sweep
+    # 以圓心為原點，圓弧頂點位於正上方
+    thetas = math.pi / 2 + np.linspace(sweep / 2, -sweep / 2, ARC_RESOLUTION)
+    points = drawn_radius * np.column_stack((np.cos(thetas), np.sin(thetas)))
+    top = np.array([0.0, drawn_radius])
+    return [
+        polyline(points),
+        label(top, int(arc_length), (0.0, 1.0)),
+        label(np.array([0.0, points[:, 1].min()]), f"半徑={radius}", (0.0, -1.0), size=24),
+    ]
+
+
+def straight_arc_shape(straight_length, arc_length, radius):
+    """直段+弧段圖元：水平直段接一段相切圓弧（向上彎）"""
+    sweep = arc_sweep(arc_length, radius)
+    drawn_radius = radius if radius and radius > 0 else arc_length / sweep
+    straight = np.array([[0.0, 0.0], [float(straight_length), 0.0]])
+    arc = tangent_arc(straight[1], 0.0, drawn_radius, sweep)
+    arc_mid = arc[len(arc) // 2]
+    return [
+        polyline(np.vstack((straight, arc[1:]))),
+        label(straight.mean(axis=0), int(straight_length), (0.0, -1.0)),
+        label(arc_mid, int(arc_length), arc_mid - (straight[1] + [0.0, drawn_radius])),
+        label(straight[1] + [0.0, drawn_radius], f"半徑 {radius}", (0.0, 0.0), size=24),
+    ]
+
+
+def fit_transform(primitives, width, height, padding=80):
+    """
+    計算將所有圖元置入畫布的仿射轉換矩陣（等比例縮放、Y 軸翻轉、置中）
+
+    Returns:
+        ndarray(3, 3): 模型座標 → 像素座標的齊次轉換矩陣
+    """
+    coords = [p['points'] for p in primitives if p['kind'] == 'polyline']
+    coords += [p['at'][None, :] for p in primitives if p['kind'] == 'label']
+    if not coords:
+        return np.eye(3)
+    coords = np.vstack(coords)
+
+    low, high = coords.min(axis=0), coords.max(axis=0)
+    span = np.maximum(high - low, 1e-9)
+    available = np.array([width - 2 * padding, height - 2 * padding], dtype=float)
+    scale = float(np.min(available / span))
+    center = (low + high) / 2
+
+    return np.array([
+        [scale, 0.0, width / 2 - scale * center[0]],
+        [0.0, -scale, height / 2 + scale * center[1]],
+        [0.0, 0.0, 1.0],
+    ])
+
+
+def apply_transform(primitives, matrix):
+    """以仿射矩陣轉換所有圖元，回傳新的圖元列表（像素座標）"""
+    linear, offset = matrix[:2, :2], matrix[:2, 2]
+    transformed = []
+    for primitive in primitives:
+        primitive = dict(primitive)
+        if primitive['kind'] == 'polyline':
+            primitive['points'] = primitive['points'] @ linear.T + offset
+        elif primitive['kind'] == 'label':
+            primitive['at'] = primitive['at'] @ linear.T + offset
+            normal = primitive['normal'] @ linear.T
+            length = np.linalg.norm(normal)
+            primitive['normal'] = normal / length if length > 0 else normal
+        transformed.append(primitive)
+    return transformed
+
+
+def fit_to_canvas(primitives, width, height, padding=80):
+    """將圖元縮放置入畫布的便利函數"""
+    return apply_transform(primitives, fit_transform(primitives, width, height, padding))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+材料清單模組 - 提供預先建立的 assets/materials 索引
+
+清單 (manifest.json) 內容為：資料夾名稱 → 類型代碼、SVG 路徑、外框範圍、檢查碼。
+路徑一律以程式套件位置為基準解析，與目前工作目錄無關；
+每個行程只載入一次，不再於每個 GraphicsManager 初始化時重新掃描目錄。
+
+重新產生清單：
+    python -m utils.graphics.materials
+"""
+
+import hashlib
+import json
+import re
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from pathlib import Path
+
+# 專案根目錄（utils/graphics/materials.py 往上兩層）
+PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+MATERIALS_DIR = PACKAGE_ROOT / "assets" / "materials"
+MANIFEST_PATH = MATERIALS_DIR / "manifest.json"
+MANIFEST_VERSION = 1
+
+SVG_FILENAME = "graphic-material.svg"
+DXF_FILENAME = "text.dxf"
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+def _svg_bbox(svg_path):
+    """計算 SVG 中所有 line/path 座標的外框 [min_x, min_y, max_x, max_y]"""
+    xs, ys = [], []
+    try:
+        root = ET.parse(svg_path).getroot()
+    except Exception as e:
+        print(f"❌ SVG 解析失敗: {e}")
+        return None
+
+    for line in root.iter(f"{SVG_NS}line"):
+        for x_key, y_key in (('x1', 'y1'), ('x2', 'y2')):
+            xs.append(float(line.get(x_key, 0)))
+            ys.append(float(line.get(y_key, 0)))
+
+    for path in root.iter(f"{SVG_NS}path"):
+        numbers = [float(n) for n in _NUMBER_RE.findall(path.get('d', ''))]
+        xs.extend(numbers[0::2])
+        ys.extend(numbers[1::2])
+
+    if not xs or not ys:
+        return None
+    return [min(xs), min(ys), max(xs), max(ys)]
+
+
+def _file_checksum(path):
+    """計算檔案的 SHA-256 檢查碼"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def scan_materials(materials_dir=MATERIALS_DIR):
+    """
+    掃描材料目錄並建立清單
+
+    Returns:
+        dict: {資料夾名稱: {'type_code', 'svg', 'bbox', 'checksum'}}
+    """
+    materials_dir = Path(materials_dir)
+    materials = {}
+    if not materials_dir.exists():
+        return materials
+
+    for item in sorted(materials_dir.iterdir()):
+        if not item.is_dir():
+            continue
+        # 檢查是否有必要的檔案
+        svg_file = item / SVG_FILENAME
+        text_file = item / DXF_FILENAME
+        if not (svg_file.exists() and text_file.exists()):
+            continue
+        materials[item.name] = {
+            'type_code': item.name.split('-', 1)[0],
+            'svg': f"{item.name}/{SVG_FILENAME}",
+            'bbox': _svg_bbox(svg_file),
+            'checksum': _file_checksum(svg_file),
+        }
+    return materials
+
+
+def build_manifest(materials_dir=MATERIALS_DIR, manifest_path=None):
+    """掃描材料目錄並寫出 manifest.json，回傳清單內容"""
+    materials_dir = Path(materials_dir)
+    manifest_path = Path(manifest_path) if manifest_path else materials_dir / MANIFEST_PATH.name
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'materials': scan_materials(materials_dir),
+    }
+    manifest_path.write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+        encoding='utf-8'
+    )
+    return manifest
+
+
+@lru_cache(maxsize=None)
+def load_manifest():
+    """
+    載入材料清單（每個行程僅載入一次）
+
+    優先讀取預先建立的 manifest.json；若檔案不存在或版本不符，
+    則掃描目錄並嘗試寫回快取（唯讀環境下僅保留於記憶體）。
+    """
+    try:
+        manifest = json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest['materials']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    try:
+        return build_manifest()['materials']
+    except OSError as e:
+        print(f"⚠️ 無法寫入材料清單快取: {e}")
+        return scan_materials()
+
+
+def get_available_materials():
+    """取得可用材料資料夾名稱列表"""
+    return list(load_manifest())
+
+
+def find_materials_by_type_code(type_code):
+    """依類型代碼（例如 '23'）取得對應的材料資料夾名稱列表"""
+    type_code = str(type_code)
+    return [name for name, entry in load_manifest().items() if entry['type_code'] == type_code]
+
+
+def get_material_svg_path(material_name):
+    """取得材料 SVG 的絕對路徑"""
+    entry = load_manifest().get(material_name)
+    if entry:
+        return MATERIALS_DIR / entry['svg']
+    return MATERIALS_DIR / material_name / SVG_FILENAME
+
+
+def verify_manifest():
+    """比對清單檢查碼與實際檔案，回傳不一致的資料夾名稱列表"""
+    mismatched = []
+    for name, entry in load_manifest().items():
+        svg_path = MATERIALS_DIR / entry['svg']
+        if not svg_path.exists() or _file_checksum(svg_path) != entry['checksum']:
+            mismatched.append(name)
+    return mismatched
+
+
+if __name__ == "__main__":
+    manifest = build_manifest()
+    print(f"✅ 已產生材料清單: {MANIFEST_PATH} ({len(manifest['materials'])} 種材料)")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+圖示渲染服務 - 以行程池批次產生鋼筋圖示
+
+輸入為圖示規格 (spec) 字典列表：
+    {'type': 'type12', 'segments': [900, 200], 'angles': [113], 'radius': 0, 'label': 'V113°#10-900+200x2'}
+
+可選 'size': (寬, 高) 指定輸出尺寸，圖片會在編碼前縮放。
+
+輸出為與輸入順序一致的 PNG 位元組列表（無法產生時為 None）。
+小批次直接在目前行程渲染，避免建立行程的成本大於效益。
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .generators import get_all_generators, get_generator
+from .materials import get_available_materials, get_material_svg_path
+
+# 少於此數量的批次直接在目前行程渲染
+MIN_POOL_BATCH = 32
+
+# 預熱時載入的字體大小（與各生成器使用的大小一致）
+WARM_FONT_SIZES = (24, 32, 36, 72)
+
+_available_materials = None
+
+
+def warm_up():
+    """預先載入材料清單、SVG 模板與字體（行程池 initializer）"""
+    global _available_materials
+    _available_materials = get_available_materials()
+    for generator in get_all_generators().values():
+        material = generator.find_material(_available_materials)
+        if material:
+            generator.parse_svg(get_material_svg_path(material))
+        for size in WARM_FONT_SIZES:
+            generator.get_font(size)
+    return len(_available_materials)
+
+
+def _first(values, default=0):
+    """取得列表第一個值"""
+    return values[0] if values else default
+
+
+def render_image(spec):
+    """依規格產生 PIL 圖片，不支援的類型回傳 None"""
+    if _available_materials is None:
+        warm_up()
+
+    rebar_type = spec.get('type')
+    generator = get_generator(rebar_type)
+    if not generator:
+        print(f"❌ 找不到 {rebar_type} 生成器")
+        return None
+
+    segments = spec.get('segments') or []
+    angles = spec.get('angles') or []
+    radius = spec.get('radius', 0)
+    label = spec.get('label', '')
+
+    if rebar_type in ('type10', 'type11'):
+        return generator.generate_image(_first(segments), label, _available_materials)
+    if rebar_type == 'type12':
+        return generator.generate_image(segments, angles, label, _available_materials)
+    if rebar_type == 'type18':
+        return generator.generate_image(_first(segments), radius, label, _available_materials)
+    if rebar_type == 'type19':
+        straight_length = segments[0] if len(segments) > 0 else 0
+        arc_length = segments[1] if len(segments) > 1 else 0
+        return generator.generate_image(straight_length, arc_length, radius, label, _available_materials)
+
+    print(f"⚠️ 渲染服務尚未支援 {rebar_type}")
+    return None
+
+
+def render_png(spec):
+    """依規格產生 PNG 位元組"""
+    try:
+        image = render_image(spec)
+        if image is None:
+            return None
+        size = spec.get('size')
+        if size and tuple(size) != image.size:
+            image = image.resize(tuple(size))
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        return buffer.getvalue()
+    except Exception as e:
+        print(f"❌ 圖示渲染失敗: {e}")
+        return None
+
+
+class RenderService:
+    """圖示渲染服務（可重複使用的行程池）"""
+
+    def __init__(self, max_workers=None, min_pool_batch=MIN_POOL_BATCH):
+        """
+        初始化渲染服務
+
+        Args:
+            max_workers: 行程池大小，預設為 CPU 核心數
+            min_pool_batch: 低於此數量的批次改在目前行程渲染
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_pool_batch = min_pool_batch
+        self._executor = None
+
+    def _get_executor(self):
+        """取得（必要時建立）已預熱的行程池"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=warm_up
+            )
+        return self._executor
+
+    def render(self, specs):
+        """
+        批次渲染圖示
+
+        Args:
+            specs: 圖示規格字典列表
+
+        Returns:
+            list: 與輸入順序一致的 PNG 位元組（失敗者為 None）
+        """
+        specs = list(specs)
+        if len(specs) < self.min_pool_batch or self.max_workers <= 1:
+            return [render_png(spec) for spec in specs]
+
+        chunksize = max(1, len(specs) // (self.max_workers * 4))
+        try:
+            return list(self._get_executor().map(render_png, specs, chunksize=chunksize))
+        except (BrokenProcessPool, OSError) as e:
+            print(f"⚠️ 行程池渲染失敗，改為單一行程渲染: {e}")
+            self.shutdown()
+            return [render_png(spec) for spec in specs]
+
+    def shutdown(self):
+        """關閉行程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+
+def render_diagrams(specs, max_workers=None, min_pool_batch=MIN_POOL_BATCH):
+    """批次渲染圖示的便利函數（使用一次性的行程池）"""
+    with RenderService(max_workers=max_workers, min_pool_batch=min_pool_batch) as service:
+        return service.render(specs)
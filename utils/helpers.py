@@ -3,8 +3,10 @@
 """
 
 import os
+import sys
 import time
 import math
+import hashlib
 from datetime import datetime
 
 def format_file_size(size_bytes):
@@ -62,6 +64,153 @@ def get_file_info(file_path):
             'error': str(e)
         }
 
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """計算檔案內容的 SHA-256（分塊讀取，不一次載入整個檔案）"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def submit_isolated(fn, *args):
+    """
+    於獨立的單一行程池執行函數並回傳 Future（完成後自動關閉行程池）
+
+    用於重試隨行程池崩潰的工作：同一個行程池中任一工作使子行程崩潰時，所有工作都會收到
+    BrokenProcessPool，獨立執行時再次崩潰即可確定是該工作造成。
+    """
+    import threading
+    from concurrent.futures import ProcessPoolExecutor
+
+    executor = ProcessPoolExecutor(max_workers=1)
+    future = executor.submit(fn, *args)
+    # 行程池崩潰時回呼在其內部鎖中執行，不能直接呼叫 shutdown，改由另一個執行緒關閉
+    future.add_done_callback(lambda _: threading.Thread(
+        target=executor.shutdown, kwargs={'wait': False}, daemon=True).start())
+    return future
+
+def get_available_memory():
+    """獲取可用實體記憶體（位元組），無法取得時回傳 None"""
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        pass
+    if os.name == 'nt':
+        try:
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [
+                    ('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                    ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                    ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                    ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                    ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+                ]
+
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(status)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return status.ullAvailPhys
+        except (OSError, AttributeError):
+            pass
+    if sys.platform == 'darwin':
+        return _get_darwin_available_memory()
+    return None
+
+def _get_darwin_available_memory():
+    """macOS：以 vm_stat 的閒置、非使用中與預讀分頁計算可用記憶體，失敗時改用 sysctl hw.memsize 的實體記憶體總量"""
+    import re
+    import subprocess
+
+    try:
+        output = subprocess.run(['vm_stat'], capture_output=True, text=True, timeout=5, check=True).stdout
+        page_size = int(re.search(r'page size of (\d+) bytes', output).group(1))
+        pages = {name.strip(): int(value) for name, value in re.findall(r'^(Pages [^:]+):\s+(\d+)\.', output, re.M)}
+        available = sum(pages.get(name, 0) for name in ('Pages free', 'Pages inactive', 'Pages speculative'))
+        if available:
+            return available * page_size
+    except (OSError, ValueError, AttributeError, subprocess.SubprocessError):
+        pass
+    try:
+        output = subprocess.run(['sysctl', '-n', 'hw.memsize'], capture_output=True, text=True, timeout=5,
+                                check=True).stdout
+        return int(output.strip())
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+def get_process_rss():
+    """獲取目前行程的常駐記憶體（RSS，位元組），無法取得時回傳 None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError, IndexError):
+        pass
+    if os.name == 'nt':
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+        except (OSError, AttributeError):
+            pass
+    if sys.platform == 'darwin':
+        return _get_darwin_rss()
+    return None
+
+def _get_darwin_rss():
+    """macOS：以 mach task_info 取得目前 RSS，失敗時改用 getrusage 的峰值 RSS（位元組）"""
+    try:
+        import ctypes
+        import ctypes.util
+
+        class TimeValue(ctypes.Structure):
+            _fields_ = [('seconds', ctypes.c_int32), ('microseconds', ctypes.c_int32)]
+
+        class MachTaskBasicInfo(ctypes.Structure):
+            _fields_ = [
+                ('virtual_size', ctypes.c_uint64), ('resident_size', ctypes.c_uint64),
+                ('resident_size_max', ctypes.c_uint64), ('user_time', TimeValue),
+                ('system_time', TimeValue), ('policy', ctypes.c_int32), ('suspend_count', ctypes.c_int32),
+            ]
+
+        MACH_TASK_BASIC_INFO = 20
+        libc = ctypes.CDLL(ctypes.util.find_library('c'))
+        info = MachTaskBasicInfo()
+        count = ctypes.c_uint32(ctypes.sizeof(info) // ctypes.sizeof(ctypes.c_uint32))
+        task = ctypes.c_uint32.in_dll(libc, 'mach_task_self_')
+        if libc.task_info(task, MACH_TASK_BASIC_INFO, ctypes.byref(info), ctypes.byref(count)) == 0:
+            return info.resident_size
+    except (OSError, AttributeError, ValueError, TypeError):
+        pass
+    try:
+        import resource
+        # macOS 的 ru_maxrss 單位為位元組
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except (ImportError, OSError, ValueError):
+        return None
+
+def get_default_concurrency(job_memory_mb):
+    """依 CPU 核心數與可用記憶體計算建議的同時轉換數量"""
+    concurrency = os.cpu_count() or 1
+    available = get_available_memory()
+    if available:
+        concurrency = min(concurrency, available // (job_memory_mb * 1024 * 1024))
+    return max(1, int(concurrency))
+
 def create_progress_tracker(total_steps):
     """創建進度追蹤器"""
     return {
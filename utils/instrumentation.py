@@ -0,0 +1,157 @@
+"""
+執行量測模組 - 各階段計時與計數
+
+轉換流程中的各模組（CADReader、RebarProcessor、GraphicsManager、ExcelWriter）
+透過本模組的 timer() 與 count() 回報耗時與數量；未啟用量測時這些呼叫幾乎沒有成本。
+
+    with activate(RunInstrumentation()) as run:
+        convert_file(...)
+    run.write_json("report.json")
+
+計時器名稱慣例：「模組.動作」，例如 dxf.load、parse.marks、render.image、excel.save
+較粗的流程階段（reader、parser、renderer、writer）以 stage() 標記，記憶體分析模式會在階段前後量測記憶體
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# 目前啟用的量測物件（跨執行緒共用，管線各階段的執行緒也會回報到同一份報告）
+_active = None
+
+
+class RunInstrumentation:
+    """單次執行的計時與計數資料（可跨執行緒使用）"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.timers = {}
+        self.counters = {}
+        self.extra = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timer(self, name):
+        """累計區塊耗時"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def stage(self, name):
+        """流程階段（計時器名稱為 stage.<name>），子類別可加入額外量測"""
+        return self.timer(f"stage.{name}")
+
+    def add_time(self, name, seconds):
+        """累計耗時（秒）"""
+        with self._lock:
+            entry = self.timers.get(name)
+            if entry is None:
+                self.timers[name] = [1, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+
+    def count(self, name, amount=1):
+        """累加計數"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, name, value):
+        """記錄額外資訊（需可序列化為 JSON）"""
+        with self._lock:
+            self.extra[name] = value
+
+    def get_seconds(self, name):
+        """取得計時器累計秒數"""
+        entry = self.timers.get(name)
+        return entry[1] if entry else 0.0
+
+    def to_dict(self):
+        """報告內容"""
+        with self._lock:
+            return {
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'timers': {
+                    name: {'calls': calls, 'seconds': round(seconds, 6)}
+                    for name, (calls, seconds) in self.timers.items()
+                },
+                'counters': dict(self.counters),
+                **self.extra,
+            }
+
+    def write_json(self, file_path):
+        """寫出 JSON 報告"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"📊 執行報告已寫入: {file_path}")
+
+    def summary_text(self):
+        """單行摘要（用於 Excel 頁尾）"""
+        counters = self.counters
+        parts = [
+            f"讀檔 {self.get_seconds('dxf.load'):.1f}s",
+            f"解析 {counters.get('marks.parsed', 0)} 筆（未符合 {counters.get('marks.missed', 0)}）",
+            f"圖示 {counters.get('images.rendered', 0)} 張（重用 {counters.get('images.reused', 0)}）",
+            f"資料列 {counters.get('rows.written', 0)}",
+        ]
+        return "量測：" + "、".join(parts)
+
+
+class _NullTimer:
+    """未啟用量測時使用的空計時器"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def get_active():
+    """取得目前啟用的量測物件，未啟用時回傳 None"""
+    return _active
+
+
+@contextmanager
+def activate(instrumentation=None):
+    """啟用量測，區塊結束後恢復先前的狀態"""
+    global _active
+    previous = _active
+    _active = instrumentation or RunInstrumentation()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+def timer(name):
+    """累計區塊耗時（未啟用量測時不做任何事）"""
+    if _active is None:
+        return _NULL_TIMER
+    return _active.timer(name)
+
+
+def stage(name):
+    """標記流程階段（未啟用量測時不做任何事）"""
+    if _active is None:
+        return _NULL_TIMER
+    return _active.stage(name)
+
+
+def count(name, amount=1):
+    """累加計數（未啟用量測時不做任何事）"""
+    if _active is not None:
+        _active.count(name, amount)
+
+
+def record(name, value):
+    """記錄額外資訊（未啟用量測時不做任何事）"""
+    if _active is not None:
+        _active.record(name, value)
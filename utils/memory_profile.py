@@ -0,0 +1,238 @@
+"""
+記憶體分析模式
+
+以 RunInstrumentation 子類別的方式掛入既有的量測點：
+- 每個流程階段（reader、parser、renderer、writer）前後各取一次 tracemalloc 快照，
+  列出該階段新增記憶體最多的配置位置，並記錄 tracemalloc 峰值
+- 背景執行緒定期取樣行程 RSS，記錄各階段的 RSS 峰值（macOS 以 mach task_info 取得；
+  無法取得 RSS 時會提示，報告中的 RSS 峰值為 None 且預算不生效）
+- 設定預算時，RSS 超過預算後的下一個量測點（計數或階段邊界）會拋出 MemoryBudgetExceeded，
+  在機器開始使用置換空間前中止轉換（ezdxf 讀檔等單一呼叫期間無法中斷，會在呼叫結束後生效）
+
+記憶體分析模式會停用管線轉換，讓各階段依序執行，峰值才能歸屬到單一階段。
+
+使用方式（於專案根目錄）：
+    python -m utils.memory_profile 圖面.dxf 輸出.xlsx --budget-mb 4096 --report 記憶體報告.json
+"""
+
+import argparse
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+from config import MEMORY_BUDGET_MB, MEMORY_SAMPLE_INTERVAL, MEMORY_TOP_ALLOCATIONS
+from utils.helpers import format_file_size, get_process_rss
+from utils.instrumentation import RunInstrumentation
+
+# tracemalloc 每個配置記錄的堆疊深度
+TRACE_FRAMES = 1
+
+
+class MemoryBudgetExceeded(Exception):
+    """記憶體用量超過預算"""
+    pass
+
+
+class MemoryProfiler(RunInstrumentation):
+    """記憶體分析：各階段的 tracemalloc 快照差異與 RSS 峰值"""
+
+    def __init__(self, budget_mb=MEMORY_BUDGET_MB, sample_interval=MEMORY_SAMPLE_INTERVAL,
+                 top_n=MEMORY_TOP_ALLOCATIONS):
+        """
+        初始化記憶體分析
+
+        Args:
+            budget_mb: RSS 上限 (MB)，None 表示不限制
+            sample_interval: RSS 取樣間隔（秒）
+            top_n: 每個階段列出的配置位置數量
+        """
+        super().__init__()
+        self.budget_bytes = budget_mb * 1024 * 1024 if budget_mb else None
+        self.sample_interval = sample_interval
+        self.top_n = top_n
+        self.stages = {}
+        self.current_stage = None
+        self.peak_rss = 0
+        self.rss_available = True
+        self.exceeded = None
+        self._stop = threading.Event()
+        self._sampler = None
+        self._started_tracing = False
+
+    # ----- 開始與結束 -----
+
+    def start(self):
+        """開始 tracemalloc 追蹤與 RSS 取樣（無法取得 RSS 時提示預算與 RSS 峰值停用）"""
+        self.rss_available = get_process_rss() is not None
+        if not self.rss_available:
+            budget = "，記憶體預算已停用" if self.budget_bytes else ""
+            print(f"⚠️ 無法取得行程 RSS，不記錄 RSS 峰值{budget}")
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="memory-sampler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        """停止取樣與追蹤"""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+    # ----- RSS 取樣與預算 -----
+
+    def _sample(self):
+        """取樣一次 RSS，更新目前階段的峰值並檢查預算"""
+        rss = get_process_rss()
+        if rss is None:
+            return
+        self.peak_rss = max(self.peak_rss, rss)
+        stage = self.current_stage
+        if stage is not None:
+            stats = self.stages[stage]
+            stats['peak_rss_bytes'] = max(stats['peak_rss_bytes'], rss)
+        if self.budget_bytes and rss > self.budget_bytes and self.exceeded is None:
+            self.exceeded = (rss, stage)
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_interval):
+            self._sample()
+
+    def check_budget(self):
+        """RSS 已超過預算時拋出 MemoryBudgetExceeded"""
+        if self.exceeded is None:
+            return
+        rss, stage = self.exceeded
+        raise MemoryBudgetExceeded(
+            f"記憶體用量 {format_file_size(rss)} 超過預算 {format_file_size(self.budget_bytes)}"
+            f"（階段：{stage or '未知'}），已中止轉換以避免系統使用置換空間"
+        )
+
+    def count(self, name, amount=1):
+        super().count(name, amount)
+        self.check_budget()
+
+    # ----- 階段量測 -----
+
+    @contextmanager
+    def stage(self, name):
+        """量測單一階段的記憶體（同名階段多次執行時累計配置、取最大峰值）"""
+        self.check_budget()
+        stats = self.stages.setdefault(name, {
+            'calls': 0,
+            'peak_rss_bytes': 0,
+            'traced_peak_bytes': 0,
+            'traced_delta_bytes': 0,
+            'allocations': {},
+        })
+        stats['calls'] += 1
+        previous_stage = self.current_stage
+        before = tracemalloc.take_snapshot()
+        traced_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.current_stage = name
+        self._sample()
+        try:
+            with self.timer(f"stage.{name}"):
+                yield
+        finally:
+            self._sample()
+            self.current_stage = previous_stage
+            _, traced_peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            self._accumulate(stats, before, after, traced_peak - traced_before)
+        self.check_budget()
+
+    def _accumulate(self, stats, before, after, traced_peak):
+        """累計階段前後快照的差異（traced_peak 為階段內相對於開始時的配置峰值）"""
+        differences = after.compare_to(before, 'lineno')
+        stats['traced_peak_bytes'] = max(stats['traced_peak_bytes'], traced_peak)
+        stats['traced_delta_bytes'] += sum(diff.size_diff for diff in differences)
+        allocations = stats['allocations']
+        for diff in differences:
+            if diff.size_diff <= 0:
+                continue
+            frame = diff.traceback[0]
+            site = f"{frame.filename}:{frame.lineno}"
+            entry = allocations.setdefault(site, [0, 0])
+            entry[0] += diff.size_diff
+            entry[1] += diff.count_diff
+
+    # ----- 報告 -----
+
+    def memory_report(self):
+        """各階段的記憶體報告"""
+        stages = {}
+        for name, stats in self.stages.items():
+            top = sorted(stats['allocations'].items(), key=lambda item: item[1][0], reverse=True)[:self.top_n]
+            stages[name] = {
+                'calls': stats['calls'],
+                'peak_rss_bytes': stats['peak_rss_bytes'] if self.rss_available else None,
+                'traced_peak_bytes': stats['traced_peak_bytes'],
+                'traced_delta_bytes': stats['traced_delta_bytes'],
+                'top_allocations': [
+                    {'site': site, 'size_bytes': size, 'count': count} for site, (size, count) in top
+                ],
+            }
+        return {
+            'budget_bytes': self.budget_bytes,
+            'peak_rss_bytes': self.peak_rss if self.rss_available else None,
+            'exceeded': self.exceeded is not None,
+            'stages': stages,
+        }
+
+    def to_dict(self):
+        data = super().to_dict()
+        data['memory'] = self.memory_report()
+        return data
+
+    def print_report(self):
+        """輸出各階段記憶體摘要"""
+        report = self.memory_report()
+        def rss(size):
+            return "無法取得" if size is None else format_file_size(size)
+
+        print(f"🧠 RSS 峰值：{rss(report['peak_rss_bytes'])}")
+        for name, stats in report['stages'].items():
+            print(f"   {name}：RSS 峰值 {rss(stats['peak_rss_bytes'])}，"
+                  f"Python 配置峰值 {format_file_size(max(stats['traced_peak_bytes'], 0))}，"
+                  f"保留 {format_file_size(max(stats['traced_delta_bytes'], 0))}")
+            for allocation in stats['top_allocations'][:3]:
+                print(f"      {format_file_size(allocation['size_bytes']):>10}  {allocation['site']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="以記憶體分析模式轉換 DXF 檔案")
+    parser.add_argument('cad_file', help="DXF 檔案路徑")
+    parser.add_argument('excel_file', help="Excel 輸出路徑")
+    parser.add_argument('--budget-mb', type=int, default=MEMORY_BUDGET_MB, help="RSS 上限 (MB)")
+    parser.add_argument('--report', default=None, help="JSON 報告輸出路徑（預設為 Excel 路徑加上 .memory.json）")
+    args = parser.parse_args(argv)
+
+    from core.converter import convert_file
+
+    report_path = args.report or args.excel_file + '.memory.json'
+    try:
+        convert_file(args.cad_file, args.excel_file, use_cache=False, report_path=report_path,
+                     memory_budget_mb=args.budget_mb, profile_memory=True)
+    except MemoryBudgetExceeded as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
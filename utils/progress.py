@@ -0,0 +1,127 @@
+"""
+進度回報與取消機制模組
+
+轉換流程的各階段（讀取、解析、寫入、儲存）共用同一個 ProgressReporter：
+- 依階段範圍將「已處理數 / 總數」換算為整體百分比
+- 限制回報頻率（預設約 10 Hz），避免大量訊號塞滿 Qt 事件迴圈
+- 每次更新都會檢查 CancelToken，收到取消要求時拋出 ConversionCancelled
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+# 預設回報間隔（秒），約 10 Hz
+DEFAULT_MIN_INTERVAL = 0.1
+
+
+class ConversionCancelled(Exception):
+    """轉換已被使用者取消"""
+    pass
+
+
+class CancelToken:
+    """協作式取消權杖（可跨執行緒使用）"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """要求取消"""
+        self._event.set()
+
+    @property
+    def is_cancelled(self):
+        """是否已要求取消"""
+        return self._event.is_set()
+
+    def check(self):
+        """若已要求取消則拋出 ConversionCancelled"""
+        if self._event.is_set():
+            raise ConversionCancelled("轉換已取消")
+
+
+class ProgressReporter:
+    """節流的進度回報器"""
+
+    def __init__(self, callback=None, cancel_token=None, min_interval=DEFAULT_MIN_INTERVAL):
+        """
+        初始化進度回報器
+
+        Args:
+            callback: 回報函數 callback(百分比: int, 狀態文字: str)
+            cancel_token: CancelToken，None 表示不可取消
+            min_interval: 兩次回報之間的最短間隔（秒）
+        """
+        self.callback = callback
+        self.cancel_token = cancel_token
+        self.min_interval = min_interval
+        self._stage_start = 0
+        self._stage_end = 100
+        self._stage_message = ""
+        self._last_emit = 0.0
+
+    def stage(self, start, end, message):
+        """進入新階段，之後的 update 會換算到 [start, end] 範圍內"""
+        self.check_cancelled()
+        self._stage_start = start
+        self._stage_end = end
+        self._stage_message = message
+        self._emit(start, message, force=True)
+
+    def update(self, done, total, detail=""):
+        """
+        回報目前階段的處理數量
+
+        Args:
+            done: 已處理數量
+            total: 總數量
+            detail: 額外說明，預設顯示「已處理數 / 總數」
+        """
+        self.check_cancelled()
+        if total > 0:
+            ratio = min(done / total, 1.0)
+        else:
+            ratio = 1.0
+        percent = int(self._stage_start + (self._stage_end - self._stage_start) * ratio)
+        message = f"{self._stage_message} {detail or f'{done}/{total}'}"
+        self._emit(percent, message, force=done >= total)
+
+    @contextmanager
+    def heartbeat(self, interval=1.0):
+        """
+        無法細分進度的長時間步驟（例如儲存 Excel）期間，定期回報已經過時間
+
+        此期間無法中斷，取消要求會在步驟結束後才生效。
+        """
+        stop = threading.Event()
+        started = time.monotonic()
+        percent = self._stage_start
+        message = self._stage_message
+
+        def beat():
+            while not stop.wait(interval):
+                self._emit(percent, f"{message}（已經過 {time.monotonic() - started:.0f} 秒）", force=True)
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def check_cancelled(self):
+        """檢查是否已要求取消"""
+        if self.cancel_token:
+            self.cancel_token.check()
+
+    def _emit(self, percent, message, force=False):
+        """依節流設定呼叫回報函數"""
+        if not self.callback:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_emit < self.min_interval:
+            return
+        self._last_emit = now
+        self.callback(percent, message)